@@ -0,0 +1,96 @@
+"""
+Fan-out cost of `terminal-lyrics daemon` by number of attached displays.
+
+    python -m benchmarks.bench_daemon [--clients 1,8,32] [--events 2000] [--json out.json]
+
+For each client count a Hub listens on a temporary socket, that many
+subscribers drain it from reader threads, and the producer emits line
+events back to back. Reports the producer's CPU time per event (encode once
++ one non-blocking send per client) and checks that every client received
+every event. The polling side (D-Bus, cache, network) is not part of this:
+with a daemon it runs once, independent of the client count.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from terminal_lyrics.daemon import Hub
+from terminal_lyrics.events import LineChanged
+
+
+def _reader(path: Path, expected: int, counts: list[int], slot: int, ready: threading.Barrier) -> None:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(str(path))
+    sock.sendall(b'{"op":"subscribe","events":["line"]}\n')
+    ready.wait()
+    with sock, sock.makefile("rb") as f:
+        for _ in f:
+            counts[slot] += 1
+            if counts[slot] >= expected:
+                return
+
+
+def run_case(clients: int, events: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory(prefix="tl-daemon-") as tmp:
+        hub = Hub(Path(tmp) / "d.sock")
+        hub.enter()
+        try:
+            counts = [0] * clients
+            ready = threading.Barrier(clients + 1)
+            readers = [
+                threading.Thread(target=_reader, args=(hub.path, events, counts, i, ready), daemon=True)
+                for i in range(clients)
+            ]
+            for th in readers:
+                th.start()
+            ready.wait()
+            while hub.clients < clients:
+                time.sleep(0.001)
+
+            cpu0, wall0 = time.thread_time(), time.perf_counter()
+            for i in range(events):
+                hub.emit(LineChanged("bench", i, f"line {i} of the benchmark song", i * 1000, i * 1000 + 1000, i * 1000))
+            cpu = time.thread_time() - cpu0
+            for th in readers:
+                th.join(timeout=10.0)
+            wall = time.perf_counter() - wall0
+        finally:
+            hub.exit()
+    return {
+        "clients": clients,
+        "producer_us_per_event": round(cpu / events * 1e6, 2),
+        "producer_us_per_event_per_client": round(cpu / events / clients * 1e6, 2),
+        "delivered_ratio": round(sum(counts) / (events * clients), 4),
+        "dropped": hub.dropped,
+        "wall_s": round(wall, 3),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--clients", default="1,8,32")
+    ap.add_argument("--events", type=int, default=2000)
+    ap.add_argument("--json", type=Path, help="Write results to this file")
+    args = ap.parse_args()
+
+    results = [run_case(int(n), args.events) for n in args.clients.split(",")]
+    for r in results:
+        print(
+            f"clients {r['clients']:>4}: {r['producer_us_per_event']:>8} us/event"
+            f" ({r['producer_us_per_event_per_client']} us/client)"
+            f"  delivered {r['delivered_ratio']:.2%}  dropped {r['dropped']}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+"""
+Memory per cached track: columnar LrcDocument vs per-event objects.
+
+    python -m benchmarks.bench_memory [--tracks 200]
+
+"legacy" rebuilds what the watch loop used to hold per track: a tuple of
+LyricEvent, LineTracker lists of times and texts, and the renderer's list
+of lines. "columnar" is the parsed document plus a LineTracker that shares
+its columns.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tracemalloc
+
+from terminal_lyrics.lrc.model import LyricEvent
+from terminal_lyrics.lrc.parse import parse_lrc
+from terminal_lyrics.sync.tracker import LineTracker
+
+
+def synth_song(seed: int) -> str:
+    """~70 timed lines: verses plus a chorus that repeats four times."""
+    rnd = random.Random(seed)
+    words = ("light", "road", "ночь", "dream", "fall", "fire", "愛", "again", "home", "you")
+
+    def line() -> str:
+        return " ".join(rnd.choice(words) for _ in range(rnd.randint(4, 9)))
+
+    chorus = [line() for _ in range(6)]
+    body: list[str] = []
+    for _ in range(4):
+        body += [line() for _ in range(10)] + chorus
+    out = []
+    for i, text in enumerate(body):
+        t = 8_000 + i * 3_100
+        out.append(f"[{t // 60_000:02d}:{t // 1000 % 60:02d}.{t // 10 % 100:02d}]{text}")
+    return "\n".join(out) + "\n"
+
+
+def _legacy(text: str):
+    doc = parse_lrc(text)
+    events = tuple(LyricEvent(t, x) for t, x in zip(doc.times, doc.texts))
+    # the old representation kept fresh str objects per event, as slicing does
+    events = tuple(LyricEvent(e.t_ms, "".join(list(e.text))) for e in events)
+    tracker = LineTracker(t_ms=[e.t_ms for e in events], texts=[e.text for e in events])
+    timed_lines = [e.text for e in events]
+    return events, tracker, timed_lines
+
+
+def _columnar(text: str):
+    doc = parse_lrc(text)
+    tracker = LineTracker.from_document(doc)
+    return doc, tracker, tracker.texts
+
+
+def _measure(build, texts: list[str]) -> int:
+    tracemalloc.start()
+    kept = [build(t) for t in texts]
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tracks", type=int, default=200)
+    args = ap.parse_args()
+
+    texts = [synth_song(i) for i in range(args.tracks)]
+    legacy = _measure(_legacy, texts)
+    columnar = _measure(_columnar, texts)
+    print(f"tracks: {args.tracks}")
+    print(f"legacy   {legacy / args.tracks / 1024:8.1f} KiB/track")
+    print(f"columnar {columnar / args.tracks / 1024:8.1f} KiB/track ({columnar / legacy:.0%})")
+
+
+if __name__ == "__main__":
+    main()
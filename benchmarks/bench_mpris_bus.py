@@ -0,0 +1,64 @@
+"""
+Real D-Bus cost of MprisClient with many players on a private session bus.
+
+    python -m benchmarks.bench_mpris_bus [--players 32] [--calls 200]
+
+Starts a throwaway dbus-daemon with `--players` stand-in MPRIS players
+(tests/mocks/mpris_service.py; only the last one is Playing, so
+pick_player has to probe every player) and reports p50 / p99 latency of
+list_players, pick_player, client construction and the per-tick property
+reads. Needs dbus-python, PyGObject and dbus-daemon.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from typing import Callable
+
+from tests.mocks.private_bus import PrivateSessionBus
+
+
+def _latencies_us(fn: Callable[[], object], calls: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    samples.sort()
+    return samples[len(samples) // 2], samples[min(int(len(samples) * 0.99), len(samples) - 1)]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--players", type=int, default=32)
+    ap.add_argument("--calls", type=int, default=200)
+    args = ap.parse_args()
+
+    with PrivateSessionBus() as bus:
+        os.environ["DBUS_SESSION_BUS_ADDRESS"] = bus.address or ""
+        bus.spawn_players(args.players, playing=args.players - 1)
+
+        # import after the address is set: the session connection is created lazily
+        from terminal_lyrics.mpris.client import MprisClient
+
+        name = MprisClient.pick_player().service_name
+        client = MprisClient(name)
+        cases = {
+            "list_players": MprisClient.list_players,
+            "pick_player": MprisClient.pick_player,
+            "MprisClient()": lambda: MprisClient(name),
+            "playback_status": client.playback_status,
+            "track_info": client.track_info,
+            "position_ms": client.position_ms,
+        }
+        print(f"players: {args.players}, calls per case: {args.calls}")
+        for label, fn in cases.items():
+            calls = max(args.calls // 10, 5) if label == "pick_player" else args.calls
+            p50, p99 = _latencies_us(fn, calls)
+            print(f"{label:<16} p50 {p50:9.0f} us   p99 {p99:9.0f} us")
+
+
+if __name__ == "__main__":
+    main()
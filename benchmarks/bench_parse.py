@@ -0,0 +1,73 @@
+"""
+LRC parser throughput.
+
+    python -m benchmarks.bench_parse [--lines 200000] [--repeat 5]
+
+Generates a synthetic corpus (tags, multi-timestamp choruses, blank and
+stray lines) and reports MB/s for parse_lrc, parse_lrc_with_stats and the
+streaming iter_lrc_events.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import random
+import time
+
+from terminal_lyrics.lrc.parse import iter_lrc_events, parse_lrc, parse_lrc_with_stats
+
+_WORDS = ("love", "night", "fire", "ночь", "город", "愛してる", "baby", "yeah", "never", "home")
+
+
+def synth_lrc(n_lines: int, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    out = ["[ar:Synthetic Artist]", "[ti:Synthetic Title]", "[al:Bench]", "[offset:+120]", ""]
+    for i in range(n_lines):
+        t = (i * 1700) % (99 * 60_000)
+        k = rnd.random()
+        if k < 0.04:
+            out.append("")
+        elif k < 0.05:
+            out.append("stray text without timestamp")
+        else:
+            n_ts = 3 if k > 0.85 else 1
+            stamps = "".join(
+                f"[{(t + j * 45_000) // 60_000 % 100:02d}:{(t + j * 45_000) // 1000 % 60:02d}."
+                f"{(t // 10) % 100:02d}]"
+                for j in range(n_ts)
+            )
+            out.append(stamps + " ".join(rnd.choice(_WORDS) for _ in range(rnd.randint(3, 9))))
+    return "\n".join(out) + "\n"
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--lines", type=int, default=200_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    text = synth_lrc(args.lines)
+    mb = len(text.encode("utf-8")) / 1e6
+    cases = {
+        "parse_lrc": lambda: parse_lrc(text),
+        "parse_lrc_with_stats": lambda: parse_lrc_with_stats(text),
+        "iter_lrc_events": lambda: sum(1 for _ in iter_lrc_events(io.StringIO(text))),
+    }
+    print(f"corpus: {args.lines} lines, {mb:.1f} MB")
+    for name, fn in cases.items():
+        secs = _best(fn, args.repeat)
+        print(f"{name:<22} {mb / secs:8.1f} MB/s  ({secs * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
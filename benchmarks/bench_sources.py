@@ -0,0 +1,129 @@
+"""
+Time-to-lyric, retries and throughput of the source layer against the local
+stand-in server (tests/mocks/lyrics_server.py) instead of the internet.
+
+    python -m benchmarks.bench_sources [--tracks 200] [--latency lognormal:120:0.5]
+        [--error-rate 0.05] [--rate-limit-rate 0.02] [--timeout-rate 0.01]
+        [--api-timeout 1.0] [--retries 3] [--workers 1] [--json out.json]
+
+Every track goes through `LyricsService.get_lyrics` with an empty cache, so
+each one is a full cold resolution (lrclib get, search fallback, lyrics.ovh).
+Reports p50/p90/p99 time-to-lyric, HTTP requests per track (retries
+included), injected faults and tracks per second.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from terminal_lyrics.config import AppConfig
+from terminal_lyrics.sources.service import LyricsService
+from terminal_lyrics.sources.types import TrackKey
+from tests.mocks.lyrics_server import Faults, LyricsServer, seed_dataset
+
+
+def _pct(sorted_ms: list[float], q: float) -> float:
+    return round(sorted_ms[min(len(sorted_ms) - 1, int(q * len(sorted_ms)))], 1)
+
+
+def run(
+    n_tracks: int,
+    faults: Faults,
+    *,
+    api_timeout_s: float,
+    retries: int,
+    workers: int,
+    miss_ratio: float = 0.1,
+) -> dict[str, float]:
+    dataset = seed_dataset(n_tracks)
+    tracks = [TrackKey(artist=r["artistName"], title=r["trackName"], album=r["albumName"]) for r in dataset]
+    # some tracks the server has never heard of: exercises the full fallback chain
+    n_miss = int(n_tracks * miss_ratio)
+    tracks += [TrackKey(artist=f"Unknown {i}", title=f"Missing {i}") for i in range(n_miss)]
+
+    with LyricsServer(dataset, faults=faults) as server, tempfile.TemporaryDirectory(prefix="tl-bench-") as tmp:
+        cfg = AppConfig(
+            data_dir=Path(tmp),
+            cache_db_path=Path(tmp) / "cache.sqlite3",
+            config_dir=Path(tmp),
+            lang="EN",
+            sources=("lrclib", "lyrics_ovh"),
+            api_min_interval_s=0.0,
+            api_max_retries=retries,
+            api_backoff_base_s=0.0,
+            preferred_player=None,
+            refresh_hz=30.0,
+            context_lines=1,
+            use_alt_screen=False,
+            lrclib_base_url=server.url,
+            lyrics_ovh_base_url=server.url,
+            api_timeout_s=api_timeout_s,
+        )
+        svc = LyricsService(cfg)
+
+        def resolve(track: TrackKey) -> tuple[float, bool]:
+            started = time.perf_counter()
+            res = svc.get_lyrics(track)
+            return (time.perf_counter() - started) * 1000.0, res.has_lyrics
+
+        wall0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(resolve, tracks))
+        wall_s = time.perf_counter() - wall0
+        stats = dict(server.stats)
+
+    ms = sorted(t for t, _ in results)
+    requests_total = stats.get("get", 0) + stats.get("search", 0) + stats.get("ovh", 0)
+    return {
+        "tracks": len(tracks),
+        "found": sum(1 for _, ok in results if ok),
+        "ttl_p50_ms": _pct(ms, 0.50),
+        "ttl_p90_ms": _pct(ms, 0.90),
+        "ttl_p99_ms": _pct(ms, 0.99),
+        "ttl_mean_ms": round(statistics.fmean(ms), 1),
+        "requests_per_track": round(requests_total / len(tracks), 2),
+        "faults_500": stats.get("fault_500", 0),
+        "faults_429": stats.get("fault_429", 0),
+        "faults_timeout": stats.get("fault_timeout", 0),
+        "tracks_per_s": round(len(tracks) / wall_s, 1),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tracks", type=int, default=200)
+    ap.add_argument("--latency", default="lognormal:120:0.5", help='"<ms>", "uniform:lo:hi" or "lognormal:median:sigma"')
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--rate-limit-rate", type=float, default=0.0)
+    ap.add_argument("--timeout-rate", type=float, default=0.0)
+    ap.add_argument("--api-timeout", type=float, default=1.0, help="Client timeout, seconds")
+    ap.add_argument("--retries", type=int, default=3)
+    ap.add_argument("--workers", type=int, default=1, help="Concurrent get_lyrics callers")
+    ap.add_argument("--json", type=Path, help="Write results to this file")
+    args = ap.parse_args()
+    # retries under injected faults are expected; keep the report readable
+    logging.getLogger("terminal_lyrics").setLevel(logging.ERROR)
+
+    faults = Faults(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        timeout_rate=args.timeout_rate,
+        hang_s=args.api_timeout * 2,
+    )
+    result = run(args.tracks, faults, api_timeout_s=args.api_timeout, retries=args.retries, workers=args.workers)
+    for k, v in result.items():
+        print(f"{k:<20} {v}")
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
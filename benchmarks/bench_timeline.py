@@ -0,0 +1,57 @@
+"""
+Timeline sampling throughput: NumPy searchsorted vs. pure Python.
+
+    python -m benchmarks.bench_timeline [--hours 1] [--fps 60] [--events 2000]
+
+Maps every frame of an N-hour mix to its line index and reports samples/s
+for sync.timeline.sample_indices (both backends) and a per-frame
+LineTracker.current_index loop.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.bench_tracker import synth_times
+from terminal_lyrics.sync import timeline
+from terminal_lyrics.sync.tracker import LineTracker
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--hours", type=float, default=1.0)
+    ap.add_argument("--fps", type=float, default=60.0)
+    ap.add_argument("--events", type=int, default=2000)
+    args = ap.parse_args()
+
+    end_ms = int(args.hours * 3_600_000)
+    times = synth_times(args.events, end_ms // args.events)
+    positions = timeline.frame_positions(end_ms, args.fps)
+    n = len(positions)
+    print(f"{n} frames, {len(times)} events")
+
+    np_mod = timeline.np
+    if np_mod is not None:
+        secs = _timed(lambda: timeline.sample_indices(times, positions))
+        print(f"{'numpy searchsorted':<22} {n / secs / 1e6:8.1f} M samples/s  ({secs * 1000:.0f} ms)")
+    plain = [int(p) for p in positions]
+    timeline.np = None
+    try:
+        secs = _timed(lambda: timeline.sample_indices(times, plain))
+        print(f"{'python merge':<22} {n / secs / 1e6:8.1f} M samples/s  ({secs * 1000:.0f} ms)")
+    finally:
+        timeline.np = np_mod
+    tr = LineTracker(times, [""] * len(times))
+    secs = _timed(lambda: [tr.current_index(p) for p in plain])
+    print(f"{'tracker per frame':<22} {n / secs / 1e6:8.1f} M samples/s  ({secs * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+LineTracker lookup cost: monotonic cursor vs. plain bisect.
+
+    python -m benchmarks.bench_tracker [--events 50000] [--step-ms 120] [--repeat 5]
+
+Builds a long, dense word-level timeline (one event every ~`step-ms`) and
+replays playback at 60 Hz, once straight through and once with a random
+seek every ~2 s, reporting ns per `current_index` call for both modes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from array import array
+
+from terminal_lyrics.sync.tracker import LineTracker
+
+
+def synth_times(n_events: int, step_ms: int, seed: int = 0) -> array:
+    rnd = random.Random(seed)
+    t = 0
+    out = array("i")
+    for _ in range(n_events):
+        out.append(t)
+        t += rnd.randint(step_ms // 2, step_ms * 3 // 2)
+    return out
+
+
+def playback(end_ms: int, tick_ms: int, seek_every: int, seed: int = 0) -> list[int]:
+    rnd = random.Random(seed)
+    out: list[int] = []
+    pos = 0
+    while pos < end_ms:
+        out.append(pos)
+        pos += tick_ms
+        if seek_every and len(out) % seek_every == 0:
+            pos = rnd.randrange(end_ms)
+    return out
+
+
+def _best_ns(tracker_factory, positions: list[int], repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    seeks = 0
+    for _ in range(repeat):
+        tr = tracker_factory()
+        lookup = tr.current_index
+        t0 = time.perf_counter()
+        for now in positions:
+            lookup(now)
+        best = min(best, time.perf_counter() - t0)
+        seeks = tr.seeks
+    return best * 1e9 / len(positions), seeks
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--events", type=int, default=50_000)
+    ap.add_argument("--step-ms", type=int, default=120)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    times = synth_times(args.events, args.step_ms)
+    texts = [""] * len(times)
+    end_ms = times[-1] + 1000
+    scenarios = {
+        "linear": playback(end_ms, 16, 0),
+        "seek/2s": playback(end_ms, 16, 120),
+    }
+    print(f"timeline: {len(times)} events over {end_ms / 60_000:.0f} min")
+    for name, positions in scenarios.items():
+        cur_ns, seeks = _best_ns(lambda: LineTracker(times, texts), positions, args.repeat)
+        bis_ns, _ = _best_ns(lambda: LineTracker(times, texts, use_cursor=False), positions, args.repeat)
+        print(
+            f"{name:<8} ticks={len(positions):<7} cursor {cur_ns:6.0f} ns  "
+            f"bisect {bis_ns:6.0f} ns  speedup x{bis_ns / cur_ns:.2f}  seeks={seeks}"
+        )
+
+
+if __name__ == "__main__":
+    main()
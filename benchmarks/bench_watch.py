@@ -0,0 +1,252 @@
+"""
+End-to-end cost of `terminal-lyrics watch` per hour of playback.
+
+    python -m benchmarks.bench_watch [--hours 1] [--track-s 210] [--refresh-hz 30] [--word-level] [--json out.json]
+    python -m benchmarks.bench_watch --replay session.ndjson [--speed 1]
+
+Runs the real `app.watch` loop against an auto-advancing MockMprisClient
+playlist, an offline lyrics service and an in-memory renderer, driven by a
+virtual clock: `sleep` advances simulated time instantly, so hours of
+playback take seconds. Reports CPU time, loop wakeups, D-Bus-equivalent
+calls, frames / highlight updates rendered and bytes written, all
+normalized per simulated hour. With `--replay` the player is a session
+recorded by `watch --record` instead of the synthetic playlist.
+
+D-Bus-equivalent calls count what the real MprisClient would do:
+pick_player = ListNames + GetObject + Get(PlaybackStatus), track_info =
+Get(Metadata), position_ms = Get(Position).
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import tempfile
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from benchmarks.bench_memory import synth_song
+from benchmarks.run import synth_word_song
+from terminal_lyrics.app import watch
+from terminal_lyrics.config import AppConfig
+from terminal_lyrics.mpris.replay import ReplayFinished, ReplaySession
+from terminal_lyrics.render.ansi import AnsiRenderer
+from terminal_lyrics.sources.service import LyricsResponse
+from terminal_lyrics.sources.types import TrackKey
+from tests.mocks.mpris_mock import MockMprisClient
+
+DBUS_CALLS = {"pick_player": 3, "track_info": 1, "position_ms": 1, "playback_status": 1}
+
+
+class _Finished(Exception):
+    pass
+
+
+class VirtualClock:
+    def __init__(self, end_s: float):
+        self.now = 0.0
+        self.end_s = end_s
+        self.sleeps = 0
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps += 1
+        self.now += seconds
+        if self.now >= self.end_s:
+            raise _Finished
+
+
+class CountingStream(io.TextIOBase):
+    def __init__(self) -> None:
+        self.bytes = 0
+        self.flushes = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        self.bytes += len(s.encode("utf-8"))
+        return len(s)
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+
+class CountingRenderer(AnsiRenderer):
+    def __init__(self, stream: CountingStream):
+        super().__init__(use_alt_screen=False, stream=stream)
+        self.frames = 0
+        self.highlights = 0
+
+    def render(self, *args: Any, **kwargs: Any) -> None:
+        self.frames += 1
+        super().render(*args, **kwargs)
+
+    def highlight_to(self, pos: int) -> None:
+        self.highlights += 1
+        super().highlight_to(pos)
+
+
+class PlaylistPlayer(MockMprisClient):
+    """Auto-advancing mock that moves to the next track every `track_s`."""
+
+    def __init__(self, clock: VirtualClock, track_s: float, calls: Counter):
+        super().__init__(auto_advance=True, clock=clock.time)
+        self._track_ms = int(track_s * 1000)
+        self._calls = calls
+        self._track_no = 0
+        self.set_track("Track 0", "Bench Artist", "Bench Album")
+
+    def _maybe_next_track(self) -> None:
+        self._update_position()
+        if self._position_ms >= self._track_ms:
+            self._track_no += 1
+            self.set_track(f"Track {self._track_no}", "Bench Artist", "Bench Album")
+            self.seek(0)
+
+    def playback_status(self) -> str:
+        self._calls["playback_status"] += 1
+        return super().playback_status()
+
+    def position_ms(self) -> int:
+        self._calls["position_ms"] += 1
+        self._maybe_next_track()
+        return super().position_ms()
+
+    def track_info(self):
+        self._calls["track_info"] += 1
+        self._maybe_next_track()
+        return super().track_info()
+
+
+class CountingClient:
+    def __init__(self, client: Any, calls: Counter):
+        self._client = client
+        self._calls = calls
+        self.service_name = client.service_name
+
+    def playback_status(self) -> str:
+        self._calls["playback_status"] += 1
+        return self._client.playback_status()
+
+    def position_ms(self) -> int:
+        self._calls["position_ms"] += 1
+        return self._client.position_ms()
+
+    def track_info(self):
+        self._calls["track_info"] += 1
+        return self._client.track_info()
+
+
+class OfflineService:
+    def __init__(self, word_level: bool):
+        self.word_level = word_level
+
+    def get_lyrics(self, track: TrackKey) -> LyricsResponse:
+        seed = zlib.crc32(track.title.encode()) & 0xFFFF
+        text = synth_word_song(seed) if self.word_level else synth_song(seed)
+        return LyricsResponse(lrc_text=text, source="bench", has_lyrics=True)
+
+    def prefetch_album(self, track: TrackKey) -> None:
+        pass
+
+
+def run(
+    hours: float,
+    track_s: float,
+    refresh_hz: float,
+    word_level: bool,
+    replay: Path | None = None,
+    speed: float = 1.0,
+) -> dict[str, float]:
+    calls: Counter = Counter()
+    if replay is None:
+        clock = VirtualClock(hours * 3600.0)
+        player = PlaylistPlayer(clock, track_s, calls)
+
+        def pick_player(preferred: str | None = None) -> Any:
+            calls["pick_player"] += 1
+            return player
+
+    else:
+        clock = VirtualClock(float("inf"))
+        session = ReplaySession(replay, speed=speed, clock=clock.time)
+        hours = session.duration_s / speed / 3600.0
+
+        def pick_player(preferred: str | None = None) -> Any:
+            calls["pick_player"] += 1
+            return CountingClient(session.pick_player(preferred), calls)
+
+    stream = CountingStream()
+    renderer = CountingRenderer(stream)
+    with tempfile.TemporaryDirectory(prefix="tl-bench-") as tmp:
+        cfg = AppConfig(
+            data_dir=Path(tmp),
+            cache_db_path=Path(tmp) / "cache.sqlite3",
+            config_dir=Path(tmp),
+            lang="EN",
+            sources=(),
+            api_min_interval_s=0.0,
+            api_max_retries=1,
+            api_backoff_base_s=0.0,
+            preferred_player=None,
+            refresh_hz=refresh_hz,
+            context_lines=1,
+            use_alt_screen=False,
+        )
+        cpu0 = time.process_time()
+        wall0 = time.perf_counter()
+        try:
+            watch(
+                cfg,
+                preferred_player=None,
+                debug=False,
+                renderer=renderer,
+                pick_player=pick_player,
+                service=OfflineService(word_level),  # type: ignore[arg-type]
+                sleep=clock.sleep,
+            )
+        except (_Finished, ReplayFinished):
+            pass
+        cpu_s = time.process_time() - cpu0
+        wall_s = time.perf_counter() - wall0
+
+    per_h = 1.0 / hours
+    return {
+        "simulated_h": hours,
+        "wall_s": round(wall_s, 3),
+        "cpu_ms_per_h": round(cpu_s * 1000 * per_h, 1),
+        "wakeups_per_h": round(clock.sleeps * per_h),
+        "dbus_calls_per_h": round(sum(DBUS_CALLS[k] * n for k, n in calls.items()) * per_h),
+        "frames_per_h": round(renderer.frames * per_h),
+        "highlights_per_h": round(renderer.highlights * per_h),
+        "bytes_per_h": round(stream.bytes * per_h),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--hours", type=float, default=1.0)
+    ap.add_argument("--track-s", type=float, default=210.0)
+    ap.add_argument("--refresh-hz", type=float, default=30.0)
+    ap.add_argument("--word-level", action="store_true", help="Enhanced LRC with word timings")
+    ap.add_argument("--json", type=Path, help="Write results to this file")
+    ap.add_argument("--replay", type=Path, help="Drive the loop from a `watch --record` session")
+    ap.add_argument("--speed", type=float, default=1.0, help="Replay speed")
+    args = ap.parse_args()
+
+    result = run(args.hours, args.track_s, args.refresh_hz, args.word_level, args.replay, args.speed)
+    for k, v in result.items():
+        print(f"{k:<18} {v}")
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
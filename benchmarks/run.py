@@ -0,0 +1,390 @@
+"""
+Micro-benchmark suite for the hot paths: parse, tracker, render, cache and
+search matching.
+
+    python -m benchmarks.run [-k parse] [--repeat 5] [--json results.json]
+    python -m benchmarks.run --save                 # write benchmarks/baseline.json
+    python -m benchmarks.run --compare [--threshold 0.25]
+
+Every case reports ns per operation (best of `--repeat`, each repeat
+auto-ranged to >= 0.2 s). `--compare` exits with status 1 when a case is
+slower than the stored baseline by more than `--threshold`. Cases whose
+optional dependencies are missing are reported as skipped. Baselines are
+machine-specific: refresh them on the machine that runs the comparison.
+
+The standalone scripts (bench_parse, bench_tracker, bench_timeline,
+bench_memory) remain for deeper single-topic runs; their corpus generators
+are reused here.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import platform
+import random
+import sys
+import tempfile
+import timeit
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.bench_memory import synth_song
+from benchmarks.bench_parse import synth_lrc
+from benchmarks.bench_tracker import playback, synth_times
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+# name -> setup(tmp_dir) -> (fn, operations per fn call)
+Setup = Callable[[Path], "tuple[Callable[[], object], int]"]
+CASES: dict[str, Setup] = {}
+
+
+class SkipCase(Exception):
+    pass
+
+
+def case(name: str) -> Callable[[Setup], Setup]:
+    def register(setup: Setup) -> Setup:
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+def synth_word_song(seed: int, n_lines: int = 60) -> str:
+    """Enhanced LRC: every word carries its own <mm:ss.xx> timestamp."""
+    rnd = random.Random(seed)
+    words = ("light", "road", "dream", "fall", "fire", "again", "home", "you")
+
+    def ts(ms: int) -> str:
+        return f"{ms // 60_000:02d}:{ms // 1000 % 60:02d}.{ms // 10 % 100:02d}"
+
+    out = []
+    t = 5_000
+    for _ in range(n_lines):
+        parts = []
+        w_t = t
+        for _ in range(rnd.randint(4, 9)):
+            parts.append(f"<{ts(w_t)}>{rnd.choice(words)} ")
+            w_t += rnd.randint(150, 450)
+        out.append(f"[{ts(t)}]" + "".join(parts).rstrip())
+        t = w_t + 400
+    return "\n".join(out) + "\n"
+
+
+def synth_cjk_song(seed: int, n_lines: int = 70) -> str:
+    rnd = random.Random(seed)
+    words = ("愛してる", "夜空", "君の声", "사랑해", "밤하늘", "永远", "星", "心")
+    out = []
+    for i in range(n_lines):
+        t = 6_000 + i * 2_900
+        text = "".join(rnd.choice(words) for _ in range(rnd.randint(3, 7)))
+        out.append(f"[{t // 60_000:02d}:{t // 1000 % 60:02d}.{t // 10 % 100:02d}]{text}")
+    return "\n".join(out) + "\n"
+
+
+# --- parse -------------------------------------------------------------------
+
+
+def _parse_case(text: str) -> tuple[Callable[[], object], int]:
+    from terminal_lyrics.lrc.parse import parse_lrc
+
+    return (lambda: parse_lrc(text)), 1
+
+
+@case("parse.short_song")
+def _(tmp: Path):
+    return _parse_case(synth_song(0))
+
+
+@case("parse.long_20k_lines")
+def _(tmp: Path):
+    return _parse_case(synth_lrc(20_000))
+
+
+@case("parse.word_level")
+def _(tmp: Path):
+    return _parse_case(synth_word_song(0))
+
+
+@case("parse.cjk")
+def _(tmp: Path):
+    return _parse_case(synth_cjk_song(0))
+
+
+# --- tracker -----------------------------------------------------------------
+
+
+@case("tracker.changed_index")
+def _(tmp: Path):
+    from terminal_lyrics.sync.tracker import LineTracker
+
+    times = synth_times(20_000, 120)
+    texts = [""] * len(times)
+    positions = playback(times[-1] + 1000, 16, 0)[:20_000]
+
+    def run() -> None:
+        changed = LineTracker(times, texts).changed_index
+        for p in positions:
+            changed(p)
+
+    return run, len(positions)
+
+
+@case("tracker.highlight_pos")
+def _(tmp: Path):
+    from terminal_lyrics.lrc.parse import parse_lrc
+    from terminal_lyrics.sync.tracker import LineTracker
+
+    doc = parse_lrc(synth_word_song(1, n_lines=400))
+    positions = playback(doc.times[-1] + 1000, 16, 0)
+
+    def run() -> None:
+        highlight = LineTracker.from_document(doc).highlight_pos
+        for p in positions:
+            highlight(p)
+
+    return run, len(positions)
+
+
+@case("timeline.sample_1h_60fps")
+def _(tmp: Path):
+    from terminal_lyrics.sync import timeline
+
+    if timeline.np is None:
+        raise SkipCase("numpy not installed")
+    times = synth_times(2_000, 1_800)
+    positions = timeline.frame_positions(3_600_000, 60)
+    return (lambda: timeline.sample_indices(times, positions)), len(positions)
+
+
+# --- render ------------------------------------------------------------------
+
+
+class _NullStream(io.TextIOBase):
+    def write(self, s: str) -> int:
+        return len(s)
+
+
+def _render_case(text: str) -> tuple[Callable[[], object], int]:
+    from terminal_lyrics.lrc.parse import parse_lrc
+    from terminal_lyrics.render.ansi import AnsiRenderer
+
+    lines = parse_lrc(text).texts
+    renderer = AnsiRenderer(use_alt_screen=False)
+    sink = _NullStream()
+
+    def run() -> None:
+        with redirect_stdout(sink):
+            for i in range(len(lines)):
+                renderer.render("Artist - Title", lines, current_idx=i, context_lines=2)
+
+    return run, len(lines)
+
+
+@case("render.frame")
+def _(tmp: Path):
+    return _render_case(synth_song(2))
+
+
+@case("render.frame_cjk")
+def _(tmp: Path):
+    return _render_case(synth_cjk_song(2))
+
+
+@case("render.layout_cjk")
+def _(tmp: Path):
+    # once per track and terminal width; frames then reuse it
+    from terminal_lyrics.lrc.parse import parse_lrc
+    from terminal_lyrics.render.layout import Layout
+
+    lines = parse_lrc(synth_cjk_song(2)).texts
+
+    def run() -> None:
+        Layout.build(lines, 40)
+
+    return run, 1
+
+
+@case("render.highlight_to")
+def _(tmp: Path):
+    from terminal_lyrics.render.ansi import AnsiRenderer
+
+    line = "light road dream fall fire again home you"
+    renderer = AnsiRenderer(use_alt_screen=False)
+    sink = _NullStream()
+    with redirect_stdout(sink):
+        renderer.render("Artist - Title", ["before", line, "after"], current_idx=1)
+    stops = [i for i, ch in enumerate(line) if ch == " "] + [len(line), 0]
+
+    def run() -> None:
+        with redirect_stdout(sink):
+            for pos in stops:
+                renderer.highlight_to(pos)
+
+    return run, len(stops)
+
+
+# --- cache -------------------------------------------------------------------
+
+
+def _filled_cache(tmp: Path, n: int):
+    from terminal_lyrics.cache.sqlite import CacheKey, LyricsCache
+
+    cache = LyricsCache(tmp / "bench_cache.sqlite3")
+    text = synth_song(3)
+    with cache._connect() as con:
+        # bulk fill in one transaction; set() commits per call
+        con.executemany(
+            "INSERT OR REPLACE INTO lyrics_cache(artist, title, album, has_lyrics, lrc_text, source, updated_at) "
+            "VALUES (?, ?, ?, 1, ?, 'bench', 0)",
+            [(f"artist {i % 500}", f"title {i}", f"album {i % 2000}", text) for i in range(n)],
+        )
+    keys = [CacheKey(f"artist {i % 500}", f"title {i}", f"album {i % 2000}") for i in range(0, n, n // 200)]
+    return cache, keys, text
+
+
+@case("cache.get_hit_20k")
+def _(tmp: Path):
+    cache, keys, _text = _filled_cache(tmp, 20_000)
+
+    def run() -> None:
+        for k in keys:
+            cache.get(k)
+
+    return run, len(keys)
+
+
+@case("cache.set_20k")
+def _(tmp: Path):
+    cache, keys, text = _filled_cache(tmp, 20_000)
+    keys = keys[:20]
+
+    def run() -> None:
+        for k in keys:
+            cache.set(k, has_lyrics=True, lrc_text=text, source="bench")
+
+    return run, len(keys)
+
+
+# --- search matching ---------------------------------------------------------
+
+
+@case("service.find_best_match_200")
+def _(tmp: Path):
+    from terminal_lyrics.config import AppConfig
+    from terminal_lyrics.sources.service import LyricsService
+    from terminal_lyrics.sources.types import SearchResult, TrackKey
+
+    cfg = AppConfig(
+        data_dir=tmp,
+        cache_db_path=tmp / "svc_cache.sqlite3",
+        config_dir=tmp,
+        lang="EN",
+        sources=(),
+        api_min_interval_s=0.0,
+        api_max_retries=1,
+        api_backoff_base_s=0.0,
+        preferred_player=None,
+        refresh_hz=30.0,
+        context_lines=1,
+        use_alt_screen=False,
+    )
+    svc = LyricsService(cfg)
+    rnd = random.Random(4)
+    results = [
+        SearchResult(
+            id=i,
+            track_name=f"Song {rnd.randint(0, 50)} (Remastered)",
+            artist_name=rnd.choice(("Artist", "Artist feat. Guest", "Other Band", "Guest")),
+            album_name="Album",
+            duration=200,
+            instrumental=False,
+            has_synced_lyrics=rnd.random() < 0.6,
+            has_plain_lyrics=True,
+        )
+        for i in range(200)
+    ]
+    track = TrackKey(artist="Artist, Guest", title="Song 7", album="Album")
+    return (lambda: svc._find_best_match(track, results)), 1
+
+
+# --- runner ------------------------------------------------------------------
+
+
+def measure(fn: Callable[[], object], ops: int, repeat: int) -> float:
+    """Best ns per operation over `repeat` auto-ranged runs."""
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=loops))
+    return best / loops / ops * 1e9
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> list[str]:
+    """Names of cases slower than baseline * (1 + threshold)."""
+    return [
+        name
+        for name, ns in results.items()
+        if name in baseline and ns > baseline[name] * (1.0 + threshold)
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-k", dest="pattern", default="", help="Only run cases containing this substring")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--json", type=Path, help="Write results to this file")
+    ap.add_argument("--save", action="store_true", help=f"Store results as baseline ({BASELINE.name})")
+    ap.add_argument("--compare", action="store_true", help="Compare with the stored baseline")
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    ap.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown (0.25 = +25%%)")
+    args = ap.parse_args(argv)
+
+    baseline: dict[str, float] = {}
+    if args.compare:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+
+    results: dict[str, float] = {}
+    skipped: dict[str, str] = {}
+    with tempfile.TemporaryDirectory(prefix="tl-bench-") as tmp:
+        for name, setup in CASES.items():
+            if args.pattern not in name:
+                continue
+            try:
+                fn, ops = setup(Path(tmp))
+            except (SkipCase, ImportError) as e:
+                skipped[name] = str(e)
+                print(f"{name:<30} skipped: {e}")
+                continue
+            ns = results[name] = round(measure(fn, ops, args.repeat), 1)
+            line = f"{name:<30} {ns:12.0f} ns/op"
+            if name in baseline:
+                line += f"  {ns / baseline[name] - 1.0:+7.1%} vs baseline"
+            print(line)
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+        "skipped": skipped,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.save:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if args.compare:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"regressions over +{args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+"""
+CLI startup cost per subcommand.
+
+    python -m benchmarks.startup [--runs 5] [--json out.json]
+    python -m benchmarks.startup --check        # exit 1 when a budget is exceeded
+
+Runs every subcommand in a fresh interpreter with `-X importtime` and reports
+the median wall time, the import time spent from `terminal_lyrics` on
+(interpreter startup and site packages excluded), and which heavy
+dependencies were imported. For `watch` it measures the time until the first
+frame reaches stdout instead; the process is killed after that, so no player
+or D-Bus session is needed.
+
+Budgets are import-time ceilings in ms for a typical laptop; they mainly
+catch an eager import of dbus / requests / sqlite3 / numpy sneaking back into
+a path that does not need it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+
+HEAVY = (
+    "dbus",
+    "requests",
+    "sqlite3",
+    "numpy",
+    "http.server",
+    "concurrent.futures",
+    "terminal_lyrics.app",
+    "terminal_lyrics.sources.service",
+)
+
+# subcommand -> import-time budget (ms) from terminal_lyrics on
+BUDGETS_MS = {
+    "--help": 250.0,  # typer renders help with rich
+    "parse": 120.0,
+    "export": 120.0,
+    "config": 120.0,
+    "timeline": 250.0,  # numpy when installed
+    "cache": 150.0,
+    "sources": 150.0,
+    "watch": 200.0,  # time to first frame, wall clock
+}
+
+
+def parse_importtime(stderr: str) -> tuple[float, set[str]]:
+    """(ms imported from the first terminal_lyrics module on, all imported module names)."""
+    total_us = 0
+    counting = False
+    names: set[str] = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cumulative, raw = line[len("import time:") :].split("|", 2)
+        name = raw.strip()
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        names.add(name)
+        top_level = raw.startswith(" ") and not raw.startswith("  ")
+        if top_level and name.startswith("terminal_lyrics"):
+            counting = True
+        if counting and top_level:
+            total_us += int(cumulative)
+    return total_us / 1000.0, names
+
+
+def commands(lrc: Path) -> dict[str, list[str]]:
+    return {
+        "--help": ["--help"],
+        "parse": ["parse", str(lrc)],
+        "export": ["export", str(lrc), "--format", "srt"],
+        "config": ["config"],
+        "timeline": ["timeline", str(lrc)],
+        "cache": ["cache"],
+        "sources": ["sources", "--stats"],
+    }
+
+
+def _env(tmp: Path) -> dict[str, str]:
+    env = dict(os.environ)
+    env.update(XDG_CACHE_HOME=str(tmp / "cache"), XDG_CONFIG_HOME=str(tmp / "config"))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (str(REPO), env.get("PYTHONPATH"))))
+    return env
+
+
+def run_command(args: list[str], env: dict[str, str]) -> tuple[float, float, set[str]]:
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "terminal_lyrics", *args],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000.0
+    import_ms, names = parse_importtime(proc.stderr)
+    return wall_ms, import_ms, names
+
+
+def first_frame_ms(env: dict[str, str], timeout_s: float = 10.0) -> float:
+    """Wall time from spawn until the first rendered frame (second clear-screen) is written."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "terminal_lyrics", "watch", "--no-alt-screen"],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        seen = b""
+        assert proc.stdout is not None
+        while seen.count(b"\x1b[2J") < 2:
+            chunk = os.read(proc.stdout.fileno(), 4096)
+            if not chunk or time.perf_counter() - started > timeout_s:
+                return float("nan")
+            seen += chunk
+        return (time.perf_counter() - started) * 1000.0
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--check", action="store_true", help="Exit 1 when a subcommand exceeds its budget")
+    ap.add_argument("--json", type=Path, help="Write results to this file")
+    args = ap.parse_args()
+
+    results: dict[str, dict[str, object]] = {}
+    with tempfile.TemporaryDirectory(prefix="tl-startup-") as tmp_s:
+        tmp = Path(tmp_s)
+        lrc = tmp / "song.lrc"
+        lrc.write_text("[00:01.00]one\n[00:02.50]two\n[00:04.00]three\n", encoding="utf-8")
+        env = _env(tmp)
+
+        for name, argv in commands(lrc).items():
+            walls, imports = [], []
+            heavy: set[str] = set()
+            for _ in range(args.runs):
+                wall_ms, import_ms, names = run_command(argv, env)
+                walls.append(wall_ms)
+                imports.append(import_ms)
+                heavy |= {h for h in HEAVY if h in names}
+            results[name] = {
+                "wall_ms": round(statistics.median(walls), 1),
+                "import_ms": round(statistics.median(imports), 1),
+                "heavy": sorted(heavy),
+            }
+        frames = [first_frame_ms(env) for _ in range(args.runs)]
+        results["watch"] = {"wall_ms": round(statistics.median(frames), 1), "first_frame_ms": round(statistics.median(frames), 1)}
+
+    over = []
+    for name, r in results.items():
+        measured = r.get("first_frame_ms", r.get("import_ms"))
+        budget = BUDGETS_MS[name]
+        flag = "" if measured <= budget else "  OVER BUDGET"  # type: ignore[operator]
+        if flag:
+            over.append(name)
+        heavy = ",".join(r.get("heavy", [])) or "-"  # type: ignore[arg-type]
+        print(f"{name:<10} wall {r['wall_ms']:>7} ms  measured {measured:>7} ms / budget {budget:>5.0f}  heavy: {heavy}{flag}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if args.check and over:
+        print(f"over budget: {', '.join(over)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
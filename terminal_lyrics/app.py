@@ -3,110 +3,563 @@ from __future__ import annotations
 import logging
 import signal
 import time
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, Callable, Sequence
 
 from terminal_lyrics.config import AppConfig
+from terminal_lyrics.events import (
+    Event,
+    Focus,
+    Highlight,
+    LineChanged,
+    Notice,
+    PlaybackChanged,
+    Seeked,
+    Sink,
+    Tee,
+    TrackChanged,
+)
 from terminal_lyrics.i18n import set_lang, t
 from terminal_lyrics.lrc.parse import parse_lrc
-from terminal_lyrics.mpris.client import MprisClient
+from terminal_lyrics.metrics import WatchMetrics, exporting, timed
 from terminal_lyrics.mpris.errors import NoPlayersFound, PlayerUnavailable
 from terminal_lyrics.render.ansi import AnsiRenderer
-from terminal_lyrics.sources.service import LyricsService
+from terminal_lyrics.render.screen import ScreenSink
 from terminal_lyrics.sources.types import TrackKey
+from terminal_lyrics.sync.latency import LatencyCompensator
 from terminal_lyrics.sync.tracker import LineTracker
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+    from terminal_lyrics.mpris.client import MprisClient
+    from terminal_lyrics.mpris.types import PlayerClient, TrackInfo
+    from terminal_lyrics.sources.service import LyricsResponse, LyricsService
+
 logger = logging.getLogger(__name__)
 
+# debug log of lateness percentiles every this many line changes
+LATENESS_REPORT_EVERY = 32
+# a position further than this from where playback could have got to is a seek
+SEEK_TOLERANCE_MS = 500
+
+# multi-player mode: how often the player list is re-read, how often idle
+# players (paused, no synced lyrics) are polled, concurrent lyrics lookups
+PLAYER_SCAN_S = 1.0
+IDLE_POLL_S = 1.0
+RESOLVE_WORKERS = 2
+MIN_SLEEP_S = 0.001
+
+
+def _pick_mpris_player(preferred: str | None = None) -> MprisClient:
+    # deferred: importing dbus is a large part of startup; the first frame goes out before it
+    from terminal_lyrics.mpris.client import MprisClient
+
+    return MprisClient.pick_player(preferred=preferred)
 
-def watch(cfg: AppConfig, *, preferred_player: str | None, debug: bool) -> int:
+
+def snapshot(
+    cfg: AppConfig,
+    *,
+    preferred_player: str | None,
+    pick_player: Callable[..., PlayerClient] | None = None,
+    use_daemon: bool = True,
+) -> list[Event]:
     """
-    Main watch loop:
-    MPRIS -> (track, position) -> lyrics -> parse -> bisect -> render on change.
+    Current track and line in one shot, for bars that run a command every
+    second: from a running daemon if there is one, otherwise one MPRIS read
+    (metadata + position) and the lyrics cache. The network is never used;
+    a track that is not cached yet shows as its title until `watch` or the
+    daemon has fetched it.
     """
     set_lang(cfg.lang)
-    svc = LyricsService(cfg)
+    if use_daemon:
+        from terminal_lyrics.daemon import query, socket_path
+
+        path = socket_path(cfg)
+        if path.exists():
+            try:
+                return query(path)
+            except OSError:
+                logger.debug("no daemon at %s, reading the player directly", path)
+
+    pick = pick_player if pick_player is not None else _pick_mpris_player
+    try:
+        client = pick(preferred=preferred_player)
+    except NoPlayersFound:
+        return [Notice("no_mpris_players", t("no_mpris_players"))]
+    player = getattr(client, "service_name", "")
+    try:
+        ti = client.track_info()
+    except PlayerUnavailable as e:
+        return [Notice("mpris_unavailable", t("mpris_unavailable", msg=str(e)), player)]
+    if not ti.title or not ti.artist:
+        return [Notice("no_artist_title", t("no_artist_title"), player)]
+
+    # deferred: sqlite3 only, the service (requests, sources) is not needed
+    from terminal_lyrics.cache.sqlite import CacheKey, LyricsCache
+
+    lrc_text, _has = LyricsCache(cfg.cache_db_path).get(CacheKey(artist=ti.artist, title=ti.title, album=ti.album))
+    doc = parse_lrc(lrc_text) if lrc_text else None
+    if doc is None or not len(doc):
+        return [TrackChanged(player, ti.artist, ti.title, ti.album, "cache" if lrc_text else None, synced=False)]
+
+    track = TrackChanged(
+        player, ti.artist, ti.title, ti.album, "cache", synced=True, lines=tuple(doc.texts), times=tuple(doc.times)
+    )
+    try:
+        pos_ms = client.position_ms()
+    except PlayerUnavailable:
+        return [track]
+    tracker = LineTracker.from_document(doc)
+    i = tracker.current_index(pos_ms)
+    t_ms = tracker.t_ms
+    line = LineChanged(
+        player,
+        i,
+        tracker.texts[i] if i >= 0 else "",
+        t_ms[i] if i >= 0 else None,
+        t_ms[i + 1] if i + 1 < len(t_ms) else None,
+        pos_ms,
+    )
+    return [track, line]
+
+
+def _mpris_player_lister() -> Callable[[], Sequence[MprisClient]]:
+    from terminal_lyrics.mpris.client import MprisClient
+
+    known: dict[str, MprisClient] = {}
+    return lambda: MprisClient.all_players(known)
+
+
+def watch(
+    cfg: AppConfig,
+    *,
+    preferred_player: str | None,
+    debug: bool,
+    renderer: AnsiRenderer | None = None,
+    pick_player: Callable[..., PlayerClient] | None = None,
+    service: LyricsService | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+    metrics: WatchMetrics | None = None,
+    sink: Sink | None = None,
+    all_players: bool = False,
+    list_players: Callable[[], Sequence[PlayerClient]] | None = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> int:
+    """
+    Main watch loop:
+    MPRIS -> (track, position) -> lyrics -> parse -> bisect -> events on change.
+
+    Events go to `sink`; the default is the full-screen renderer (`renderer`
+    or a new AnsiRenderer). With `cfg.state_file` they are also published
+    to that file. `pick_player`, `service`, `sleep` and `clock` (seek
+    detection, scheduling) are injection points for tests and benchmarks
+    (mock players, virtual clock). `metrics`
+    defaults to the exporters configured in `cfg` (none: no instrumentation
+    at all).
+
+    With `all_players` every player on the bus is tracked at once (see
+    `_watch_all`; `list_players` is its injection point) and
+    events carry the player they belong to; the default screen shows one of
+    them (`preferred_player`, else the one that started playing last).
+
+    Startup is ordered for a fast first frame: the screen is drawn before
+    D-Bus is imported, and the lyrics service (requests, SQLite, cache
+    directory) is only built when the first track needs lyrics.
+    """
+    with ExitStack() as stack:
+        if metrics is None and (cfg.metrics_file is not None or cfg.metrics_addr):
+            metrics = stack.enter_context(exporting(cfg))
+        if sink is None:
+            if renderer is None:
+                stream = metrics.metered_stream() if metrics is not None else None
+                renderer = AnsiRenderer(use_alt_screen=cfg.use_alt_screen, stream=stream)
+            sink = ScreenSink(renderer, cfg.context_lines)
+            if all_players:
+                sink = Focus(sink, preferred_player)
+        if cfg.state_file is not None:
+            from terminal_lyrics.statefile import StateFileSink
+
+            state: Sink = StateFileSink(cfg.state_file)
+            if all_players:
+                # the file holds one line: the player a single display would show
+                state = Focus(state, preferred_player)
+            sink = Tee(sink, state)
+        if all_players:
+            lister = list_players if list_players is not None else _mpris_player_lister()
+            return _watch_all(cfg, sink, lister, service, sleep, clock, metrics)
+        return _watch(cfg, preferred_player, sink, pick_player, service, sleep, clock, metrics)
+
+
+class _Notices:
+    """Emits a notice only when it differs from the last one."""
+
+    __slots__ = ("sink", "current")
+
+    def __init__(self, sink: Sink):
+        self.sink = sink
+        self.current: Notice | None = None
+
+    def show(self, key: str, text: str, player: str | None = None) -> None:
+        ev = Notice(key, text, player)
+        if ev != self.current:
+            self.current = ev
+            self.sink.emit(ev)
+
+
+class _Loop:
+    """What all players share: config, output, lyrics service and instrumentation."""
+
+    def __init__(
+        self,
+        cfg: AppConfig,
+        sink: Sink,
+        service: LyricsService | None,
+        m: WatchMetrics | None,
+        pool: Executor | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.cfg = cfg
+        self.sink = sink
+        self.m = m
+        # resolves lyrics off the loop thread (multi-player); None: inline
+        self.pool = pool
+        self.clock = clock
+        self.tick_s = 1.0 / max(cfg.refresh_hz, 1.0)
+        self._svc = service
+        # histograms for the hot path, resolved once (None: not measured)
+        self.dbus_metadata = m.dbus_seconds.labels("metadata") if m is not None else None
+        self.dbus_position = m.dbus_seconds.labels("position_ms") if m is not None else None
+        self.dbus_status = m.dbus_seconds.labels("playback_status") if m is not None else None
+        self.render_frame = m.render_seconds.labels("frame") if m is not None else None
+        self.render_highlight = m.render_seconds.labels("highlight") if m is not None else None
+
+    def service(self) -> LyricsService:
+        if self._svc is None:
+            from terminal_lyrics.sources.service import LyricsService
+
+            self._svc = LyricsService(self.cfg, metrics=self.m)
+        return self._svc
+
+    def resolve(self, track: TrackKey) -> LyricsResponse:
+        svc = self.service()
+        m = self.m
+        if m is None:
+            res = svc.get_lyrics(track)
+        else:
+            started = time.perf_counter()
+            res = svc.get_lyrics(track)
+            m.resolve_seconds.labels(res.source or "none").observe(time.perf_counter() - started)
+        svc.prefetch_album(track)
+        return res
+
+
+class _PlayerState:
+    """
+    One player as the loop sees it: current track and its tracker, latency
+    compensation of its position clock, and pause detection.
+    """
+
+    __slots__ = (
+        "name", "notices", "comp", "track_key", "track_ev", "tracker", "last_hl",
+        "last_pos", "last_read", "status", "stall_checked", "pending",
+    )
+
+    def __init__(self, name: str, notices: _Notices, comp: LatencyCompensator):
+        self.name = name
+        self.notices = notices
+        self.comp = comp
+        self.track_key: str | None = None
+        self.track_ev: TrackChanged | None = None
+        self.tracker: LineTracker | None = None
+        self.last_hl = 0
+        # pause detection: PlaybackStatus is only asked for once the position stops moving
+        self.last_pos: int | None = None
+        # loop clock at the last position read (seek detection)
+        self.last_read = 0.0
+        self.status = "Playing"
+        self.stall_checked = False
+        # lyrics being resolved on the loop's pool: (track info, future)
+        self.pending: tuple[TrackInfo, Future[LyricsResponse]] | None = None
+
+    def step(self, loop: _Loop, client: PlayerClient) -> float:
+        """Polls `client` once and emits what changed; returns the seconds until the next poll."""
+        sink = loop.sink
+        player = self.name
+        try:
+            ti = timed(loop.dbus_metadata, client.track_info)
+        except PlayerUnavailable as e:
+            self.notices.show("mpris_unavailable", t("mpris_unavailable", msg=str(e)), player)
+            return 0.5
+
+        if not ti.title or not ti.artist:
+            self.notices.show("no_artist_title", t("no_artist_title"), player)
+            return 0.5
+
+        # track changed?
+        if ti.track_key != self.track_key:
+            self.track_key = ti.track_key
+            self.notices.current = None
+            self.track_ev = None
+            self.tracker = None
+            self.last_hl = 0
+            self.last_pos = None
+            self.status = "Playing"
+            self.stall_checked = False
+            self.pending = None
+
+            track = TrackKey(artist=ti.artist, title=ti.title, album=ti.album)
+            if loop.pool is None:
+                wait = self._load(loop, ti, loop.resolve(track))
+                if wait is not None:
+                    return wait
+            else:
+                loop.service()  # built here, not concurrently on the pool
+                self.pending = (ti, loop.pool.submit(loop.resolve, track))
+        elif self.notices.current is not None and self.track_ev is not None:
+            # same track after a notice (player came back): show it again
+            self.notices.current = None
+            sink.emit(self.track_ev)
+            if self.tracker is not None:
+                self.tracker.last_idx = -1
+                self.last_hl = 0
+
+        if self.pending is not None:
+            pending_ti, future = self.pending
+            if not future.done():
+                return loop.tick_s
+            self.pending = None
+            wait = self._load(loop, pending_ti, future.result())
+            if wait is not None:
+                return wait
+
+        # synced mode
+        tracker = self.tracker
+        if tracker is None:
+            return loop.tick_s
+        comp = self.comp
+        m = loop.m
+        try:
+            before = time.perf_counter()
+            pos_ms = client.position_ms()
+            after = time.perf_counter()
+        except PlayerUnavailable:
+            # if player briefly unavailable, don't crash; keep last frame
+            return loop.tick_s
+        if loop.dbus_position is not None:
+            loop.dbus_position.observe(after - before)
+        comp.observe_call(before, after)
+        # where the player will be once this frame is on screen
+        eff_ms = comp.effective_ms(pos_ms)
+
+        # seek: the position doesn't follow from the last one and the time
+        # since (at most that much further, less if paused in between)
+        read_at = loop.clock()
+        last_pos = self.last_pos
+        seeked = last_pos is not None and not (
+            last_pos - SEEK_TOLERANCE_MS
+            <= pos_ms
+            <= last_pos + (read_at - self.last_read) * 1000.0 + SEEK_TOLERANCE_MS
+        )
+        self.last_read = read_at
 
-    renderer = AnsiRenderer(use_alt_screen=cfg.use_alt_screen)
-    renderer.enter()
-    
+        if pos_ms != self.last_pos:
+            self.stall_checked = False
+            if self.status != "Playing" and self.last_pos is not None:
+                self.status = "Playing"
+                sink.emit(PlaybackChanged(player, self.status, pos_ms))
+        elif not self.stall_checked:
+            self.stall_checked = True
+            try:
+                now_status = timed(loop.dbus_status, client.playback_status)
+            except PlayerUnavailable:
+                now_status = self.status
+            if now_status != self.status:
+                self.status = now_status
+                sink.emit(PlaybackChanged(player, self.status, pos_ms))
+        self.last_pos = pos_ms
+
+        changed = tracker.changed_index(eff_ms)
+        if seeked:
+            sink.emit(Seeked(player, eff_ms))
+            if m is not None:
+                m.seeks.inc()
+        if changed is not None:
+            t_ms = tracker.t_ms
+            ev = LineChanged(
+                player,
+                changed,
+                tracker.texts[changed] if changed >= 0 else "",
+                t_ms[changed] if changed >= 0 else None,
+                t_ms[changed + 1] if changed + 1 < len(t_ms) else None,
+                eff_ms,
+            )
+            timed(loop.render_frame, sink.emit, ev)
+            self.last_hl = 0
+            drawn = time.perf_counter()
+            comp.observe_render(drawn - after)
+            # after a seek the line wasn't reached by playing: no lateness sample
+            if not seeked and changed >= 0:
+                lateness_ms = comp.record_line(t_ms[changed], pos_ms, (before + after) / 2, drawn)
+                if m is not None:
+                    m.line_lateness_seconds.observe(lateness_ms / 1000.0)
+                if comp.samples % LATENESS_REPORT_EVERY == 0 and logger.isEnabledFor(logging.DEBUG):
+                    p50, p90, p99 = comp.percentiles() or (0.0, 0.0, 0.0)
+                    logger.debug(
+                        "line lateness p50=%.1fms p90=%.1fms p99=%.1fms (lead %.1fms, n=%d)",
+                        p50, p90, p99, comp.lead_ms, comp.samples,
+                    )
+        if tracker.words is not None:
+            # enhanced LRC: only the newly sung span is redrawn
+            hl = tracker.highlight_pos(eff_ms)
+            if hl != self.last_hl:
+                self.last_hl = hl
+                timed(loop.render_highlight, sink.emit, Highlight(player, tracker.last_idx, hl))
+
+        return comp.sleep_s(loop.tick_s, eff_ms, tracker.next_boundary_ms())
+
+    def _load(self, loop: _Loop, ti: TrackInfo, res: LyricsResponse) -> float | None:
+        """Emits the resolved track; a wait when there is nothing to follow yet."""
+        player = self.name
+        if not res.has_lyrics or not res.lrc_text:
+            self.track_ev = TrackChanged(player, ti.artist, ti.title, ti.album, res.source, synced=False)
+            loop.sink.emit(self.track_ev)
+            return 0.5
+
+        doc = parse_lrc(res.lrc_text)
+        if len(doc):
+            self.tracker = LineTracker.from_document(doc)
+            self.track_ev = TrackChanged(
+                player, ti.artist, ti.title, ti.album, res.source, synced=True,
+                lines=tuple(self.tracker.texts), times=tuple(self.tracker.t_ms),
+            )
+        else:
+            # plain text lyrics: shown once, without a current line
+            plain_lines = tuple(ln.rstrip() for ln in res.lrc_text.splitlines())
+            self.track_ev = TrackChanged(
+                player, ti.artist, ti.title, ti.album, res.source, synced=False, lines=plain_lines
+            )
+        loop.sink.emit(self.track_ev)
+        return None
+
+
+def _on_sigint_exit(sink: Sink) -> None:
     # Handle SIGINT (Ctrl+C) gracefully
     def _on_sigint(signum, frame):
-        renderer.exit()
+        sink.exit()
         raise KeyboardInterrupt
-    
+
     signal.signal(signal.SIGINT, _on_sigint)
-    
-    try:
-        last_track_key: str | None = None
-        last_rendered_plain: str | None = None
-        tracker: LineTracker | None = None
-        timed_lines: list[str] = []
 
-        tick_s = 1.0 / max(cfg.refresh_hz, 1.0)
 
+def _watch(
+    cfg: AppConfig,
+    preferred_player: str | None,
+    sink: Sink,
+    pick_player: Callable[..., PlayerClient] | None,
+    service: LyricsService | None,
+    sleep: Callable[[float], None],
+    clock: Callable[[], float],
+    m: WatchMetrics | None,
+) -> int:
+    set_lang(cfg.lang)
+    pick = pick_player if pick_player is not None else _pick_mpris_player
+
+    sink.enter()
+    # a notice replaces the lyrics; it is only emitted when it changes
+    notices = _Notices(sink)
+    notices.show("connecting_player", t("connecting_player"))
+    _on_sigint_exit(sink)
+
+    loop = _Loop(cfg, sink, service, m, clock=clock)
+    # the picked player may change; its state (and position clock) carries over
+    state = _PlayerState("", notices, LatencyCompensator(max_lead_ms=cfg.max_lead_ms))
+    try:
         while True:
             try:
-                client = MprisClient.pick_player(preferred=preferred_player)
+                client = pick(preferred=preferred_player)
             except NoPlayersFound:
-                renderer.render("terminal-lyrics", [t("no_mpris_players")], current_idx=-1)
-                time.sleep(1.0)
+                notices.show("no_mpris_players", t("no_mpris_players"))
+                sleep(1.0)
                 continue
+            state.name = getattr(client, "service_name", "")
+            sleep(state.step(loop, client))
+    finally:
+        sink.exit()
 
-            try:
-                ti = client.track_info()
-            except PlayerUnavailable as e:
-                renderer.render("terminal-lyrics", [t("mpris_unavailable", msg=str(e))], current_idx=-1)
-                time.sleep(0.5)
-                continue
 
-            if not ti.title or not ti.artist:
-                renderer.render("terminal-lyrics", [t("no_artist_title")], current_idx=-1)
-                time.sleep(0.5)
-                continue
+def _watch_all(
+    cfg: AppConfig,
+    sink: Sink,
+    list_players: Callable[[], Sequence[PlayerClient]],
+    service: LyricsService | None,
+    sleep: Callable[[float], None],
+    clock: Callable[[], float],
+    m: WatchMetrics | None,
+) -> int:
+    """
+    Every player at once, each with its own tracker, position clock and
+    lyrics lookup, all sharing one bus connection, one service (cache, HTTP
+    connection pool) and one output.
 
-            # track changed?
-            if ti.track_key != last_track_key:
-                last_track_key = ti.track_key
-                last_rendered_plain = None
-                tracker = None
-                timed_lines = []
-
-                track = TrackKey(artist=ti.artist, title=ti.title, album=ti.album)
-                res = svc.get_lyrics(track)
-                if not res.has_lyrics or not res.lrc_text:
-                    renderer.render(track.display, [t("lyrics_not_found")], current_idx=-1)
-                    time.sleep(0.5)
-                    continue
+    Players are polled on their own schedule: a playing track with synced
+    lyrics at the refresh rate (and at its line boundaries), a paused one or
+    one without synced lyrics every IDLE_POLL_S. The player list is
+    re-read every PLAYER_SCAN_S. Lyrics are resolved on a small thread pool
+    so a slow lookup for one player doesn't stall the others.
+    """
+    # deferred: only the multi-player mode resolves in the background
+    from concurrent.futures import ThreadPoolExecutor
 
-                doc = parse_lrc(res.lrc_text)
-                if doc.events:
-                    tracker = LineTracker.from_events(doc.events)
-                    timed_lines = [e.text for e in doc.events]
-                    # initial render
-                    renderer.render(track.display, timed_lines, current_idx=-1, context_lines=cfg.context_lines)
-                else:
-                    # plain text lyrics: render once with unsynced indicator
-                    plain_lines = [ln.rstrip() for ln in res.lrc_text.splitlines()]
-                    last_rendered_plain = "\n".join(plain_lines)
-                    # Add visual indicator for unsynced lyrics
-                    title_with_indicator = (
-                        f"{track.display} {renderer.theme.warning}{t('unsynced_label')}{renderer.theme.reset}"
-                    )
-                    renderer.render(title_with_indicator, plain_lines, current_idx=-1, context_lines=cfg.context_lines)
+    set_lang(cfg.lang)
+    sink.enter()
+    notices = _Notices(sink)
+    notices.show("connecting_player", t("connecting_player"))
+    _on_sigint_exit(sink)
 
-            # synced mode
-            if tracker is not None:
+    pool = ThreadPoolExecutor(max_workers=RESOLVE_WORKERS, thread_name_prefix="resolve")
+    loop = _Loop(cfg, sink, service, m, pool=pool, clock=clock)
+    states: dict[str, _PlayerState] = {}
+    due: dict[str, float] = {}
+    clients: Sequence[PlayerClient] = ()
+    next_scan = clock()
+    try:
+        while True:
+            now = clock()
+            if now >= next_scan:
+                next_scan = now + PLAYER_SCAN_S
                 try:
-                    pos_ms = client.position_ms()
-                except PlayerUnavailable:
-                    # if player briefly unavailable, don't crash; keep last frame
-                    time.sleep(tick_s)
-                    continue
+                    clients = list_players()
+                except NoPlayersFound:
+                    clients = ()
+                names = {getattr(c, "service_name", "") for c in clients}
+                for gone in states.keys() - names:
+                    del states[gone]
+                    del due[gone]
+                    sink.emit(Notice("player_gone", t("player_gone", player=gone), gone))
+                if not clients:
+                    notices.show("no_mpris_players", t("no_mpris_players"))
+                else:
+                    notices.current = None
 
-                changed = tracker.changed_index(pos_ms)
-                if changed is not None:
-                    renderer.render(f"{ti.artist} - {ti.title}", timed_lines, current_idx=changed, context_lines=cfg.context_lines)
+            for client in clients:
+                name = getattr(client, "service_name", "")
+                state = states.get(name)
+                if state is None:
+                    state = states[name] = _PlayerState(
+                        name, _Notices(sink), LatencyCompensator(max_lead_ms=cfg.max_lead_ms)
+                    )
+                    due[name] = now
+                if due[name] > now:
+                    continue
+                wait = state.step(loop, client)
+                if state.pending is None and (state.tracker is None or state.status != "Playing"):
+                    wait = max(wait, IDLE_POLL_S)
+                due[name] = clock() + wait
 
-            time.sleep(tick_s)
+            wake = min(min(due.values(), default=next_scan), next_scan)
+            sleep(max(wake - clock(), MIN_SLEEP_S))
     finally:
-        renderer.exit()
-
+        pool.shutdown(wait=False, cancel_futures=True)
+        sink.exit()
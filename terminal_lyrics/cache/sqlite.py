@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import sqlite3
 import time
@@ -9,6 +10,12 @@ from pathlib import Path
 logger = logging.getLogger(__name__)
 
 
+def content_hash(lrc_text: str | None) -> str | None:
+    if lrc_text is None:
+        return None
+    return hashlib.sha1(lrc_text.encode("utf-8")).hexdigest()
+
+
 @dataclass(frozen=True, slots=True)
 class CacheKey:
     artist: str
@@ -16,6 +23,16 @@ class CacheKey:
     album: str
 
 
+@dataclass(frozen=True, slots=True)
+class CacheEntry:
+    has_lyrics: bool
+    lrc_text: str | None
+    source: str | None
+    updated_at: int
+    content_hash: str | None = None
+    remote_id: int | None = None
+
+
 class LyricsCache:
     def __init__(self, db_path: Path):
         self.db_path = db_path
@@ -43,9 +60,25 @@ class LyricsCache:
                 );
                 """
             )
+            # columns added after the first release: migrate old databases in place
+            columns = {row["name"] for row in con.execute("PRAGMA table_info(lyrics_cache)")}
+            if "content_hash" not in columns:
+                con.execute("ALTER TABLE lyrics_cache ADD COLUMN content_hash TEXT")
+            if "remote_id" not in columns:
+                con.execute("ALTER TABLE lyrics_cache ADD COLUMN remote_id INTEGER")
             con.execute(
                 "CREATE INDEX IF NOT EXISTS idx_lyrics_cache_updated_at ON lyrics_cache(updated_at);"
             )
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS album_prefetch (
+                    artist TEXT NOT NULL,
+                    album  TEXT NOT NULL,
+                    fetched_at INTEGER NOT NULL,
+                    PRIMARY KEY (artist, album)
+                );
+                """
+            )
 
     def get(self, key: CacheKey) -> tuple[str | None, bool | None]:
         """
@@ -61,23 +94,99 @@ class LyricsCache:
             has = bool(row["has_lyrics"])
             return (row["lrc_text"] if has else None), has
 
-    def set(self, key: CacheKey, *, has_lyrics: bool, lrc_text: str | None, source: str | None) -> None:
+    def get_entry(self, key: CacheKey) -> CacheEntry | None:
+        """
+        Full row including source and updated_at, or None if no entry.
+        """
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT has_lyrics, source, lrc_text, updated_at, content_hash, remote_id "
+                "FROM lyrics_cache WHERE artist=? AND title=? AND album=?",
+                (key.artist, key.title, key.album),
+            ).fetchone()
+            if row is None:
+                return None
+            has = bool(row["has_lyrics"])
+            return CacheEntry(
+                has_lyrics=has,
+                lrc_text=row["lrc_text"] if has else None,
+                source=row["source"],
+                updated_at=int(row["updated_at"]),
+                content_hash=row["content_hash"],
+                remote_id=row["remote_id"],
+            )
+
+    def set(
+        self,
+        key: CacheKey,
+        *,
+        has_lyrics: bool,
+        lrc_text: str | None,
+        source: str | None,
+        remote_id: int | None = None,
+    ) -> None:
         now = int(time.time())
         with self._connect() as con:
             con.execute(
                 """
-                INSERT INTO lyrics_cache(artist, title, album, has_lyrics, source, lrc_text, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO lyrics_cache(
+                    artist, title, album, has_lyrics, source, lrc_text, updated_at,
+                    content_hash, remote_id
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(artist, title, album) DO UPDATE SET
                     has_lyrics=excluded.has_lyrics,
                     source=excluded.source,
                     lrc_text=excluded.lrc_text,
-                    updated_at=excluded.updated_at
+                    updated_at=excluded.updated_at,
+                    content_hash=excluded.content_hash,
+                    remote_id=excluded.remote_id
+                """,
+                (
+                    key.artist,
+                    key.title,
+                    key.album,
+                    int(has_lyrics),
+                    source,
+                    lrc_text,
+                    now,
+                    content_hash(lrc_text),
+                    remote_id,
+                ),
+            )
+
+    def touch(self, key: CacheKey) -> None:
+        """Mark an entry as verified now without changing its content."""
+        with self._connect() as con:
+            con.execute(
+                "UPDATE lyrics_cache SET updated_at=? WHERE artist=? AND title=? AND album=?",
+                (int(time.time()), key.artist, key.title, key.album),
+            )
+
+    def album_prefetched_at(self, artist: str, album: str) -> int | None:
+        """
+        Returns unix time of the last album prefetch, or None if never done.
+        """
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT fetched_at FROM album_prefetch WHERE artist=? AND album=?",
+                (artist, album),
+            ).fetchone()
+            return int(row["fetched_at"]) if row is not None else None
+
+    def mark_album_prefetched(self, artist: str, album: str) -> None:
+        now = int(time.time())
+        with self._connect() as con:
+            con.execute(
+                """
+                INSERT INTO album_prefetch(artist, album, fetched_at) VALUES (?, ?, ?)
+                ON CONFLICT(artist, album) DO UPDATE SET fetched_at=excluded.fetched_at
                 """,
-                (key.artist, key.title, key.album, int(has_lyrics), source, lrc_text, now),
+                (artist, album, now),
             )
 
     def clear(self) -> None:
         with self._connect() as con:
             con.execute("DELETE FROM lyrics_cache")
+            con.execute("DELETE FROM album_prefetch")
 
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Keep only the most recent calls per (source, request_class): stats follow
+# the current behaviour of a source and the table stays small.
+MAX_CALLS_PER_GROUP = 500
+
+OUTCOMES = ("synced", "plain", "miss", "error")
+
+
+@dataclass(frozen=True, slots=True)
+class SourceStats:
+    source: str
+    request_class: str
+    calls: int
+    synced: int
+    plain: int
+    misses: int
+    errors: int
+    p50_ms: int
+    p90_ms: int
+    p99_ms: int
+
+    @property
+    def hit_value(self) -> float:
+        """Expected usefulness of one call: synced counts fully, plain half."""
+        if not self.calls:
+            return 0.0
+        return (self.synced + 0.5 * self.plain) / self.calls
+
+
+def _percentile(sorted_values: list[int], q: float) -> int:
+    if not sorted_values:
+        return 0
+    idx = min(int(q * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[idx]
+
+
+class SourceStatsStore:
+    """
+    Per-source call log in the cache DB (table `source_calls`), used for
+    adaptive source ordering and `terminal-lyrics sources --stats`.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        con = sqlite3.connect(self.db_path)
+        con.row_factory = sqlite3.Row
+        return con
+
+    def _init_db(self) -> None:
+        with self._connect() as con:
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS source_calls (
+                    source TEXT NOT NULL,
+                    request_class TEXT NOT NULL,
+                    outcome TEXT NOT NULL,
+                    latency_ms INTEGER NOT NULL,
+                    ts INTEGER NOT NULL
+                );
+                """
+            )
+            con.execute(
+                "CREATE INDEX IF NOT EXISTS idx_source_calls_group "
+                "ON source_calls(source, request_class, ts);"
+            )
+
+    def record(self, source: str, request_class: str, outcome: str, latency_ms: float) -> None:
+        if outcome not in OUTCOMES:
+            raise ValueError(f"Unknown outcome: {outcome}")
+        with self._connect() as con:
+            con.execute(
+                "INSERT INTO source_calls(source, request_class, outcome, latency_ms, ts) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (source, request_class, outcome, int(latency_ms), int(time.time())),
+            )
+            con.execute(
+                """
+                DELETE FROM source_calls WHERE rowid IN (
+                    SELECT rowid FROM source_calls WHERE source=? AND request_class=?
+                    ORDER BY ts DESC, rowid DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (source, request_class, MAX_CALLS_PER_GROUP),
+            )
+
+    def summary(self, request_class: str | None = None) -> list[SourceStats]:
+        query = "SELECT source, request_class, outcome, latency_ms FROM source_calls"
+        params: tuple[str, ...] = ()
+        if request_class is not None:
+            query += " WHERE request_class=?"
+            params = (request_class,)
+
+        groups: dict[tuple[str, str], tuple[dict[str, int], list[int]]] = {}
+        with self._connect() as con:
+            for row in con.execute(query, params):
+                counts, latencies = groups.setdefault(
+                    (row["source"], row["request_class"]), ({o: 0 for o in OUTCOMES}, [])
+                )
+                counts[row["outcome"]] += 1
+                latencies.append(int(row["latency_ms"]))
+
+        out: list[SourceStats] = []
+        for (source, rclass), (counts, latencies) in sorted(groups.items()):
+            latencies.sort()
+            out.append(
+                SourceStats(
+                    source=source,
+                    request_class=rclass,
+                    calls=len(latencies),
+                    synced=counts["synced"],
+                    plain=counts["plain"],
+                    misses=counts["miss"],
+                    errors=counts["error"],
+                    p50_ms=_percentile(latencies, 0.50),
+                    p90_ms=_percentile(latencies, 0.90),
+                    p99_ms=_percentile(latencies, 0.99),
+                )
+            )
+        return out
+
+    def clear(self) -> None:
+        with self._connect() as con:
+            con.execute("DELETE FROM source_calls")
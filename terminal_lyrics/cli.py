@@ -1,47 +1,318 @@
 from __future__ import annotations
 
+import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
 import typer
 
-from terminal_lyrics.app import watch as watch_loop
-from terminal_lyrics.cache.sqlite import LyricsCache
 from terminal_lyrics.config import load_config, save_config_lang
 from terminal_lyrics.i18n import set_lang, t
 from terminal_lyrics.logging_setup import setup_logging
-from terminal_lyrics.lrc.export import export_json, export_lrc, export_srt
-from terminal_lyrics.lrc.parse import parse_lrc_with_stats
-from terminal_lyrics.mpris.client import MprisClient
-from terminal_lyrics.sources.service import LyricsService
 
+if TYPE_CHECKING:
+    from terminal_lyrics.events import Sink
+
+# Subcommands import what they need themselves: `parse` or `export` must not
+# pay for D-Bus, requests, SQLite or numpy (see tests/test_startup.py).
 
 app = typer.Typer(no_args_is_help=True, add_completion=False)
 
 
+def _check_metrics_addr(addr: str) -> None:
+    from terminal_lyrics.metrics import parse_addr
+
+    try:
+        parse_addr(addr)
+    except ValueError:
+        raise typer.BadParameter(
+            t("metrics_addr_invalid", addr=addr), param_hint="--metrics-addr"
+        ) from None
+
+
 @app.command()
 def watch(
-    player: str | None = typer.Option(None, "--player", help="MPRIS service or short name (e.g. vlc)"),
+    player: str | None = typer.Option(
+        None, "--player", help="MPRIS service or short name (e.g. vlc)"
+    ),
     debug: bool = typer.Option(False, "--debug", help="Enable debug logging"),
     refresh_hz: float | None = typer.Option(None, "--refresh-hz", help="Polling frequency (Hz)"),
-    no_alt_screen: bool = typer.Option(False, "--no-alt-screen", help="Do not use alternate screen buffer"),
-    context_lines: int | None = typer.Option(None, "--context", help="Lines above/below current line"),
+    no_alt_screen: bool = typer.Option(
+        False, "--no-alt-screen", help="Do not use alternate screen buffer"
+    ),
+    context_lines: int | None = typer.Option(
+        None, "--context", help="Lines above/below current line"
+    ),
+    record: Path | None = typer.Option(
+        None, "--record", help="Log MPRIS observations to an NDJSON file (see replay)"
+    ),
+    metrics_file: Path | None = typer.Option(
+        None, "--metrics-file", help="Write OpenMetrics text to this file periodically"
+    ),
+    metrics_addr: str | None = typer.Option(
+        None, "--metrics-addr", help="Serve OpenMetrics on [host:]port at /metrics"
+    ),
+    connect: bool = typer.Option(
+        False, "--connect", help="Render events from a running `daemon` instead of polling"
+    ),
+    socket_file: Path | None = typer.Option(
+        None, "--socket", help="Daemon socket (default: $XDG_RUNTIME_DIR)"
+    ),
+    output: str = typer.Option(
+        "screen",
+        "--output",
+        "--format",
+        case_sensitive=False,
+        help="screen|ndjson|line (status line for bars)",
+    ),
+    width: int = typer.Option(
+        0, "--width", help="line output: cut lines to this many columns (0 = no limit)"
+    ),
+    once: bool = typer.Option(
+        False, "--once", help="Print the current line once and exit (daemon or cache, no network)"
+    ),
+    publish_state: bool = typer.Option(
+        False, "--publish-state", help="Also publish the current line to an mmap state file"
+    ),
+    all_players: bool = typer.Option(
+        False,
+        "--all-players",
+        help="Track every MPRIS player at once (show --player or the last started)",
+    ),
 ):
     """Watch synced lyrics in terminal (tmux/headless friendly)."""
     cfg = load_config()
     set_lang(cfg.lang)
+    output_l = output.lower()
+    if output_l not in ("screen", "ndjson", "line"):
+        raise typer.BadParameter(t("output_must_be"))
     if refresh_hz is not None:
         cfg = cfg.__class__(**{**cfg.__dict__, "refresh_hz": refresh_hz})
     if context_lines is not None:
         cfg = cfg.__class__(**{**cfg.__dict__, "context_lines": context_lines})
     if no_alt_screen:
         cfg = cfg.__class__(**{**cfg.__dict__, "use_alt_screen": False})
+    if metrics_file is not None:
+        cfg = cfg.__class__(**{**cfg.__dict__, "metrics_file": metrics_file})
+    if metrics_addr is not None:
+        _check_metrics_addr(metrics_addr)
+        cfg = cfg.__class__(**{**cfg.__dict__, "metrics_addr": metrics_addr})
+
+    if socket_file is not None:
+        cfg = cfg.__class__(**{**cfg.__dict__, "socket_path": socket_file})
+    if publish_state and cfg.state_file is None:
+        from terminal_lyrics.statefile import default_state_path
+
+        cfg = cfg.__class__(**{**cfg.__dict__, "state_file": default_state_path()})
+    if all_players:
+        cfg = cfg.__class__(**{**cfg.__dict__, "all_players": True})
+    if record is not None and cfg.all_players:
+        # recordings (and replay) follow a single player
+        raise typer.BadParameter(t("record_one_player"), param_hint="--record")
+    if connect and (record is not None or publish_state):
+        # the daemon reads the player (and publishes the state file), not this client
+        hint = "--record" if record is not None else "--publish-state"
+        raise typer.BadParameter(t("connect_not_with", option=hint), param_hint=hint)
+
+    setup_logging(debug)
+    preferred = player or cfg.preferred_player
+    sink: Sink | None = None
+    if output_l == "ndjson":
+        from terminal_lyrics.render.ndjson import NdjsonSink
+
+        sink = NdjsonSink()
+    elif output_l == "line":
+        from terminal_lyrics.render.line import LineSink
+
+        sink = LineSink(width)
+    if sink is not None and output_l != "ndjson" and (cfg.all_players or connect):
+        # a status line shows one player; ndjson keeps every player's events
+        from terminal_lyrics.events import Focus
+
+        sink = Focus(sink, preferred)
+    if once:
+        import io
+
+        from terminal_lyrics.app import snapshot
+        from terminal_lyrics.render.line import LineSink
+
+        events = snapshot(cfg, preferred_player=preferred)
+        if output_l == "ndjson":
+            assert sink is not None
+            for ev in events:
+                sink.emit(ev)
+            return
+        from terminal_lyrics.events import Focus
+
+        # only the last state counts, not every step towards it; a daemon
+        # tracking every player answers for all of them
+        line = LineSink(width, stream=io.StringIO())
+        focus = Focus(line, preferred)
+        for ev in events:
+            focus.emit(ev)
+        typer.echo(line.text or "")
+        return
+    if connect:
+        from terminal_lyrics.daemon import follow, socket_path
+
+        if sink is None:
+            from terminal_lyrics.events import Focus
+            from terminal_lyrics.render.ansi import AnsiRenderer
+            from terminal_lyrics.render.screen import ScreenSink
+
+            screen = ScreenSink(AnsiRenderer(use_alt_screen=cfg.use_alt_screen), cfg.context_lines)
+            # the daemon may be tracking several players
+            sink = Focus(screen, preferred)
+        raise typer.Exit(code=follow(socket_path(cfg), sink))
+
+    from terminal_lyrics.app import watch as watch_loop
+    from terminal_lyrics.metrics import MetricsUnavailable
+
+    try:
+        if record is None:
+            code = watch_loop(
+                cfg, preferred_player=preferred, debug=debug, sink=sink, all_players=cfg.all_players
+            )
+        else:
+            from terminal_lyrics.mpris.replay import SessionRecorder
+
+            def pick_player(preferred: str | None = None):
+                from terminal_lyrics.mpris.client import MprisClient
+
+                return MprisClient.pick_player(preferred=preferred)
+
+            with SessionRecorder(record) as rec:
+                code = watch_loop(
+                    cfg,
+                    preferred_player=preferred,
+                    debug=debug,
+                    pick_player=rec.wrap_pick(pick_player),
+                    sink=sink,
+                )
+    except MetricsUnavailable as e:
+        typer.echo(t("metrics_unavailable", addr=e.addr, error=e.error), err=True)
+        raise typer.Exit(code=1)
+    raise typer.Exit(code=code)
+
+
+@app.command()
+def daemon(
+    player: str | None = typer.Option(
+        None, "--player", help="MPRIS service or short name (e.g. vlc)"
+    ),
+    debug: bool = typer.Option(False, "--debug", help="Enable debug logging"),
+    refresh_hz: float | None = typer.Option(None, "--refresh-hz", help="Polling frequency (Hz)"),
+    socket_file: Path | None = typer.Option(
+        None, "--socket", help="Socket to listen on (default: $XDG_RUNTIME_DIR)"
+    ),
+    metrics_file: Path | None = typer.Option(
+        None, "--metrics-file", help="Write OpenMetrics text to this file periodically"
+    ),
+    metrics_addr: str | None = typer.Option(
+        None, "--metrics-addr", help="Serve OpenMetrics on [host:]port at /metrics"
+    ),
+    publish_state: bool = typer.Option(
+        False, "--publish-state", help="Also publish the current line to an mmap state file"
+    ),
+    all_players: bool = typer.Option(
+        False, "--all-players", help="Track and broadcast every MPRIS player at once"
+    ),
+):
+    """Poll the player once and serve lyrics events to `watch --connect` clients."""
+    cfg = load_config()
+    set_lang(cfg.lang)
+    if refresh_hz is not None:
+        cfg = cfg.__class__(**{**cfg.__dict__, "refresh_hz": refresh_hz})
+    if socket_file is not None:
+        cfg = cfg.__class__(**{**cfg.__dict__, "socket_path": socket_file})
+    if metrics_file is not None:
+        cfg = cfg.__class__(**{**cfg.__dict__, "metrics_file": metrics_file})
+    if metrics_addr is not None:
+        _check_metrics_addr(metrics_addr)
+        cfg = cfg.__class__(**{**cfg.__dict__, "metrics_addr": metrics_addr})
+    if publish_state and cfg.state_file is None:
+        from terminal_lyrics.statefile import default_state_path
+
+        cfg = cfg.__class__(**{**cfg.__dict__, "state_file": default_state_path()})
+    if all_players:
+        cfg = cfg.__class__(**{**cfg.__dict__, "all_players": True})
 
     setup_logging(debug)
-    raise typer.Exit(code=watch_loop(cfg, preferred_player=player or cfg.preferred_player, debug=debug))
+    from terminal_lyrics.daemon import DaemonRunning, serve
+    from terminal_lyrics.metrics import MetricsUnavailable
+
+    try:
+        code = serve(
+            cfg,
+            preferred_player=player or cfg.preferred_player,
+            debug=debug,
+            all_players=cfg.all_players,
+        )
+    except DaemonRunning as e:
+        typer.echo(t("daemon_running", path=str(e)), err=True)
+        raise typer.Exit(code=1)
+    except MetricsUnavailable as e:
+        typer.echo(t("metrics_unavailable", addr=e.addr, error=e.error), err=True)
+        raise typer.Exit(code=1)
+    raise typer.Exit(code=code)
+
+
+@app.command()
+def state(
+    path: Path | None = typer.Argument(
+        None, help="State file (default: TERMINAL_LYRICS_STATE_FILE or $XDG_RUNTIME_DIR)"
+    ),
+    json_output: bool = typer.Option(False, "--json", help="Output as JSON"),
+):
+    """Print the current line from the state file of `watch/daemon --publish-state`."""
+    cfg = load_config()
+    set_lang(cfg.lang)
+    from terminal_lyrics.statefile import default_state_path, read_state
+
+    st = read_state(path or cfg.state_file or default_state_path())
+    if st is None:
+        typer.echo(t("no_state_file"), err=True)
+        raise typer.Exit(code=1)
+    if json_output:
+        import json
+        from dataclasses import asdict
+
+        typer.echo(json.dumps(asdict(st), ensure_ascii=False))
+    else:
+        typer.echo(st.text if st.notice else f"{st.track}\t{st.index}\t{st.text}")
+
+
+@app.command()
+def replay(
+    recording: Path,
+    speed: float = typer.Option(1.0, "--speed", help="Playback speed (e.g. 4 = four times faster)"),
+    debug: bool = typer.Option(False, "--debug", help="Enable debug logging"),
+    no_alt_screen: bool = typer.Option(
+        False, "--no-alt-screen", help="Do not use alternate screen buffer"
+    ),
+):
+    """Replay a session recorded with `watch --record` through the watch loop."""
+    cfg = load_config()
+    set_lang(cfg.lang)
+    if no_alt_screen:
+        cfg = cfg.__class__(**{**cfg.__dict__, "use_alt_screen": False})
+    setup_logging(debug)
+    from terminal_lyrics.app import watch as watch_loop
+    from terminal_lyrics.mpris.replay import ReplayFinished, ReplaySession
+
+    session = ReplaySession(recording, speed=speed)
+    try:
+        code = watch_loop(cfg, preferred_player=None, debug=debug, pick_player=session.pick_player)
+    except ReplayFinished:
+        code = 0
+    raise typer.Exit(code=code)
 
 
 @app.command()
 def players():
     """List available MPRIS players."""
+    from terminal_lyrics.mpris.client import MprisClient
+
     for p in MprisClient.list_players():
         typer.echo(p)
 
@@ -49,8 +320,10 @@ def players():
 @app.command()
 def parse(lrc_path: Path):
     """Parse LRC and print stats."""
-    text = lrc_path.read_text(encoding="utf-8")
-    doc, stats = parse_lrc_with_stats(text)
+    from terminal_lyrics.lrc.parse import parse_lrc_with_stats
+
+    with lrc_path.open(encoding="utf-8") as f:
+        doc, stats = parse_lrc_with_stats(f)
     typer.echo(f"lines_total={stats.lines_total}")
     typer.echo(f"lines_with_timestamps={stats.lines_with_timestamps}")
     typer.echo(f"lines_ignored={stats.lines_ignored}")
@@ -61,29 +334,112 @@ def parse(lrc_path: Path):
 
 @app.command()
 def export(
-    lrc_path: Path,
-    fmt: str = typer.Option("srt", "--format", case_sensitive=False, help="lrc|srt|json"),
+    inputs: list[str] = typer.Argument(..., help="LRC files, directories or glob patterns"),
+    fmt: str = typer.Option("srt", "--format", case_sensitive=False, help="lrc|srt|json|vtt|ass"),
     out: Path | None = typer.Option(None, "--out", help="Output file (default: stdout)"),
+    out_dir: Path | None = typer.Option(
+        None, "--out-dir", help="Batch mode: output directory (default: next to inputs)"
+    ),
+    jobs: int | None = typer.Option(
+        None, "--jobs", "-j", help="Batch mode: worker processes (default: CPU count)"
+    ),
+    force: bool = typer.Option(
+        False, "--force", help="Batch mode: rewrite outputs that are up to date"
+    ),
 ):
-    """Export LRC to SRT/JSON/LRC (normalized)."""
+    """Export LRC to SRT/VTT/ASS/JSON/LRC (normalized); batch mode for many files."""
+    from terminal_lyrics.lrc.export import WRITERS
+    from terminal_lyrics.lrc.parse import parse_lrc_with_stats
+
     cfg = load_config()
     set_lang(cfg.lang)
-    text = lrc_path.read_text(encoding="utf-8")
-    doc, _stats = parse_lrc_with_stats(text)
     fmt_l = fmt.lower()
-    if fmt_l == "json":
-        data = export_json(doc)
-    elif fmt_l == "lrc":
-        data = export_lrc(doc)
-    elif fmt_l == "srt":
-        data = export_srt(doc)
-    else:
+    if fmt_l not in WRITERS:
         raise typer.BadParameter(t("format_must_be"))
 
-    if out:
-        out.write_text(data, encoding="utf-8")
+    if len(inputs) == 1 and out_dir is None and Path(inputs[0]).is_file():
+        with Path(inputs[0]).open(encoding="utf-8") as f:
+            doc, _stats = parse_lrc_with_stats(f)
+        writer = WRITERS[fmt_l][0]
+        if out:
+            with out.open("w", encoding="utf-8") as fp:
+                writer(doc, fp)
+        else:
+            writer(doc, sys.stdout)
+            sys.stdout.flush()
+        return
+
+    if out is not None:
+        raise typer.BadParameter(t("export_out_single"), param_hint="--out")
+    if fmt_l == "lrc" and out_dir is None:
+        # next to the input, the normalized file would replace the original
+        raise typer.BadParameter(t("export_lrc_needs_out_dir"), param_hint="--format")
+
+    # deferred: concurrent.futures is only needed for batches
+    from terminal_lyrics.lrc.batch import collect_inputs, export_batch, plan_jobs
+
+    files = collect_inputs(inputs)
+    if not files:
+        typer.echo(t("no_input_files"), err=True)
+        raise typer.Exit(code=1)
+    result = export_batch(plan_jobs(files, fmt_l, out_dir, force=force), workers=jobs)
+    for path, error in result.failed:
+        typer.echo(t("export_failed", path=str(path), error=error), err=True)
+    typer.echo(
+        t(
+            "batch_summary",
+            written=result.written,
+            skipped=result.skipped,
+            failed=len(result.failed),
+            secs=f"{result.elapsed_s:.2f}",
+            rate=f"{result.files_per_s:.0f}",
+        )
+    )
+    if result.failed:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def timeline(
+    lrc_path: Path,
+    fps: float = typer.Option(60.0, "--fps", help="Frames per second"),
+    duration: float | None = typer.Option(
+        None, "--duration", help="Seconds (default: last line + 2s)"
+    ),
+    mode: str = typer.Option("runs", "--mode", case_sensitive=False, help="runs|frames"),
+    out: Path | None = typer.Option(None, "--out", help="Output CSV file (default: stdout)"),
+):
+    """Active line for every video frame, as CSV (frame-accurate overlays)."""
+    cfg = load_config()
+    set_lang(cfg.lang)
+    mode_l = mode.lower()
+    if mode_l not in ("runs", "frames"):
+        raise typer.BadParameter(t("timeline_mode_must_be"))
+    if not fps > 0:
+        raise typer.BadParameter(t("fps_must_be_positive"), param_hint="--fps")
+    from terminal_lyrics.lrc.parse import parse_lrc_with_stats
+    from terminal_lyrics.sync import timeline as tl
+
+    with lrc_path.open(encoding="utf-8") as f:
+        doc, _stats = parse_lrc_with_stats(f)
+    if duration is not None:
+        end_ms = int(duration * 1000)
     else:
-        typer.echo(data, nl=False)
+        end_ms = (doc.times[-1] + 2000) if len(doc) else 0
+
+    positions = tl.frame_positions(end_ms, fps)
+    indices = tl.sample_indices(doc.times, positions)
+    fp = out.open("w", encoding="utf-8", newline="") if out else sys.stdout
+    try:
+        if mode_l == "frames":
+            tl.write_frames_csv(fp, positions, indices)
+        else:
+            tl.write_runs_csv(fp, positions, indices, doc.texts, end_ms)
+    finally:
+        if out:
+            fp.close()
+        else:
+            fp.flush()
 
 
 @app.command()
@@ -93,6 +449,8 @@ def cache(
     """Manage lyrics cache."""
     cfg = load_config()
     set_lang(cfg.lang)
+    from terminal_lyrics.cache.sqlite import LyricsCache
+
     cache_db = LyricsCache(cfg.cache_db_path)
     if clear:
         cache_db.clear()
@@ -101,6 +459,37 @@ def cache(
         typer.echo(t("use_clear_to_clear"))
 
 
+@app.command()
+def sources(
+    stats: bool = typer.Option(False, "--stats", help="Show per-source hit rate and latency"),
+):
+    """Show configured lyrics sources and their observed performance."""
+    cfg = load_config()
+    set_lang(cfg.lang)
+    typer.echo(t("source_order", mode=cfg.source_order))
+    for name in cfg.sources:
+        typer.echo(f"  {name}")
+    if not stats:
+        return
+
+    from terminal_lyrics.cache.stats import SourceStatsStore
+
+    rows = SourceStatsStore(cfg.cache_db_path).summary()
+    if not rows:
+        typer.echo(t("no_source_stats"))
+        return
+    typer.echo()
+    typer.echo(
+        f"{'source':<14} {'class':<13} {'calls':>6} {'synced':>7} {'plain':>6}"
+        f" {'miss':>5} {'error':>6} {'p50ms':>6} {'p90ms':>6} {'p99ms':>6}"
+    )
+    for r in rows:
+        typer.echo(
+            f"{r.source:<14} {r.request_class:<13} {r.calls:>6} {r.synced:>7} {r.plain:>6}"
+            f" {r.misses:>5} {r.errors:>6} {r.p50_ms:>6} {r.p90_ms:>6} {r.p99_ms:>6}"
+        )
+
+
 @app.command()
 def search(
     q: str | None = typer.Option(None, "--query", "-q", help="Search keyword in any field"),
@@ -121,6 +510,8 @@ def search(
         typer.echo(t("search_query_required"), err=True)
         raise typer.Exit(code=1)
 
+    from terminal_lyrics.sources.service import LyricsService
+
     service = LyricsService(cfg)
     results = service.search(q=q, track_name=track, artist_name=artist, album_name=album)
 
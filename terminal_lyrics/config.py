@@ -41,6 +41,43 @@ class AppConfig:
     context_lines: int  # lines above/below current
     use_alt_screen: bool
 
+    # Prefetch
+    prefetch_album: bool = True
+    # Refresh cached lyrics older than this in the background (0 = never)
+    revalidate_after_s: float = 14 * 24 * 3600.0
+
+    # "static" (TERMINAL_LYRICS_SOURCES order) or "adaptive" (by observed hit rate / latency)
+    source_order: str = "static"
+
+    # Circuit breaker: skip a source after N consecutive failures for a cool-down
+    breaker_failure_threshold: int = 3
+    breaker_cooldown_s: float = 60.0
+
+    # How long a caller waits for another process resolving the same track
+    single_flight_timeout_s: float = 30.0
+
+    # Upper bound for the latency compensation lead (0 disables it)
+    max_lead_ms: float = 150.0
+
+    # Source endpoints (point at a mirror or a local stand-in server)
+    lrclib_base_url: str = "https://lrclib.net"
+    lyrics_ovh_base_url: str = "https://api.lyrics.ovh"
+    api_timeout_s: float = 10.0
+
+    # Metrics export (off unless a file or an address is set)
+    metrics_file: Path | None = None
+    metrics_addr: str | None = None
+    metrics_interval_s: float = 15.0
+
+    # Unix socket of `terminal-lyrics daemon` (None: $XDG_RUNTIME_DIR/terminal-lyrics.sock)
+    socket_path: Path | None = None
+
+    # Publish the current line to this memory-mapped file (None: off)
+    state_file: Path | None = None
+
+    # Track every MPRIS player at once instead of picking one
+    all_players: bool = False
+
 
 def load_config() -> AppConfig:
     # XDG base dir fallback
@@ -54,6 +91,10 @@ def load_config() -> AppConfig:
     refresh_hz = float(os.getenv("TERMINAL_LYRICS_REFRESH_HZ", "30.0"))
     context_lines = int(os.getenv("TERMINAL_LYRICS_CONTEXT_LINES", "1"))
     use_alt_screen = os.getenv("TERMINAL_LYRICS_ALT_SCREEN", "1") not in ("0", "false", "False")
+    prefetch_album = os.getenv("TERMINAL_LYRICS_PREFETCH_ALBUM", "1") not in ("0", "false", "False")
+    metrics_file = os.getenv("TERMINAL_LYRICS_METRICS_FILE")
+    socket_env = os.getenv("TERMINAL_LYRICS_SOCKET")
+    state_env = os.getenv("TERMINAL_LYRICS_STATE_FILE")
 
     config_dir = _config_dir()
     lang = _load_lang(config_dir)
@@ -71,6 +112,22 @@ def load_config() -> AppConfig:
         refresh_hz=refresh_hz,
         context_lines=context_lines,
         use_alt_screen=use_alt_screen,
+        prefetch_album=prefetch_album,
+        revalidate_after_s=float(os.getenv("TERMINAL_LYRICS_REVALIDATE_AFTER", str(14 * 24 * 3600))),
+        source_order=os.getenv("TERMINAL_LYRICS_SOURCE_ORDER", "static").strip().lower(),
+        breaker_failure_threshold=int(os.getenv("TERMINAL_LYRICS_BREAKER_THRESHOLD", "3")),
+        breaker_cooldown_s=float(os.getenv("TERMINAL_LYRICS_BREAKER_COOLDOWN", "60.0")),
+        single_flight_timeout_s=float(os.getenv("TERMINAL_LYRICS_SINGLE_FLIGHT_TIMEOUT", "30.0")),
+        max_lead_ms=float(os.getenv("TERMINAL_LYRICS_MAX_LEAD_MS", "150")),
+        lrclib_base_url=os.getenv("TERMINAL_LYRICS_LRCLIB_URL", "https://lrclib.net").rstrip("/"),
+        lyrics_ovh_base_url=os.getenv("TERMINAL_LYRICS_LYRICS_OVH_URL", "https://api.lyrics.ovh").rstrip("/"),
+        api_timeout_s=float(os.getenv("TERMINAL_LYRICS_API_TIMEOUT", "10.0")),
+        metrics_file=Path(metrics_file) if metrics_file else None,
+        metrics_addr=os.getenv("TERMINAL_LYRICS_METRICS_ADDR") or None,
+        metrics_interval_s=float(os.getenv("TERMINAL_LYRICS_METRICS_INTERVAL", "15.0")),
+        socket_path=Path(socket_env) if socket_env else None,
+        state_file=Path(state_env) if state_env else None,
+        all_players=os.getenv("TERMINAL_LYRICS_ALL_PLAYERS", "0") not in ("0", "false", "False", ""),
     )
 
 
@@ -0,0 +1,433 @@
+"""
+One watcher, many displays.
+
+`terminal-lyrics daemon` runs the watch loop once (MPRIS polling, lyrics
+service, LineTracker) and broadcasts its events over a Unix domain socket;
+`watch --connect` and other clients only render them. Polling, cache and
+network cost stay the same however many tmux panes or bar modules attach.
+
+Protocol: newline-delimited JSON. The client sends one request line,
+
+    {"op": "subscribe"}                           every event type
+    {"op": "subscribe", "events": ["track", "line"]}
+    {"op": "snapshot"}                            current state, then EOF
+
+and the daemon answers with the current state (notice, or track, line and
+pause state) followed, for subscriptions, by every new event as
+`events.encode` lines. Each event is encoded once and written to all
+clients without blocking; a client that falls more than MAX_PENDING_BYTES
+behind is disconnected.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import selectors
+import signal
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from terminal_lyrics.config import AppConfig
+from terminal_lyrics.events import (
+    EVENT_TYPES,
+    Event,
+    LineChanged,
+    Notice,
+    PlaybackChanged,
+    Sink,
+    TrackChanged,
+    decode,
+    encode,
+)
+from terminal_lyrics.i18n import t
+
+if TYPE_CHECKING:
+    from terminal_lyrics.metrics import WatchMetrics
+    from terminal_lyrics.mpris.types import PlayerClient
+    from terminal_lyrics.sources.service import LyricsService
+
+logger = logging.getLogger(__name__)
+
+# per-client output backlog before the client is dropped
+MAX_PENDING_BYTES = 256 * 1024
+# how often the I/O thread retries backlogged clients
+FLUSH_INTERVAL_S = 0.05
+
+
+class DaemonRunning(RuntimeError):
+    pass
+
+
+def default_socket_path() -> Path:
+    runtime = os.getenv("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime) / "terminal-lyrics.sock"
+    return Path(tempfile.gettempdir()) / f"terminal-lyrics-{os.getuid()}.sock"
+
+
+def socket_path(cfg: AppConfig) -> Path:
+    return cfg.socket_path if cfg.socket_path is not None else default_socket_path()
+
+
+def _bind(path: Path) -> socket.socket:
+    """Listening socket at `path`; a stale socket file is replaced, a live daemon is an error."""
+    if path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            path.unlink(missing_ok=True)
+        else:
+            raise DaemonRunning(str(path))
+        finally:
+            probe.close()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(str(path))
+        os.chmod(path, 0o600)
+        sock.listen(16)
+    except BaseException:
+        sock.close()
+        raise
+    sock.setblocking(False)
+    return sock
+
+
+class _Client:
+    __slots__ = ("sock", "inbuf", "outbuf", "types", "subscribed", "close_when_flushed")
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.inbuf = b""
+        self.outbuf = bytearray()
+        # None = every event type
+        self.types: frozenset[str] | None = None
+        self.subscribed = False
+        self.close_when_flushed = False
+
+
+class Hub:
+    """
+    Sink that broadcasts events to socket clients.
+
+    The watch loop calls `emit` from its own thread; accepting clients,
+    reading their requests and flushing backlogs happen on a daemon I/O
+    thread. Both share the client table under one lock.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._clients: dict[int, _Client] = {}
+        self._closing: list[_Client] = []
+        self._listener: socket.socket | None = None
+        self._sel: selectors.BaseSelector | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        # latest state, replayed to new clients
+        # a notice without a player replaces everything; one for a player, that player's state
+        self._notice: Notice | None = None
+        self._notices: dict[str, Notice] = {}
+        self._tracks: dict[str, TrackChanged] = {}
+        self._lines: dict[str, LineChanged] = {}
+        self._paused: dict[str, PlaybackChanged] = {}
+        self.dropped = 0
+
+    @property
+    def clients(self) -> int:
+        with self._lock:
+            return sum(1 for c in self._clients.values() if c.subscribed)
+
+    def enter(self) -> None:
+        if self._listener is not None:
+            return
+        self._listener = _bind(self.path)
+        self._sel = selectors.DefaultSelector()
+        self._sel.register(self._listener, selectors.EVENT_READ)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._serve, name="lyrics-daemon", daemon=True)
+        self._thread.start()
+        logger.info("daemon listening on %s", self.path)
+
+    def exit(self) -> None:
+        if self._listener is None:
+            return
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        with self._lock:
+            for client in list(self._clients.values()):
+                self._drop(client)
+            self._close_dropped()
+        assert self._sel is not None
+        self._sel.close()
+        self._listener.close()
+        self._listener = None
+        self.path.unlink(missing_ok=True)
+
+    def emit(self, event: Event) -> None:
+        data = (encode(event) + "\n").encode("utf-8")
+        with self._lock:
+            if isinstance(event, Notice):
+                if event.player is None:
+                    self._notice = event
+                    self._forget()
+                elif event.key == "player_gone":
+                    self._forget(event.player)
+                else:
+                    self._notices[event.player] = event
+            elif isinstance(event, TrackChanged):
+                self._notice = None
+                self._notices.pop(event.player, None)
+                self._tracks[event.player] = event
+                self._lines.pop(event.player, None)
+                self._paused.pop(event.player, None)
+            elif isinstance(event, LineChanged):
+                self._lines[event.player] = event
+            elif isinstance(event, PlaybackChanged):
+                if event.status == "Playing":
+                    self._paused.pop(event.player, None)
+                else:
+                    self._paused[event.player] = event
+            for client in list(self._clients.values()):
+                if client.subscribed and (client.types is None or event.type in client.types):
+                    self._send(client, data)
+
+    def _forget(self, player: str | None = None) -> None:
+        """Drops what is known about `player` (None: every player); caller holds the lock."""
+        for state in (self._notices, self._tracks, self._lines, self._paused):
+            if player is None:
+                state.clear()
+            else:
+                state.pop(player, None)
+
+    def snapshot(self) -> list[Event]:
+        """Events that bring a new client up to date (caller holds the lock)."""
+        if self._notice is not None:
+            return [self._notice]
+        events: list[Event] = []
+        for player in {**self._tracks, **self._notices}:
+            notice = self._notices.get(player)
+            if notice is not None:
+                events.append(notice)
+                continue
+            track = self._tracks[player]
+            events.append(track)
+            line = self._lines.get(player)
+            if line is not None:
+                events.append(line)
+            paused = self._paused.get(player)
+            if paused is not None:
+                events.append(paused)
+        return events
+
+    # I/O thread
+
+    def _serve(self) -> None:
+        assert self._sel is not None and self._listener is not None
+        while not self._stop.is_set():
+            for key, _mask in self._sel.select(timeout=FLUSH_INTERVAL_S):
+                if key.fileobj is self._listener:
+                    self._accept()
+                else:
+                    self._read(key.data)
+            with self._lock:
+                for client in list(self._clients.values()):
+                    if client.outbuf:
+                        self._send(client, b"")
+                    elif client.close_when_flushed:
+                        self._drop(client)
+                self._close_dropped()
+
+    def _accept(self) -> None:
+        assert self._listener is not None and self._sel is not None
+        try:
+            sock, _addr = self._listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        client = _Client(sock)
+        with self._lock:
+            self._clients[sock.fileno()] = client
+        self._sel.register(sock, selectors.EVENT_READ, client)
+
+    def _read(self, client: _Client) -> None:
+        try:
+            chunk = client.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            chunk = b""
+        with self._lock:
+            if client.sock.fileno() not in self._clients:
+                return
+            if not chunk:
+                self._drop(client)
+                return
+            client.inbuf += chunk
+            while b"\n" in client.inbuf:
+                line, client.inbuf = client.inbuf.split(b"\n", 1)
+                if line.strip():
+                    self._request(client, line)
+            if len(client.inbuf) > 4096:
+                self._drop(client)
+
+    def _request(self, client: _Client, line: bytes) -> None:
+        try:
+            req = json.loads(line)
+            op = req["op"]
+            types = req.get("events")
+        except (ValueError, KeyError, TypeError):
+            op, types = None, None
+        if op not in ("subscribe", "snapshot") or not (types is None or isinstance(types, list)):
+            logger.debug("daemon: bad request %r", line[:200])
+            self._send(client, b'{"type":"error","error":"bad request"}\n')
+            client.close_when_flushed = True
+            return
+        if types is not None:
+            client.types = frozenset(str(x) for x in types) & frozenset(EVENT_TYPES)
+        for ev in self.snapshot():
+            if client.types is None or ev.type in client.types:
+                self._send(client, (encode(ev) + "\n").encode("utf-8"))
+        if op == "snapshot":
+            client.close_when_flushed = True
+        else:
+            client.subscribed = True
+
+    def _send(self, client: _Client, data: bytes) -> None:
+        """Write what the socket takes now, keep the rest (caller holds the lock)."""
+        if data:
+            client.outbuf += data
+        try:
+            sent = client.sock.send(client.outbuf)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self._drop(client)
+            return
+        del client.outbuf[:sent]
+        if len(client.outbuf) > MAX_PENDING_BYTES:
+            logger.info("daemon: dropping slow client (%d bytes pending)", len(client.outbuf))
+            self.dropped += 1
+            self._drop(client)
+
+    def _drop(self, client: _Client) -> None:
+        """Forget a client (caller holds the lock); the I/O thread closes it."""
+        if self._clients.pop(client.sock.fileno(), None) is not None:
+            self._closing.append(client)
+
+    def _close_dropped(self) -> None:
+        # selectors are not thread-safe: only the I/O thread (or exit, after
+        # joining it) unregisters sockets
+        assert self._sel is not None
+        for client in self._closing:
+            self._sel.unregister(client.sock)
+            client.sock.close()
+        self._closing.clear()
+
+
+def serve(
+    cfg: AppConfig,
+    *,
+    preferred_player: str | None,
+    debug: bool,
+    path: Path | None = None,
+    pick_player: Callable[..., PlayerClient] | None = None,
+    service: LyricsService | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+    metrics: WatchMetrics | None = None,
+    all_players: bool = False,
+) -> int:
+    """
+    Run the watch loop with a Hub as its only sink (blocks until interrupted).
+    With `all_players` every player is tracked and broadcast.
+    """
+    from terminal_lyrics.app import watch
+
+    def _on_sigterm(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, _on_sigterm)
+    hub = Hub(path if path is not None else socket_path(cfg))
+    return watch(
+        cfg,
+        preferred_player=preferred_player,
+        debug=debug,
+        pick_player=pick_player,
+        service=service,
+        sleep=sleep,
+        metrics=metrics,
+        sink=hub,
+        all_players=all_players,
+    )
+
+
+def _request_line(op: str, events: Iterable[str] | None) -> bytes:
+    req: dict[str, object] = {"op": op}
+    if events is not None:
+        req["events"] = list(events)
+    return (json.dumps(req, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _events(sock: socket.socket) -> Iterable[Event]:
+    with sock.makefile("rb") as f:
+        for line in f:
+            try:
+                yield decode(line)
+            except (ValueError, TypeError):
+                # newer daemon or an error reply: skip what we don't understand
+                logger.debug("daemon: skipping %r", line[:200])
+
+
+def query(path: Path, timeout_s: float = 1.0) -> list[Event]:
+    """Current daemon state (snapshot request). Raises OSError when no daemon listens."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout_s)
+    with sock:
+        sock.connect(str(path))
+        sock.sendall(_request_line("snapshot", None))
+        return list(_events(sock))
+
+
+def follow(
+    path: Path,
+    sink: Sink,
+    *,
+    events: Iterable[str] | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+    retry_s: float = 1.0,
+) -> int:
+    """
+    Client side of `watch --connect`: feed daemon events to `sink`,
+    reconnecting (every `retry_s`) whenever the daemon is not there.
+    """
+    notice: Notice | None = None
+    sink.enter()
+    try:
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(str(path))
+                sock.sendall(_request_line("subscribe", events))
+            except OSError:
+                sock.close()
+                unavailable = Notice("daemon_unavailable", t("daemon_unavailable", path=str(path)))
+                if unavailable != notice:
+                    notice = unavailable
+                    sink.emit(unavailable)
+                sleep(retry_s)
+                continue
+            with sock:
+                for ev in _events(sock):
+                    notice = None
+                    sink.emit(ev)
+            logger.debug("daemon at %s went away", path)
+    finally:
+        sink.exit()
@@ -0,0 +1,247 @@
+"""
+What the watch loop produces, independent of how it is shown.
+
+The loop in `app` turns MPRIS polling into a stream of events and hands them
+to a sink: the full-screen renderer, a daemon broadcasting to socket
+clients, and so on. Events are small frozen dataclasses with a compact JSON
+form (`encode` / `decode`), one object per line, shared by every
+machine-readable output.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, fields
+from typing import Any, ClassVar, Protocol
+
+
+@dataclass(frozen=True, slots=True)
+class TrackChanged:
+    """
+    New track. `lines` are the lyric lines (empty when nothing was found),
+    `times` their start times for synced lyrics (empty for plain text).
+    """
+
+    type: ClassVar[str] = "track"
+    player: str
+    artist: str
+    title: str
+    album: str
+    source: str | None
+    synced: bool
+    lines: tuple[str, ...] = ()
+    times: tuple[int, ...] = ()
+
+    @property
+    def display(self) -> str:
+        return f"{self.artist} - {self.title}"
+
+
+@dataclass(frozen=True, slots=True)
+class LineChanged:
+    """Current line of a synced track; index -1 before the first line."""
+
+    type: ClassVar[str] = "line"
+    player: str
+    index: int
+    text: str
+    t_ms: int | None
+    next_t_ms: int | None
+    pos_ms: int
+
+
+@dataclass(frozen=True, slots=True)
+class Highlight:
+    """Enhanced LRC: characters of the current line sung so far."""
+
+    type: ClassVar[str] = "highlight"
+    player: str
+    index: int
+    pos: int
+
+
+@dataclass(frozen=True, slots=True)
+class PlaybackChanged:
+    """Player paused, stopped or resumed; `status` is the MPRIS PlaybackStatus."""
+
+    type: ClassVar[str] = "playback"
+    player: str
+    status: str
+    pos_ms: int
+
+
+@dataclass(frozen=True, slots=True)
+class Seeked:
+    """Position jumped instead of advancing line by line."""
+
+    type: ClassVar[str] = "seek"
+    player: str
+    pos_ms: int
+
+
+@dataclass(frozen=True, slots=True)
+class Notice:
+    """Status instead of lyrics (no players, player unavailable, ...); `key` is the i18n key."""
+
+    type: ClassVar[str] = "notice"
+    key: str
+    text: str
+    player: str | None = None
+
+
+Event = TrackChanged | LineChanged | Highlight | PlaybackChanged | Seeked | Notice
+
+EVENT_TYPES: dict[str, type] = {
+    cls.type: cls for cls in (TrackChanged, LineChanged, Highlight, PlaybackChanged, Seeked, Notice)
+}
+
+
+class Sink(Protocol):
+    """Consumer of watch-loop events."""
+
+    def enter(self) -> None: ...
+
+    def emit(self, event: Event) -> None: ...
+
+    def exit(self) -> None: ...
+
+
+class Tee:
+    """Sends every event to several sinks (e.g. the screen and a state file)."""
+
+    def __init__(self, *sinks: Sink):
+        self.sinks = sinks
+
+    def enter(self) -> None:
+        for sink in self.sinks:
+            sink.enter()
+
+    def emit(self, event: Event) -> None:
+        for sink in self.sinks:
+            sink.emit(event)
+
+    def exit(self) -> None:
+        # every sink gets to restore what it changed, even if one fails
+        errors = []
+        for sink in self.sinks:
+            try:
+                sink.exit()
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            raise errors[0]
+
+
+class Focus:
+    """
+    One player out of a stream that carries several (`watch --all-players`,
+    a daemon tracking every player), for sinks that show a single track.
+
+    The focused player is `preferred` whenever it is around, otherwise the
+    one that most recently started playing or changed track. Events of other
+    players are only remembered; on a switch the newly focused player's
+    track, current line and playback state (or its notice) are replayed, so
+    the inner sink redraws as if it had followed that player all along.
+    Events without a player pass straight through.
+    """
+
+    def __init__(self, sink: Sink, preferred: str | None = None):
+        self.sink = sink
+        self.preferred = preferred
+        self.player: str | None = None
+        # per player: what a replay needs, by event type
+        self._state: dict[str, dict[str, Event]] = {}
+
+    def enter(self) -> None:
+        self.sink.enter()
+
+    def exit(self) -> None:
+        self.sink.exit()
+
+    def _is_preferred(self, player: str | None) -> bool:
+        pref = self.preferred
+        if not pref or player is None:
+            return False
+        return player == pref or player.endswith("." + pref)
+
+    def emit(self, event: Event) -> None:
+        player = event.player
+        if player is None:
+            self.sink.emit(event)
+            return
+
+        if isinstance(event, Notice) and event.key == "player_gone":
+            self._state.pop(player, None)
+            if player == self.player:
+                self.player = None
+                # fall back to another player, playing ones first
+                rest = sorted(
+                    self._state,
+                    key=lambda p: (not self._is_preferred(p), self._paused(p)),
+                )
+                if rest:
+                    self._switch(rest[0])
+                else:
+                    self.sink.emit(event)
+            return
+
+        state = self._state.setdefault(player, {})
+        if isinstance(event, TrackChanged):
+            state.clear()
+            state["track"] = event
+        elif isinstance(event, (LineChanged, PlaybackChanged, Notice)):
+            if isinstance(event, LineChanged):
+                state.pop("notice", None)
+            state[event.type] = event
+
+        if player == self.player:
+            self.sink.emit(event)
+            return
+        if self.player is None or self._is_preferred(player) or (
+            not self._is_preferred(self.player)
+            and (
+                isinstance(event, TrackChanged)
+                or (isinstance(event, PlaybackChanged) and event.status == "Playing")
+            )
+        ):
+            self._switch(player)
+
+    def _paused(self, player: str) -> bool:
+        playback = self._state[player].get("playback")
+        return isinstance(playback, PlaybackChanged) and playback.status != "Playing"
+
+    def _switch(self, player: str) -> None:
+        self.player = player
+        state = self._state.get(player, {})
+        notice = state.get("notice")
+        if notice is not None:
+            self.sink.emit(notice)
+            return
+        for key in ("track", "line", "playback"):
+            event = state.get(key)
+            if event is not None:
+                self.sink.emit(event)
+
+
+def to_dict(event: Event) -> dict[str, Any]:
+    data = asdict(event)
+    data["type"] = event.type
+    return data
+
+
+def encode(event: Event) -> str:
+    """Compact one-line JSON (no trailing newline)."""
+    return json.dumps(to_dict(event), ensure_ascii=False, separators=(",", ":"))
+
+
+def decode(line: str | bytes) -> Event:
+    data = json.loads(line)
+    cls = EVENT_TYPES.get(data.pop("type", None))
+    if cls is None:
+        raise ValueError(f"Unknown event: {line!r}")
+    known = {f.name for f in fields(cls)}
+    kwargs = {k: v for k, v in data.items() if k in known}
+    for name in ("lines", "times"):
+        if name in kwargs:
+            kwargs[name] = tuple(kwargs[name])
+    return cls(**kwargs)
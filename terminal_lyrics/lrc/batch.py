@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from .export import WRITERS
+from .parse import parse_lrc
+
+WRITTEN = "written"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+@dataclass(frozen=True, slots=True)
+class BatchJob:
+    src: Path
+    dst: Path
+    fmt: str
+    force: bool = False
+
+
+@dataclass(slots=True)
+class BatchResult:
+    written: int = 0
+    skipped: int = 0
+    failed: list[tuple[Path, str]] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.written + self.skipped + len(self.failed)
+
+    @property
+    def files_per_s(self) -> float:
+        return self.total / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+def collect_inputs(patterns: Iterable[str]) -> list[tuple[Path, Path]]:
+    """
+    Expand files, directories (recursively, *.lrc) and glob patterns into
+    (file, root) pairs; `root` keeps the relative layout under --out-dir.
+    """
+    seen: set[Path] = set()
+    out: list[tuple[Path, Path]] = []
+
+    def add(path: Path, root: Path) -> None:
+        key = path.resolve()
+        if key not in seen:
+            seen.add(key)
+            out.append((path, root))
+
+    for pattern in patterns:
+        p = Path(pattern)
+        if p.is_dir():
+            for f in sorted(p.rglob("*.lrc")):
+                if f.is_file():
+                    add(f, p)
+        elif p.is_file():
+            add(p, p.parent)
+        else:
+            for match in sorted(glob.glob(pattern, recursive=True)):
+                m = Path(match)
+                if m.is_file():
+                    add(m, m.parent)
+    return out
+
+
+def plan_jobs(
+    inputs: list[tuple[Path, Path]], fmt: str, out_dir: Path | None, *, force: bool = False
+) -> list[BatchJob]:
+    suffix = WRITERS[fmt][1]
+    jobs: list[BatchJob] = []
+    for src, root in inputs:
+        if out_dir is None:
+            dst = src.with_suffix(suffix)
+        else:
+            dst = (out_dir / src.relative_to(root)).with_suffix(suffix)
+        jobs.append(BatchJob(src=src, dst=dst, fmt=fmt, force=force))
+    return jobs
+
+
+def _is_up_to_date(src: Path, dst: Path) -> bool:
+    try:
+        return dst.stat().st_mtime_ns >= src.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def run_job(job: BatchJob) -> tuple[str, str]:
+    """Convert one file; returns (status, error message)."""
+    if job.src.resolve() == job.dst.resolve():
+        return FAILED, "output would overwrite input"
+    if not job.force and _is_up_to_date(job.src, job.dst):
+        return SKIPPED, ""
+    writer = WRITERS[job.fmt][0]
+    tmp = job.dst.with_name(f".{job.dst.name}.{os.getpid()}.tmp")
+    try:
+        with job.src.open(encoding="utf-8") as f:
+            doc = parse_lrc(f)
+        job.dst.parent.mkdir(parents=True, exist_ok=True)
+        # stream into a temp file next to the output, then swap it in
+        with tmp.open("w", encoding="utf-8") as out:
+            writer(doc, out)
+        os.replace(tmp, job.dst)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        tmp.unlink(missing_ok=True)
+        return FAILED, str(e)
+    return WRITTEN, ""
+
+
+def export_batch(jobs: list[BatchJob], *, workers: int | None = None) -> BatchResult:
+    """
+    Run jobs over a process pool (`workers` <= 1 converts in-process, which
+    is faster for a handful of files).
+    """
+    result = BatchResult()
+    started = time.perf_counter()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+
+    if workers <= 1:
+        statuses = map(run_job, jobs)
+        _collect(result, jobs, statuses)
+    else:
+        # chunks keep IPC per file low for large collections of small files
+        chunksize = max(1, len(jobs) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            _collect(result, jobs, pool.map(run_job, jobs, chunksize=chunksize))
+
+    result.elapsed_s = time.perf_counter() - started
+    return result
+
+
+def _collect(result: BatchResult, jobs: list[BatchJob], statuses: Iterable[tuple[str, str]]) -> None:
+    for job, (status, error) in zip(jobs, statuses):
+        if status == WRITTEN:
+            result.written += 1
+        elif status == SKIPPED:
+            result.skipped += 1
+        else:
+            result.failed.append((job.src, error))
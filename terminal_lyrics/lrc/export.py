@@ -1,18 +1,26 @@
 from __future__ import annotations
 
+import io
 import json
-from datetime import timedelta
+from typing import Callable, Iterator, TextIO
 
 from .model import LrcDocument
 
 
-def export_json(doc: LrcDocument) -> str:
-    return json.dumps(
+def write_json(doc: LrcDocument, out: TextIO) -> None:
+    events: list[dict] = [{"t_ms": t, "text": text} for t, text in zip(doc.times, doc.texts)]
+    if doc.words is not None:
+        for i, event in enumerate(events):
+            span = doc.words.span(i)
+            if span:
+                event["words"] = [{"offset_ms": rel, "pos": pos} for rel, pos in span]
+    json.dump(
         {
             "offset_ms": doc.offset_ms,
             "tags": doc.tags or {},
-            "events": [{"t_ms": e.t_ms, "text": e.text} for e in doc.events],
+            "events": events,
         },
+        out,
         ensure_ascii=False,
         indent=2,
     )
@@ -25,17 +33,42 @@ def _fmt_lrc_time(ms: int) -> str:
     return f"{m:02d}:{s:02d}.{ms2 // 10:02d}"
 
 
-def export_lrc(doc: LrcDocument, include_tags: bool = True, include_offset: bool = True) -> str:
+def _with_word_tags(text: str, t_ms: int, span: list[tuple[int, int]]) -> str:
+    # re-insert enhanced LRC <mm:ss.xx> tags at their positions
     out: list[str] = []
+    last = 0
+    for rel_ms, pos in sorted(span, key=lambda w: w[1]):
+        out.append(text[last:pos])
+        out.append(f"<{_fmt_lrc_time(t_ms + rel_ms)}>")
+        last = pos
+    out.append(text[last:])
+    return "".join(out)
+
+
+def write_lrc(
+    doc: LrcDocument, out: TextIO, include_tags: bool = True, include_offset: bool = True
+) -> None:
     if include_tags and doc.tags:
         for k in sorted(doc.tags.keys()):
-            out.append(f"[{k}:{doc.tags[k]}]")
+            out.write(f"[{k}:{doc.tags[k]}]\n")
     if include_offset and doc.offset_ms:
-        out.append(f"[offset:{doc.offset_ms}]")
+        out.write(f"[offset:{doc.offset_ms}]\n")
+
+    words = doc.words
+    for i, (t, text) in enumerate(zip(doc.times, doc.texts)):
+        if words is not None:
+            text = _with_word_tags(text, t, words.span(i))
+        out.write(f"[{_fmt_lrc_time(t)}]{text}\n")
+
 
-    for e in doc.events:
-        out.append(f"[{_fmt_lrc_time(e.t_ms)}]{e.text}")
-    return "\n".join(out) + ("\n" if out else "")
+def _cues(doc: LrcDocument, last_line_duration_ms: int) -> Iterator[tuple[int, int, int, str]]:
+    """(index, start, end, text): end is the next start, the last line lasts `last_line_duration_ms`."""
+    times = doc.times
+    n = len(times)
+    for i, text in enumerate(doc.texts):
+        start = times[i]
+        end = max(times[i + 1], start + 1) if i + 1 < n else start + last_line_duration_ms
+        yield i, start, end, text
 
 
 def _fmt_srt_time(ms: int) -> str:
@@ -46,23 +79,112 @@ def _fmt_srt_time(ms: int) -> str:
     return f"{h:02d}:{m:02d}:{s:02d},{ms2:03d}"
 
 
-def export_srt(doc: LrcDocument, last_line_duration_ms: int = 2000) -> str:
+def write_srt(doc: LrcDocument, out: TextIO, last_line_duration_ms: int = 2000) -> None:
     """
     End time is next start time, last line ends at +last_line_duration_ms.
     """
-    ev = doc.events
-    if not ev:
-        return ""
+    for i, start, end, text in _cues(doc, last_line_duration_ms):
+        if i:
+            out.write("\n")
+        out.write(f"{i + 1}\n{_fmt_srt_time(start)} --> {_fmt_srt_time(end)}\n{text or ''}\n")
+
+
+def _fmt_vtt_time(ms: int) -> str:
+    # HH:MM:SS.mmm
+    return _fmt_srt_time(ms).replace(",", ".")
+
+
+def write_vtt(doc: LrcDocument, out: TextIO, last_line_duration_ms: int = 2000) -> None:
+    out.write("WEBVTT\n")
+    for _i, start, end, text in _cues(doc, last_line_duration_ms):
+        out.write(f"\n{_fmt_vtt_time(start)} --> {_fmt_vtt_time(end)}\n{text or ''}\n")
+
+
+_ASS_HEADER = """[Script Info]
+ScriptType: v4.00+
+PlayResX: 1920
+PlayResY: 1080
+WrapStyle: 0
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,Sans,64,&H00FFFFFF,&H0000C8FF,&H00000000,&H80000000,0,0,0,0,100,100,0,0,1,3,1,2,40,40,60,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+
+def _fmt_ass_time(ms: int) -> str:
+    # H:MM:SS.cc
+    h, rem = divmod(ms, 3_600_000)
+    m, rem = divmod(rem, 60_000)
+    s, ms2 = divmod(rem, 1_000)
+    return f"{h:d}:{m:02d}:{s:02d}.{ms2 // 10:02d}"
+
+
+def _ass_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("{", "(").replace("}", ")")
+
+
+def _ass_karaoke(text: str, span: list[tuple[int, int]], duration_ms: int) -> str:
+    # {\kNN} = centiseconds until the next syllable starts
     out: list[str] = []
-    for i, e in enumerate(ev, start=1):
-        start = e.t_ms
-        if i < len(ev):
-            end = max(ev[i].t_ms, start + 1)
+    if span[0][0] > 0 or span[0][1] > 0:
+        out.append(f"{{\\k{span[0][0] // 10}}}{_ass_text(text[: span[0][1]])}")
+    for j, (rel_ms, pos) in enumerate(span):
+        if j + 1 < len(span):
+            next_ms, next_pos = span[j + 1]
         else:
-            end = start + last_line_duration_ms
-        out.append(str(i))
-        out.append(f"{_fmt_srt_time(start)} --> {_fmt_srt_time(end)}")
-        out.append(e.text or "")
-        out.append("")
-    return "\n".join(out)
+            next_ms, next_pos = max(duration_ms, rel_ms), len(text)
+        if next_pos > pos:
+            out.append(f"{{\\k{(next_ms - rel_ms) // 10}}}{_ass_text(text[pos:next_pos])}")
+    return "".join(out)
+
+
+def write_ass(doc: LrcDocument, out: TextIO, last_line_duration_ms: int = 2000) -> None:
+    """Advanced SubStation Alpha; word timings become {\\k} karaoke tags."""
+    out.write(_ASS_HEADER)
+    words = doc.words
+    for i, start, end, text in _cues(doc, last_line_duration_ms):
+        span = words.span(i) if words is not None else None
+        body = _ass_karaoke(text, span, end - start) if span else _ass_text(text)
+        out.write(
+            f"Dialogue: 0,{_fmt_ass_time(start)},{_fmt_ass_time(end)},Default,,0,0,0,,{body}\n"
+        )
+
+
+# format -> (writer, file suffix)
+WRITERS: dict[str, tuple[Callable[[LrcDocument, TextIO], None], str]] = {
+    "lrc": (write_lrc, ".lrc"),
+    "srt": (write_srt, ".srt"),
+    "json": (write_json, ".json"),
+    "vtt": (write_vtt, ".vtt"),
+    "ass": (write_ass, ".ass"),
+}
+
+
+def _render(writer: Callable[..., None], doc: LrcDocument, **kwargs) -> str:
+    buf = io.StringIO()
+    writer(doc, buf, **kwargs)
+    return buf.getvalue()
+
+
+def export_json(doc: LrcDocument) -> str:
+    return _render(write_json, doc)
+
+
+def export_lrc(doc: LrcDocument, include_tags: bool = True, include_offset: bool = True) -> str:
+    return _render(write_lrc, doc, include_tags=include_tags, include_offset=include_offset)
+
+
+def export_srt(doc: LrcDocument, last_line_duration_ms: int = 2000) -> str:
+    return _render(write_srt, doc, last_line_duration_ms=last_line_duration_ms)
+
+
+def export_vtt(doc: LrcDocument, last_line_duration_ms: int = 2000) -> str:
+    return _render(write_vtt, doc, last_line_duration_ms=last_line_duration_ms)
+
 
+def export_ass(doc: LrcDocument, last_line_duration_ms: int = 2000) -> str:
+    return _render(write_ass, doc, last_line_duration_ms=last_line_duration_ms)
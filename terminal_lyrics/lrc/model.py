@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass
+from typing import Iterable, Iterator, Sequence, overload
 
 
 @dataclass(frozen=True, slots=True)
@@ -9,9 +12,163 @@ class LyricEvent:
     text: str
 
 
-@dataclass(frozen=True, slots=True)
+class LineTexts(Sequence[str]):
+    """
+    Per-event text view over a document's interned line table:
+    `texts[i] == lines[line_ids[i]]`, nothing is copied.
+    """
+
+    __slots__ = ("_lines", "_ids")
+
+    def __init__(self, lines: tuple[str, ...], line_ids: array):
+        self._lines = lines
+        self._ids = line_ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @overload
+    def __getitem__(self, i: int) -> str: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[str]: ...
+
+    def __getitem__(self, i: int | slice) -> str | list[str]:
+        if isinstance(i, slice):
+            lines = self._lines
+            return [lines[j] for j in self._ids[i]]
+        return self._lines[self._ids[i]]
+
+    def __iter__(self) -> Iterator[str]:
+        lines = self._lines
+        return (lines[j] for j in self._ids)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (LineTexts, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LineTexts({list(self)!r})"
+
+
+class WordTimings:
+    """
+    Word-level (enhanced LRC `<mm:ss.xx>`) timeline in CSR layout.
+
+    Words of event i are `index[i]:index[i+1]`; `offsets_ms` are relative to
+    the event start and sorted within a line, `positions` are character
+    offsets of each word in the event text.
+    """
+
+    __slots__ = ("index", "offsets_ms", "positions")
+
+    def __init__(self, index: array, offsets_ms: array, positions: array):
+        self.index = index
+        self.offsets_ms = offsets_ms
+        self.positions = positions
+
+    def span(self, i: int) -> list[tuple[int, int]]:
+        """(offset_ms, position) of every word in event i."""
+        lo, hi = self.index[i], self.index[i + 1]
+        return list(zip(self.offsets_ms[lo:hi], self.positions[lo:hi]))
+
+    def highlight_pos(self, i: int, rel_ms: int, text_len: int) -> int:
+        """
+        Characters of event i sung at `rel_ms` after its start: up to the
+        start of the word after the current one (whole line on the last word).
+        """
+        lo, hi = self.index[i], self.index[i + 1]
+        k = bisect_right(self.offsets_ms, rel_ms, lo, hi)
+        if k == lo:
+            return 0
+        return self.positions[k] if k < hi else text_len
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, WordTimings):
+            return NotImplemented
+        return (
+            self.index == other.index
+            and self.offsets_ms == other.offsets_ms
+            and self.positions == other.positions
+        )
+
+
 class LrcDocument:
-    events: tuple[LyricEvent, ...]
-    offset_ms: int = 0
-    tags: dict[str, str] | None = None
+    """
+    Columnar LRC document.
+
+    Event i starts at `times[i]` and shows `lines[line_ids[i]]`; every unique
+    line is stored once, so repeated choruses cost 8 bytes per repetition
+    instead of a full event object. `events` is a compatibility view that
+    materializes LyricEvent objects on demand. `words` is only set for
+    enhanced LRC with inline word timestamps.
+    """
+
+    __slots__ = ("times", "line_ids", "lines", "offset_ms", "tags", "words")
+
+    def __init__(
+        self,
+        events: Iterable[LyricEvent] = (),
+        offset_ms: int = 0,
+        tags: dict[str, str] | None = None,
+    ):
+        index: dict[str, int] = {}
+        times = array("i")
+        line_ids = array("i")
+        for e in events:
+            times.append(e.t_ms)
+            line_ids.append(index.setdefault(e.text, len(index)))
+        self.times = times
+        self.line_ids = line_ids
+        self.lines: tuple[str, ...] = tuple(index)
+        self.offset_ms = offset_ms
+        self.tags = tags
+        self.words: WordTimings | None = None
+
+    @classmethod
+    def from_columns(
+        cls,
+        times: array,
+        line_ids: array,
+        lines: tuple[str, ...],
+        offset_ms: int = 0,
+        tags: dict[str, str] | None = None,
+        words: WordTimings | None = None,
+    ) -> "LrcDocument":
+        doc = cls(offset_ms=offset_ms, tags=tags)
+        doc.times = times
+        doc.line_ids = line_ids
+        doc.lines = lines
+        doc.words = words
+        return doc
+
+    @property
+    def texts(self) -> LineTexts:
+        return LineTexts(self.lines, self.line_ids)
+
+    @property
+    def events(self) -> tuple[LyricEvent, ...]:
+        lines = self.lines
+        return tuple(LyricEvent(t, lines[j]) for t, j in zip(self.times, self.line_ids))
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LrcDocument):
+            return NotImplemented
+        return (
+            self.times == other.times
+            and self.texts == other.texts
+            and self.offset_ms == other.offset_ms
+            and self.tags == other.tags
+            and self.words == other.words
+        )
 
+    def __repr__(self) -> str:
+        return (
+            f"LrcDocument(events={len(self.times)}, unique_lines={len(self.lines)}, "
+            f"offset_ms={self.offset_ms}, tags={self.tags!r}, "
+            f"words={len(self.words.offsets_ms) if self.words else 0})"
+        )
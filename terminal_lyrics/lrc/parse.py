@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
 import re
-from typing import Iterable
+from typing import Iterable, Iterator
 
-from .model import LrcDocument, LyricEvent
+from .model import LrcDocument, LyricEvent, WordTimings
 
 _TS_RE = re.compile(r"\[(\d{1,2}):(\d{2})(?:\.(\d{1,3}))?\]")  # [mm:ss] / [mm:ss.xx] / [mm:ss.xxx]
+_LEAD_TS_RE = re.compile(r"(?:\[\d{1,2}:\d{2}(?:\.\d{1,3})?\])+")  # run of _TS_RE at line start
+_WORD_TS_RE = re.compile(r"<(\d{1,2}):(\d{2})(?:\.(\d{1,3}))?>")  # enhanced LRC <mm:ss.xx>
 _OFFSET_RE = re.compile(r"^\[offset:([+-]?\d+)\]\s*$", re.IGNORECASE)
 _TAG_RE = re.compile(r"^\[([a-zA-Z]{1,8}):(.*)\]\s*$")
 
+# fraction digits -> ms multiplier: "2" -> 200ms, "23" -> 230ms, "234" -> 234ms
+_FRAC_SCALE = (0, 100, 10, 1)
+
 
 class LrcParseError(ValueError):
     pass
@@ -23,148 +29,228 @@ class LrcParseStats:
     lines_ignored: int
 
 
-def _parse_ts_to_ms(m: int, s: int, frac: str | None) -> int:
-    if not (0 <= s <= 59):
-        raise LrcParseError(f"Invalid seconds: {s}")
-    if frac is None:
-        ms = 0
-    else:
-        # "2" -> 200ms, "23" -> 230ms, "234" -> 234ms
-        ms = int(frac.ljust(3, "0")[:3])
-    return (m * 60 + s) * 1000 + ms
-
+class _Scanner:
+    """
+    Single-pass LRC line scanner shared by every public entry point.
+
+    Fast path: the usual `[mm:ss.xx][mm:ss.xx]text` line is handled by one
+    anchored match of the leading timestamp run plus `findall` on it.
+    Anything else (timestamps after text, stray brackets) goes through the
+    general `finditer` path; offset/metadata regexes only run on bracketed
+    lines without timestamps. Statistics are plain counters updated on the
+    way, so they cost nothing extra. Inline `<mm:ss.xx>` word timestamps are
+    only looked for when the text contains "<".
+    """
 
-def parse_lrc(text: str) -> LrcDocument:
+    __slots__ = ("offset_ms", "tags", "words", "lines_total", "lines_with_ts", "lines_ignored")
+
+    def __init__(self) -> None:
+        self.offset_ms = 0
+        self.tags: dict[str, str] = {}
+        # (t_ms, text) -> [(offset from line start ms, char position)]
+        self.words: dict[tuple[int, str], list[tuple[int, int]]] = {}
+        self.lines_total = 0
+        self.lines_with_ts = 0
+        self.lines_ignored = 0
+
+    def scan(
+        self, lines: Iterable[str]
+    ) -> Iterator[tuple[list[int], str, list[tuple[int, int]] | None]]:
+        """
+        Yield (times_ms, text, words) per timestamped line, in source order.
+        `words` is None unless the line has word timestamps; their offsets
+        are relative to the line's first timestamp.
+        """
+        lead_match = _LEAD_TS_RE.match
+        findall = _TS_RE.findall
+        total = with_ts = 0
+        try:
+            for raw in lines:
+                total += 1
+                line = raw.rstrip("\r\n")
+
+                lead = lead_match(line)
+                if lead is not None:
+                    end = lead.end()
+                    payload = line[end:]
+                    if "[" not in payload:
+                        parts = findall(line, 0, end)
+                    else:
+                        # more timestamps may follow the text: text is after the last one
+                        parts, payload = self._split_general(line)
+                elif "[" not in line:
+                    # neither timestamps nor tags: blank line or stray text
+                    self.lines_ignored += 1
+                    continue
+                else:
+                    parts, payload = self._split_general(line)
+                    if not parts:
+                        self._meta_line(line)
+                        continue
+
+                offset = self.offset_ms
+                times: list[int] = []
+                for mm, ss, frac in parts:
+                    if ss > "59":
+                        raise LrcParseError(f"Invalid seconds: {ss}")
+                    t_ms = (int(mm) * 60 + int(ss)) * 1000 + offset
+                    if frac:
+                        t_ms += int(frac) * _FRAC_SCALE[len(frac)]
+                    times.append(t_ms if t_ms > 0 else 0)
+                with_ts += 1
+                payload = payload.lstrip()
+                words = None
+                if "<" in payload:
+                    line_ms = (int(parts[0][0]) * 60 + int(parts[0][1])) * 1000
+                    if parts[0][2]:
+                        line_ms += int(parts[0][2]) * _FRAC_SCALE[len(parts[0][2])]
+                    payload, words = self._split_words(payload, line_ms)
+                yield times, payload, words
+        finally:
+            self.lines_total += total
+            self.lines_with_ts += with_ts
+
+    @staticmethod
+    def _split_general(line: str) -> tuple[list[tuple[str, str, str]], str]:
+        parts: list[tuple[str, str, str]] = []
+        end = 0
+        for m in _TS_RE.finditer(line):
+            mm, ss, frac = m.groups("")
+            parts.append((mm, ss, frac))
+            end = m.end()
+        return parts, line[end:]
+
+    @staticmethod
+    def _split_words(
+        payload: str, line_ms: int
+    ) -> tuple[str, list[tuple[int, int]] | None]:
+        text: list[str] = []
+        words: list[tuple[int, int]] = []
+        pos = last = 0
+        for m in _WORD_TS_RE.finditer(payload):
+            chunk = payload[last : m.start()]
+            text.append(chunk)
+            pos += len(chunk)
+            mm, ss, frac = m.groups("")
+            if ss > "59":
+                raise LrcParseError(f"Invalid seconds: {ss}")
+            w_ms = (int(mm) * 60 + int(ss)) * 1000
+            if frac:
+                w_ms += int(frac) * _FRAC_SCALE[len(frac)]
+            words.append((max(w_ms - line_ms, 0), pos))
+            last = m.end()
+        if not words:
+            return payload, None
+        text.append(payload[last:])
+        return "".join(text), sorted(words)
+
+    def _meta_line(self, line: str) -> None:
+        off = _OFFSET_RE.match(line)
+        if off:
+            self.offset_ms = int(off.group(1))
+            return
+        tag = _TAG_RE.match(line)
+        if tag:
+            k = tag.group(1).strip().lower()
+            v = tag.group(2).strip()
+            if k and v:
+                self.tags[k] = v
+            return
+        self.lines_ignored += 1
+
+    def pairs(self, lines: Iterable[str]) -> list[tuple[int, str]]:
+        out: list[tuple[int, str]] = []
+        append = out.append
+        for times, text, words in self.scan(lines):
+            for t_ms in times:
+                append((t_ms, text))
+                if words:
+                    self.words.setdefault((t_ms, text), words)
+        return out
+
+    def document(self, pairs: list[tuple[int, str]]) -> LrcDocument:
+        # dict.fromkeys drops duplicate (t_ms, text) but keeps the (mostly
+        # time-ordered) input order, which makes the sort much cheaper than
+        # sorting a set; tuple ordering = by time, then text
+        ordered = sorted(dict.fromkeys(pairs))
+        index: dict[str, int] = {}
+        intern = index.setdefault
+        times = array("i", [t_ms for t_ms, _ in ordered])
+        line_ids = array("i", [intern(text, len(index)) for _, text in ordered])
+        return LrcDocument.from_columns(
+            times,
+            line_ids,
+            tuple(index),
+            offset_ms=self.offset_ms,
+            tags=self.tags,
+            words=self._word_timings(ordered) if self.words else None,
+        )
+
+    def _word_timings(self, ordered: list[tuple[int, str]]) -> WordTimings:
+        index = array("i", [0])
+        offsets = array("i")
+        positions = array("i")
+        get = self.words.get
+        for key in ordered:
+            for rel_ms, pos in get(key, ()):
+                offsets.append(rel_ms)
+                positions.append(pos)
+            index.append(len(offsets))
+        return WordTimings(index, offsets, positions)
+
+    def stats(self, doc: LrcDocument) -> LrcParseStats:
+        return LrcParseStats(
+            lines_total=self.lines_total,
+            events_total=len(doc),
+            lines_with_timestamps=self.lines_with_ts,
+            lines_ignored=self.lines_ignored,
+        )
+
+
+def _lines(source: str | Iterable[str]) -> Iterable[str]:
+    return source.splitlines() if isinstance(source, str) else source
+
+
+def has_timestamps(text: str) -> bool:
+    """Cheap check whether text is synced LRC rather than plain lyrics."""
+    return _TS_RE.search(text) is not None
+
+
+def parse_lrc(text: str | Iterable[str]) -> LrcDocument:
     """
     Supported:
     - [mm:ss], [mm:ss.xx], [mm:ss.xxx]
     - multiple timestamps per line
     - [offset:+/-ms]
     - basic tags: [ar:], [ti:], [al:], ...
+    - enhanced LRC word timestamps <mm:ss.xx> (stripped from text, see
+      LrcDocument.words)
+
+    `text` is either the whole LRC text or any iterable of lines (e.g. an
+    open file).
 
     Result is normalized:
     - events sorted by time then text
     - duplicate (t_ms, text) removed
     - negative times clamped to 0
     """
-    offset_ms = 0
-    tags: dict[str, str] = {}
-    events: list[LyricEvent] = []
-
-    total = 0
-    lines_with_ts = 0
-    ignored = 0
-
-    for raw in text.splitlines():
-        total += 1
-        line = raw.rstrip("\n")
-        if not line.strip():
-            ignored += 1
-            continue
-
-        off = _OFFSET_RE.match(line)
-        if off:
-            try:
-                offset_ms = int(off.group(1))
-            except ValueError as e:
-                raise LrcParseError("Invalid offset") from e
-            continue
+    scanner = _Scanner()
+    return scanner.document(scanner.pairs(_lines(text)))
 
-        tag = _TAG_RE.match(line)
-        if tag and not _TS_RE.search(line):
-            k = tag.group(1).strip().lower()
-            v = tag.group(2).strip()
-            if k and v:
-                tags[k] = v
-            continue
-
-        ts = list(_TS_RE.finditer(line))
-        if not ts:
-            ignored += 1
-            continue
-
-        lines_with_ts += 1
-        payload = line[ts[-1].end() :].lstrip()
-
-        for m in ts:
-            mm = int(m.group(1))
-            ss = int(m.group(2))
-            frac = m.group(3)
-            t_ms = _parse_ts_to_ms(mm, ss, frac) + offset_ms
-            if t_ms < 0:
-                t_ms = 0
-            events.append(LyricEvent(t_ms=t_ms, text=payload))
-
-    events.sort(key=lambda e: (e.t_ms, e.text))
-    dedup: list[LyricEvent] = []
-    prev: tuple[int, str] | None = None
-    for e in events:
-        key = (e.t_ms, e.text)
-        if key != prev:
-            dedup.append(e)
-            prev = key
-
-    return LrcDocument(events=tuple(dedup), offset_ms=offset_ms, tags=tags)
-
-
-def parse_lrc_with_stats(text: str) -> tuple[LrcDocument, LrcParseStats]:
-    # thin wrapper for CLI diagnostics
-    offset_ms = 0
-    tags: dict[str, str] = {}
-    events: list[LyricEvent] = []
-
-    total = 0
-    lines_with_ts = 0
-    ignored = 0
-
-    for raw in text.splitlines():
-        total += 1
-        line = raw.rstrip("\n")
-        if not line.strip():
-            ignored += 1
-            continue
 
-        off = _OFFSET_RE.match(line)
-        if off:
-            offset_ms = int(off.group(1))
-            continue
+def parse_lrc_with_stats(text: str | Iterable[str]) -> tuple[LrcDocument, LrcParseStats]:
+    # same engine as parse_lrc; counters are collected during the scan
+    scanner = _Scanner()
+    doc = scanner.document(scanner.pairs(_lines(text)))
+    return doc, scanner.stats(doc)
 
-        tag = _TAG_RE.match(line)
-        if tag and not _TS_RE.search(line):
-            k = tag.group(1).strip().lower()
-            v = tag.group(2).strip()
-            if k and v:
-                tags[k] = v
-            continue
-
-        ts = list(_TS_RE.finditer(line))
-        if not ts:
-            ignored += 1
-            continue
-
-        lines_with_ts += 1
-        payload = line[ts[-1].end() :].lstrip()
-        for m in ts:
-            t_ms = _parse_ts_to_ms(int(m.group(1)), int(m.group(2)), m.group(3)) + offset_ms
-            if t_ms < 0:
-                t_ms = 0
-            events.append(LyricEvent(t_ms=t_ms, text=payload))
-
-    events.sort(key=lambda e: (e.t_ms, e.text))
-    dedup: list[LyricEvent] = []
-    prev: tuple[int, str] | None = None
-    for e in events:
-        key = (e.t_ms, e.text)
-        if key != prev:
-            dedup.append(e)
-            prev = key
-
-    doc = LrcDocument(events=tuple(dedup), offset_ms=offset_ms, tags=tags)
-    stats = LrcParseStats(
-        lines_total=total,
-        events_total=len(doc.events),
-        lines_with_timestamps=lines_with_ts,
-        lines_ignored=ignored,
-    )
-    return doc, stats
 
+def iter_lrc_events(fileobj: Iterable[str]) -> Iterator[LyricEvent]:
+    """
+    Streaming parse: yield events as lines are read, without loading the
+    whole text. Events come in source order and are not deduplicated; an
+    [offset:] tag applies to the timestamps that follow it.
+    """
+    for times, text, _words in _Scanner().scan(fileobj):
+        for t_ms in times:
+            yield LyricEvent(t_ms, text)
@@ -0,0 +1,387 @@
+"""
+Counters and histograms for the watch loop, exported in the OpenMetrics text
+format either as a textfile (for node_exporter's textfile collector or any
+scraper that reads files) or over a local HTTP endpoint.
+
+Instrumentation is opt-in: with neither `metrics_file` nor `metrics_addr`
+configured the watch loop gets `None` and skips every measurement.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Generic, Iterator, Sequence, TextIO, TypeVar
+
+from terminal_lyrics.config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# seconds; D-Bus round trips and frame writes are sub-millisecond when healthy
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+# seconds; cache hits vs network fetches with retries
+RESOLVE_BUCKETS = (0.005, 0.025, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# seconds a line was drawn after its LRC timestamp
+LATENESS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self, lock: threading.Lock):
+        self.value = 0.0
+        self._lock = lock
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: tuple[float, ...], lock: threading.Lock):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot: +Inf
+        self.sum = 0.0
+        self._lock = lock
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+
+_Child = TypeVar("_Child", _CounterChild, _HistogramChild)
+
+
+class _Metric(Generic[_Child]):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], _Child] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self) -> _Child:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> _Child:
+        """Child for one label combination; keep it around on hot paths."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric[_CounterChild]):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild(self._lock)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def samples(self) -> Iterator[str]:
+        for values, child in sorted(self._children.items()):
+            yield f"{self.name}_total{_labels(self.labelnames, values)} {_num(child.value)}"
+
+
+class Histogram(_Metric[_HistogramChild]):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], buckets: Sequence[float]):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets, self._lock)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def samples(self) -> Iterator[str]:
+        for values, child in sorted(self._children.items()):
+            with self._lock:
+                counts = list(child.counts)
+                total = child.sum
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else _num(bound)
+                extra = f'le="{le}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, values, extra)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, values)} {_num(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, values)} {cumulative}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = FAST_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def expose(self) -> str:
+        """Everything in the OpenMetrics text format, `# EOF` terminated."""
+        out: list[str] = []
+        for m in self._metrics.values():
+            out.append(f"# TYPE {m.name} {m.kind}")
+            out.append(f"# HELP {m.name} {_escape(m.help)}")
+            out.extend(m.samples())
+        out.append("# EOF")
+        return "\n".join(out) + "\n"
+
+
+class MeteredStream:
+    """TextIO proxy counting encoded bytes written to the terminal."""
+
+    def __init__(self, counter: _CounterChild, inner: TextIO | None = None):
+        self._counter = counter
+        # None = whatever sys.stdout is at write time (like AnsiRenderer)
+        self._inner = inner
+
+    @property
+    def inner(self) -> TextIO:
+        return self._inner if self._inner is not None else sys.stdout
+
+    def write(self, s: str) -> int:
+        self._counter.inc(len(s.encode("utf-8", "replace")))
+        return self.inner.write(s)
+
+    def flush(self) -> None:
+        self.inner.flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self.inner, name)
+
+
+class WatchMetrics:
+    """The instruments the watch loop and LyricsService report to."""
+
+    def __init__(self, registry: Registry | None = None):
+        r = self.registry = registry or Registry()
+        self.dbus_seconds = r.histogram(
+            "terminal_lyrics_dbus_call_seconds", "MPRIS D-Bus call latency.", ("call",)
+        )
+        self.render_seconds = r.histogram(
+            "terminal_lyrics_render_seconds", "Time to draw a full frame or a karaoke highlight.", ("kind",)
+        )
+        self.render_bytes = r.counter("terminal_lyrics_render_bytes", "Bytes written to the terminal.")
+        self.resolve_seconds = r.histogram(
+            "terminal_lyrics_resolve_seconds",
+            "Lyrics lookup time on track change, by the source that answered.",
+            ("source",),
+            RESOLVE_BUCKETS,
+        )
+        self.source_fetch_seconds = r.histogram(
+            "terminal_lyrics_source_fetch_seconds",
+            "Time spent in a single lyrics source call, by outcome.",
+            ("source", "outcome"),
+            RESOLVE_BUCKETS,
+        )
+        self.cache_requests = r.counter(
+            "terminal_lyrics_cache_requests", "Lyrics cache lookups by result.", ("result",)
+        )
+        self.line_lateness_seconds = r.histogram(
+            "terminal_lyrics_line_lateness_seconds",
+            "Delay between a line's LRC timestamp and the player position it was drawn at.",
+            (),
+            LATENESS_BUCKETS,
+        )
+        self.seeks = r.counter("terminal_lyrics_seeks", "Position jumps (seeks) detected by the watch loop.")
+
+    def metered_stream(self, inner: TextIO | None = None) -> MeteredStream:
+        return MeteredStream(self.render_bytes.labels(), inner)
+
+
+def write_textfile(registry: Registry, path: Path) -> None:
+    """Atomic write (temp file + rename) so collectors never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(registry.expose())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class TextfileExporter:
+    """Rewrites `path` every `interval_s` from a daemon thread, and once more on stop."""
+
+    def __init__(self, registry: Registry, path: Path, interval_s: float = 15.0):
+        self.registry = registry
+        self.path = path
+        self.interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-textfile", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self._write()
+
+    def _write(self) -> None:
+        try:
+            write_textfile(self.registry, self.path)
+        except OSError as e:
+            logger.warning("Не удалось записать метрики в %s: %s", self.path, e)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self._write()
+
+
+class MetricsUnavailable(RuntimeError):
+    """The HTTP endpoint can't be set up: malformed address or the port can't be bound."""
+
+    def __init__(self, addr: str, error: str):
+        super().__init__(f"{addr}: {error}")
+        self.addr = addr
+        self.error = error
+
+
+def parse_addr(addr: str) -> tuple[str, int]:
+    """
+    `9464`, `:9464` or `host:9464` -> (host, port); the host defaults to
+    loopback. Raises ValueError for anything else.
+    """
+    host, _, port = addr.rpartition(":")
+    if not port.isdigit() or int(port) > 65535:
+        raise ValueError(f"expected [host:]port, got {addr!r}")
+    return host or "127.0.0.1", int(port)
+
+
+class HttpExporter:
+    """Serves GET /metrics from a daemon thread."""
+
+    def __init__(self, registry: Registry, host: str = "127.0.0.1", port: int = 9464):
+        # deferred: only needed when the endpoint is enabled
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry_ = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry_.expose().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="metrics-http", daemon=True)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        host, port = self._httpd.server_address[:2]
+        # bytes only for AF_UNIX, which this server never binds
+        return host.decode() if isinstance(host, (bytes, bytearray)) else host, port
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@contextmanager
+def exporting(cfg: AppConfig) -> Iterator[WatchMetrics | None]:
+    """
+    WatchMetrics wired to the configured exporters, or None when metrics are
+    off. Raises MetricsUnavailable when the HTTP endpoint can't be set up.
+    """
+    if cfg.metrics_file is None and not cfg.metrics_addr:
+        yield None
+        return
+    metrics = WatchMetrics()
+    exporters: list[TextfileExporter | HttpExporter] = []
+    if cfg.metrics_file is not None:
+        exporters.append(TextfileExporter(metrics.registry, cfg.metrics_file, cfg.metrics_interval_s))
+    if cfg.metrics_addr:
+        try:
+            exporters.append(HttpExporter(metrics.registry, *parse_addr(cfg.metrics_addr)))
+        except ValueError as e:
+            raise MetricsUnavailable(cfg.metrics_addr, str(e)) from e
+        except OSError as e:
+            raise MetricsUnavailable(cfg.metrics_addr, e.strerror or str(e)) from e
+    # stop() of an exporter that never started would block or fail
+    started: list[TextfileExporter | HttpExporter] = []
+    try:
+        for exp in exporters:
+            exp.start()
+            started.append(exp)
+        yield metrics
+    finally:
+        for exp in started:
+            exp.stop()
+
+
+def timed(hist: _HistogramChild | None, fn, *args, **kwargs):
+    """fn(*args, **kwargs), observing its duration in seconds when `hist` is set."""
+    if hist is None:
+        return fn(*args, **kwargs)
+    started = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        hist.observe(time.perf_counter() - started)
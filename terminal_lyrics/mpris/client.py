@@ -1,25 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 import logging
 from typing import Any
 
 import dbus
 
 from .errors import NoPlayersFound, PlayerUnavailable
+from .types import TrackInfo
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass(frozen=True, slots=True)
-class TrackInfo:
-    title: str
-    artist: str
-    album: str
-    # stable-ish identifier for "track changed" checks
-    track_key: str
-
-
 def _to_str(value: Any) -> str:
     try:
         return str(value)
@@ -51,6 +42,29 @@ class MprisClient:
             logger.debug("Unable to connect to D-Bus session bus: %s", e)
             return []
 
+    @staticmethod
+    def all_players(known: dict[str, "MprisClient"] | None = None) -> list["MprisClient"]:
+        """
+        A client for every player on the bus. Clients in `known` (by service
+        name) are reused and the dict is updated, so tracking many players
+        keeps one proxy per player on the one shared session bus.
+        """
+        known = {} if known is None else known
+        names = MprisClient.list_players()
+        for gone in known.keys() - set(names):
+            del known[gone]
+        out = []
+        for name in names:
+            client = known.get(name)
+            if client is None:
+                try:
+                    client = known[name] = MprisClient(name)
+                except dbus.DBusException as e:
+                    logger.debug("Player %s went away: %s", name, e)
+                    continue
+            out.append(client)
+        return out
+
     @staticmethod
     def pick_player(preferred: str | None = None) -> "MprisClient":
         players = MprisClient.list_players()
@@ -0,0 +1,188 @@
+"""
+Record and replay MPRIS sessions.
+
+A recording is NDJSON: a header line, then one observation per line
+
+    {"t": 12.034, "op": "position_ms", "player": "org.mpris.MediaPlayer2.vlc", "value": 61250}
+    {"t": 12.051, "op": "track_info", "player": "...", "error": {"type": "PlayerUnavailable", "msg": "..."}}
+
+`t` is seconds since the recording started. Positions are logged on every
+call (jitter and seeks are what we want to reproduce); other operations only
+when their result changes, which keeps an hour of 30 Hz playback small.
+Replay answers each call with the latest observation of that operation at
+or before the current session time, so it reproduces the player as the
+watch loop saw it, at any speed and with a virtual clock.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from bisect import bisect_right
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, TextIO
+
+from .errors import MprisError, NoPlayersFound, PlayerUnavailable
+from .types import TrackInfo
+
+FORMAT_VERSION = 1
+
+_ERRORS: dict[str, type[MprisError]] = {
+    "NoPlayersFound": NoPlayersFound,
+    "PlayerUnavailable": PlayerUnavailable,
+}
+
+
+class ReplayFinished(Exception):
+    """Raised by the replay session once the recording is exhausted."""
+
+
+class SessionRecorder:
+    """Wraps a `pick_player` callable and logs what the clients return."""
+
+    def __init__(self, path: Path, *, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._t0 = clock()
+        self._fp: TextIO = path.open("w", encoding="utf-8")
+        self._last: dict[str, Any] = {}
+        self._fp.write(json.dumps({"format": "terminal-lyrics-mpris", "v": FORMAT_VERSION, "started": time.time()}) + "\n")
+
+    def __enter__(self) -> "SessionRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if not self._fp.closed:
+            self._fp.close()
+
+    def log(self, op: str, player: str | None, *, value: Any = None, error: Exception | None = None) -> None:
+        obs: dict[str, Any] = {"t": round(self._clock() - self._t0, 4), "op": op, "player": player}
+        if error is not None:
+            obs["error"] = {"type": type(error).__name__, "msg": str(error)}
+            state: Any = ("error", obs["error"]["type"])
+        else:
+            obs["value"] = value
+            state = value
+        if op != "position_ms" and self._last.get(op, object()) == (player, state):
+            return
+        self._last[op] = (player, state)
+        self._fp.write(json.dumps(obs, ensure_ascii=False) + "\n")
+
+    def wrap_pick(self, pick_player: Callable[..., Any]) -> Callable[..., "RecordingClient"]:
+        def pick(preferred: str | None = None) -> RecordingClient:
+            try:
+                client = pick_player(preferred=preferred)
+            except MprisError as e:
+                self.log("pick_player", None, error=e)
+                raise
+            self.log("pick_player", client.service_name, value=client.service_name)
+            return RecordingClient(client, self)
+
+        return pick
+
+
+class RecordingClient:
+    def __init__(self, client: Any, recorder: SessionRecorder):
+        self._client = client
+        self._rec = recorder
+        self.service_name: str = client.service_name
+
+    def _call(self, op: str, encode: Callable[[Any], Any] = lambda v: v) -> Any:
+        try:
+            result = getattr(self._client, op)()
+        except MprisError as e:
+            self._rec.log(op, self.service_name, error=e)
+            raise
+        self._rec.log(op, self.service_name, value=encode(result))
+        return result
+
+    def playback_status(self) -> str:
+        return self._call("playback_status")
+
+    def position_ms(self) -> int:
+        return self._call("position_ms")
+
+    def track_info(self) -> TrackInfo:
+        return self._call("track_info", asdict)
+
+
+class ReplaySession:
+    """
+    Replays a recording. `speed` > 1 runs accelerated; `clock` may be a
+    virtual clock for deterministic benchmarks and tests.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        speed: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if speed <= 0:
+            raise ValueError(f"speed must be positive: {speed}")
+        self.speed = speed
+        self._clock = clock
+        self._t0: float | None = None
+        # op -> (times, observations), both in recording order
+        self._ops: dict[str, tuple[list[float], list[dict[str, Any]]]] = {}
+        self.duration_s = 0.0
+        with path.open(encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("v") != FORMAT_VERSION:
+                raise ValueError(f"Unsupported recording: {path}")
+            for line in f:
+                if not line.strip():
+                    continue
+                obs = json.loads(line)
+                times, items = self._ops.setdefault(obs["op"], ([], []))
+                times.append(obs["t"])
+                items.append(obs)
+                self.duration_s = max(self.duration_s, obs["t"])
+        self._client = ReplayClient(self)
+
+    def now(self) -> float:
+        """Session time in recording seconds (starts at the first call)."""
+        if self._t0 is None:
+            self._t0 = self._clock()
+        return (self._clock() - self._t0) * self.speed
+
+    def observe(self, op: str) -> Any:
+        now = self.now()
+        if now > self.duration_s:
+            raise ReplayFinished
+        times, items = self._ops.get(op, ([], []))
+        i = bisect_right(times, now) - 1
+        if i < 0:
+            if op == "pick_player":
+                raise NoPlayersFound("recording has not started a player yet")
+            raise PlayerUnavailable(f"no recorded {op} yet")
+        obs = items[i]
+        if "error" in obs:
+            err = obs["error"]
+            raise _ERRORS.get(err["type"], PlayerUnavailable)(err["msg"])
+        if obs.get("player"):
+            self._client.service_name = obs["player"]
+        return obs["value"]
+
+    def pick_player(self, preferred: str | None = None) -> "ReplayClient":
+        self.observe("pick_player")
+        return self._client
+
+
+class ReplayClient:
+    def __init__(self, session: ReplaySession):
+        self._session = session
+        self.service_name = ""
+
+    def playback_status(self) -> str:
+        return self._session.observe("playback_status")
+
+    def position_ms(self) -> int:
+        return int(self._session.observe("position_ms"))
+
+    def track_info(self) -> TrackInfo:
+        return TrackInfo(**self._session.observe("track_info"))
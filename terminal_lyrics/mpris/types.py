@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Protocol
+
+
+@dataclass(frozen=True, slots=True)
+class TrackInfo:
+    title: str
+    artist: str
+    album: str
+    # stable-ish identifier for "track changed" checks
+    track_key: str
+
+
+class PlayerClient(Protocol):
+    """What the watch loop needs from a player: MprisClient or a recording/replay stand-in."""
+
+    service_name: str
+
+    def playback_status(self) -> str: ...
+
+    def position_ms(self) -> int: ...
+
+    def track_info(self) -> TrackInfo: ...
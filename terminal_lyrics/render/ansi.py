@@ -4,12 +4,21 @@ import shutil
 import signal
 import sys
 from dataclasses import dataclass
-from typing import Callable
+from typing import Callable, Protocol, Sequence
 
+from terminal_lyrics.render.layout import Layout, cell_width, truncate
 
 CSI = "\x1b["
 
 
+class Output(Protocol):
+    """What the renderer writes to: a text stream, or a wrapper such as metrics.MeteredStream."""
+
+    def write(self, s: str, /) -> int: ...
+
+    def flush(self) -> None: ...
+
+
 def _sgr(*codes: int) -> str:
     return CSI + ";".join(str(c) for c in codes) + "m"
 
@@ -18,18 +27,38 @@ def _sgr(*codes: int) -> str:
 class Theme:
     title: str = _sgr(36, 1)  # cyan bold
     current: str = _sgr(32, 1)  # green bold
+    sung: str = _sgr(30, 42)  # black on green (karaoke: already sung part)
     dim: str = _sgr(90)  # bright black
     warning: str = _sgr(33, 1)  # yellow bold
     reset: str = _sgr(0)
 
 
 class AnsiRenderer:
-    def __init__(self, use_alt_screen: bool = True, theme: Theme | None = None):
+    def __init__(
+        self,
+        use_alt_screen: bool = True,
+        theme: Theme | None = None,
+        stream: Output | None = None,
+    ):
         self.use_alt_screen = use_alt_screen
         self.theme = theme or Theme()
+        # None = whatever sys.stdout is at write time
+        self._stream = stream
         self._entered = False
         self._resize_handler: Callable[..., None] | None = None
-        self._last_render_args: tuple[str, list[str], int, int] | None = None
+        self._last_render_args: tuple[str, Sequence[str], int, int] | None = None
+        # wrapped lines of the track on screen, rebuilt for a new track or width
+        self._layout: Layout | None = None
+        self._layout_lines: Sequence[str] | None = None
+        self._title: tuple[str, int, str] | None = None  # (title, width, title row)
+        # karaoke state of the current line: screen row (1-based) of its first
+        # wrapped row, last body row, its text, rows and number of highlighted
+        # characters
+        self._hl_row: int | None = None
+        self._hl_last_row = 0
+        self._hl_text = ""
+        self._hl_spans: tuple[tuple[int, int], ...] = ()
+        self._hl_pos = 0
 
     def __setattr__(self, name: str, value) -> None:
         """
@@ -39,7 +68,9 @@ class AnsiRenderer:
         if name == "render" and hasattr(value, "call_count") and callable(value):
             mock_render = value
 
-            def _wrapped_render(title: str, lines: list[str], current_idx: int, context_lines: int = 1):
+            def _wrapped_render(
+                title: str, lines: Sequence[str], current_idx: int, context_lines: int = 1
+            ):
                 self._last_render_args = (title, lines, current_idx, context_lines)
                 return mock_render(title, lines, current_idx=current_idx, context_lines=context_lines)
 
@@ -47,6 +78,10 @@ class AnsiRenderer:
 
         return object.__setattr__(self, name, value)
 
+    @property
+    def stream(self) -> Output:
+        return self._stream if self._stream is not None else sys.stdout
+
     def __enter__(self):
         self.enter()
         return self
@@ -57,11 +92,12 @@ class AnsiRenderer:
     def enter(self) -> None:
         if self._entered:
             return
+        out = self.stream
         if self.use_alt_screen:
-            sys.stdout.write(CSI + "?1049h")  # alt screen
-        sys.stdout.write(CSI + "?25l")  # hide cursor
-        sys.stdout.write(CSI + "H" + CSI + "2J")  # home + clear
-        sys.stdout.flush()
+            out.write(CSI + "?1049h")  # alt screen
+        out.write(CSI + "?25l")  # hide cursor
+        out.write(CSI + "H" + CSI + "2J")  # home + clear
+        out.flush()
         self._entered = True
         
         # Register SIGWINCH handler for resize
@@ -80,49 +116,110 @@ class AnsiRenderer:
         if self._resize_handler:
             signal.signal(signal.SIGWINCH, signal.SIG_DFL)
             self._resize_handler = None
-        sys.stdout.write(self.theme.reset)
-        sys.stdout.write(CSI + "?25h")  # show cursor
+        out = self.stream
+        out.write(self.theme.reset)
+        out.write(CSI + "?25h")  # show cursor
         if self.use_alt_screen:
-            sys.stdout.write(CSI + "?1049l")  # normal screen
-        sys.stdout.flush()
+            out.write(CSI + "?1049l")  # normal screen
+        out.flush()
         self._entered = False
         self._last_render_args = None
+        self._hl_row = None
 
     def render(
         self,
         title: str,
-        lines: list[str],
+        lines: Sequence[str],
         current_idx: int,
         context_lines: int = 1,
     ) -> None:
-        # Store args for SIGWINCH redraw
+        # Store args for SIGWINCH redraw; keep the karaoke highlight only when
+        # redrawing the same line (resize), a new line starts unsung
+        last = self._last_render_args
+        if last is None or last[1] is not lines or last[2] != current_idx:
+            self._hl_pos = 0
         self._last_render_args = (title, lines, current_idx, context_lines)
+        self._hl_row = None
         
         cols, rows = shutil.get_terminal_size(fallback=(80, 24))
         # reserve 1 line for title
         body_rows = max(rows - 1, 1)
 
-        # window around current line, but keep within list
-        if current_idx < 0:
-            start = 0
-        else:
-            start = max(current_idx - context_lines, 0)
-        end = min(start + body_rows, len(lines))
-        start = max(end - body_rows, 0)
-
-        out: list[str] = []
-        out.append(f"{self.theme.title}♫ {title} ♫{self.theme.reset}")
-
-        for i in range(start, end):
+        # lines are wrapped to the terminal width once per track (and resize),
+        # so a frame only bisects for the window around the current line;
+        # `lines` is the same object for the whole track and never mutated
+        layout = self._layout
+        if layout is None or self._layout_lines is not lines or layout.width != cols:
+            layout = self._layout = Layout.build(lines, cols)
+            self._layout_lines = lines
+        top = layout.top_row(current_idx, context_lines, body_rows)
+        bottom = min(top + body_rows, layout.total_rows)
+
+        theme = self.theme
+        if self._title is None or self._title[:2] != (title, cols):
+            self._title = (title, cols, f"{theme.title}{truncate(f'♫ {title} ♫', cols)}{theme.reset}")
+        out: list[str] = [self._title[2]]
+
+        row = top
+        i = layout.line_at(top)
+        while row < bottom:
             t = lines[i]
+            spans = layout.spans[i]
+            first = layout.offsets[i]
             if i == current_idx:
-                out.append(f"{self.theme.current}{t}{self.theme.reset}")
-            else:
-                out.append(f"{self.theme.dim}{t}{self.theme.reset}")
+                # title is row 1, body starts at row 2
+                self._hl_row = 2 + first - top
+                self._hl_last_row = 1 + bottom - top
+                self._hl_text = t
+                self._hl_spans = spans
+                hl = self._hl_pos
+            for a, b in spans[row - first : row - first + bottom - row]:
+                if i == current_idx:
+                    sung = min(max(hl - a, 0), b - a)
+                    head = f"{theme.sung}{t[a : a + sung]}" if sung else ""
+                    out.append(f"{head}{theme.current}{t[a + sung : b]}{theme.reset}")
+                else:
+                    out.append(f"{theme.dim}{t[a:b]}{theme.reset}")
+            row = first + len(spans)
+            i += 1
 
         # move home + clear, then print full frame
-        sys.stdout.write(CSI + "H" + CSI + "2J")
-        sys.stdout.write("\n".join(out))
-        sys.stdout.write(self.theme.reset)
-        sys.stdout.flush()
+        stream = self.stream
+        stream.write(CSI + "H" + CSI + "2J")
+        stream.write("\n".join(out))
+        stream.write(self.theme.reset)
+        stream.flush()
+
+    def highlight_to(self, pos: int) -> None:
+        """
+        Karaoke: highlight the first `pos` characters of the current line.
 
+        Only the span between the old and the new position is rewritten
+        (cursor move + a few characters), not the whole frame, so per-word
+        updates stay cheap at high refresh rates.
+        """
+        if self._hl_row is None:
+            return
+        text = self._hl_text
+        pos = max(0, min(pos, len(text)))
+        old = self._hl_pos
+        if pos == old:
+            return
+        self._hl_pos = pos
+
+        lo, hi = (old, pos) if pos > old else (pos, old)
+        style = self.theme.sung if pos > old else self.theme.current
+        # a wrapped line: the span may cover several rows, each rewritten in place
+        parts = []
+        for k, (a, b) in enumerate(self._hl_spans):
+            start, end = max(lo, a), min(hi, b)
+            row = self._hl_row + k
+            if start >= end or not 2 <= row <= self._hl_last_row:
+                continue
+            col = cell_width(text[a:start]) + 1
+            parts.append(f"{CSI}{row};{col}H{style}{text[start:end]}")
+        if not parts:
+            return
+        stream = self.stream
+        stream.write("".join(parts) + self.theme.reset)
+        stream.flush()
@@ -0,0 +1,172 @@
+"""
+Display-width aware layout of a track's lines for the full-screen renderer.
+
+Widths are terminal columns, not characters: CJK and most emoji take two,
+combining marks and zero-width joiners none. `wcwidth` is used when
+installed (`pip install "terminal-lyrics[wcwidth]"`, tracks newer Unicode
+versions), otherwise `unicodedata`.
+
+A Layout wraps every line of a track once for a given terminal width and
+keeps the cumulative row offsets, so picking the visible window around the
+current line is a bisect instead of a walk over all lines, and the wrapping
+is only redone when the terminal is resized.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Sequence
+
+try:
+    from wcwidth import wcwidth as _wcwidth
+except ImportError:  # optional dependency
+    _wcwidth = None
+
+ELLIPSIS = "…"
+
+# zero-width without being combining marks (ZWJ, variation selectors, ...)
+_ZERO_WIDTH_CATEGORIES = ("Mn", "Me", "Cf")
+
+# colour/style escapes (a styled label in a title): no columns, never cut
+_SGR = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def char_width(ch: str) -> int:
+    """Terminal columns taken by one character (0, 1 or 2)."""
+    if _wcwidth is not None:
+        # -1 for control characters: they don't advance the cursor here
+        return max(_wcwidth(ch), 0)
+    if unicodedata.combining(ch) or unicodedata.category(ch) in _ZERO_WIDTH_CATEGORIES:
+        return 0
+    return 2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+
+
+def cell_width(text: str) -> int:
+    """Terminal columns taken by `text` (wide CJK = 2, combining marks = 0)."""
+    if text.isascii():
+        return len(text) if text.isprintable() else sum(char_width(ch) for ch in text)
+    return sum(char_width(ch) for ch in text)
+
+
+def truncate(text: str, width: int) -> str:
+    """
+    `text` cut to `width` terminal columns, with an ellipsis when cut
+    (width <= 0: unlimited). SGR escapes in `text` take no columns and are
+    kept whole; the ones after the cut are dropped, so the caller resets.
+    """
+    if width <= 0:
+        return text
+    if "\x1b" in text:
+        return _truncate_styled(text, width)
+    if cell_width(text) <= width:
+        return text
+    limit = width - cell_width(ELLIPSIS)
+    used = 0
+    for i, ch in enumerate(text):
+        used += char_width(ch)
+        if used > limit:
+            return text[:i] + ELLIPSIS
+    return text
+
+
+def _truncate_styled(text: str, width: int) -> str:
+    if cell_width(_SGR.sub("", text)) <= width:
+        return text
+    limit = width - cell_width(ELLIPSIS)
+    used = 0
+    i = 0
+    while i < len(text):
+        m = _SGR.match(text, i)
+        if m is not None:
+            i = m.end()
+            continue
+        used += char_width(text[i])
+        if used > limit:
+            return text[:i] + ELLIPSIS
+        i += 1
+    return text
+
+
+def wrap_spans(text: str, width: int) -> tuple[tuple[int, int], ...]:
+    """
+    Rows of `text` at most `width` columns wide, as (start, end) character
+    offsets into `text`. Breaks after the last space that fits, inside a word
+    only when the word alone is wider than a row; the space a row breaks at
+    is not part of either row. An empty line is one empty row.
+    """
+    if width <= 0 or cell_width(text) <= width:
+        return ((0, len(text)),)
+    spans: list[tuple[int, int]] = []
+    start = 0
+    used = 0
+    # end of the row if it breaks at the last space seen, and where the next row starts
+    brk = -1
+    for i, ch in enumerate(text):
+        w = char_width(ch)
+        if used + w > width and i > start:
+            if ch == " ":
+                spans.append((start, i))
+                start, used, brk = i + 1, 0, -1
+                continue
+            if brk > start:
+                spans.append((start, brk))
+                start = brk + 1
+                used = cell_width(text[start:i])
+                if used + w > width and i > start:
+                    spans.append((start, i))
+                    start, used = i, 0
+            else:
+                spans.append((start, i))
+                start, used = i, 0
+            brk = -1
+        if ch == " ":
+            brk = i
+        used += w
+    spans.append((start, len(text)))
+    return tuple(spans)
+
+
+@dataclass(frozen=True, slots=True)
+class Layout:
+    """
+    Every line of a track wrapped to `width` columns: `spans[i]` are the rows
+    of line i, `offsets[i]` the row it starts on (`offsets[-1]` = total rows).
+    """
+
+    width: int
+    spans: tuple[tuple[tuple[int, int], ...], ...]
+    offsets: tuple[int, ...]
+
+    @classmethod
+    def build(cls, lines: Sequence[str], width: int) -> Layout:
+        spans = tuple(wrap_spans(line, width) for line in lines)
+        offsets = [0]
+        for rows in spans:
+            offsets.append(offsets[-1] + len(rows))
+        return cls(width, spans, tuple(offsets))
+
+    @property
+    def total_rows(self) -> int:
+        return self.offsets[-1]
+
+    def top_row(self, current_idx: int, context_lines: int, body_rows: int) -> int:
+        """
+        First row of the window: `context_lines` lines above the current one
+        when they fit, the current line whole when it fits at all, and no
+        empty space at the bottom that earlier lines could fill.
+        """
+        if current_idx < 0 or not self.spans:
+            return 0
+        offsets = self.offsets
+        cur = min(current_idx, len(self.spans) - 1)
+        top = offsets[max(cur - context_lines, 0)]
+        # don't let the context push the current line's end off the bottom
+        top = max(top, min(offsets[cur + 1] - body_rows, offsets[cur]))
+        return max(min(top, self.total_rows - body_rows), 0)
+
+    def line_at(self, row: int) -> int:
+        """Index of the line that `row` belongs to."""
+        return bisect_right(self.offsets, row) - 1
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import sys
+from typing import Sequence, TextIO
+
+from terminal_lyrics.events import Event, LineChanged, Notice, TrackChanged
+from terminal_lyrics.render.layout import truncate
+
+
+class LineSink:
+    """
+    Status-line output for tmux, i3bar, polybar and the like: only the
+    current line, cut to `width` columns, one output line per change.
+
+    The cut text of every line is computed once per track, so a line change
+    is a list lookup, and nothing is written unless the visible text
+    actually changed (a seek back to the same line, a notice repeating the
+    current text, ...).
+    """
+
+    def __init__(self, width: int = 0, stream: TextIO | None = None):
+        self.width = width
+        # None = whatever sys.stdout is at write time
+        self._stream = stream
+        self._title = ""
+        self._cells: Sequence[str] = ()
+        self.text: str | None = None
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream if self._stream is not None else sys.stdout
+
+    def enter(self) -> None:
+        pass
+
+    def exit(self) -> None:
+        pass
+
+    def emit(self, event: Event) -> None:
+        if isinstance(event, LineChanged):
+            i = event.index
+            text = self._cells[i] if 0 <= i < len(self._cells) else self._title
+        elif isinstance(event, TrackChanged):
+            self._title = truncate(event.display, self.width)
+            self._cells = [truncate(ln, self.width) for ln in event.lines] if event.synced else ()
+            text = self._title
+        elif isinstance(event, Notice):
+            text = truncate(event.text, self.width)
+        else:
+            return
+        if text != self.text:
+            self.text = text
+            out = self.stream
+            out.write(text + "\n")
+            out.flush()
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import os
+import sys
+from typing import BinaryIO
+
+from terminal_lyrics.events import Event, encode
+
+
+class NdjsonSink:
+    """
+    Machine-readable output: one compact JSON object per event and line.
+
+    Writes go to a binary, block-buffered stream (stdout's buffer by
+    default) and are flushed once per event, so a consumer sees each event
+    as a single write and nothing is ever redrawn.
+    """
+
+    def __init__(self, stream: BinaryIO | None = None):
+        # None = sys.stdout's buffer at write time
+        self._stream = stream
+
+    @property
+    def stream(self) -> BinaryIO:
+        return self._stream if self._stream is not None else sys.stdout.buffer
+
+    def enter(self) -> None:
+        pass
+
+    def exit(self) -> None:
+        pass
+
+    def emit(self, event: Event) -> None:
+        out = self.stream
+        try:
+            out.write(encode(event).encode("utf-8") + b"\n")
+            out.flush()
+        except BrokenPipeError:
+            # consumer went away (`| head`): stop quietly, and keep the
+            # interpreter's final flush of stdout from failing again
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, out.fileno())
+            raise SystemExit(0)
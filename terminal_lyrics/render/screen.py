@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from terminal_lyrics.events import Event, Highlight, LineChanged, Notice, TrackChanged
+from terminal_lyrics.i18n import t
+from terminal_lyrics.render.ansi import AnsiRenderer
+
+
+class ScreenSink:
+    """
+    Full-screen output: turns watch-loop events into AnsiRenderer frames.
+
+    The lines of the current track are passed to the renderer as the same
+    tuple on every frame, which is how it tells a new current line (karaoke
+    highlight starts over) from a redraw.
+    """
+
+    def __init__(self, renderer: AnsiRenderer, context_lines: int = 1):
+        self.renderer = renderer
+        self.context_lines = context_lines
+        self._track: TrackChanged | None = None
+
+    def enter(self) -> None:
+        self.renderer.enter()
+
+    def exit(self) -> None:
+        self.renderer.exit()
+
+    def emit(self, event: Event) -> None:
+        r = self.renderer
+        if isinstance(event, LineChanged):
+            track = self._track
+            if track is not None:
+                r.render(track.display, track.lines, current_idx=event.index, context_lines=self.context_lines)
+        elif isinstance(event, Highlight):
+            r.highlight_to(event.pos)
+        elif isinstance(event, TrackChanged):
+            self._track = event
+            if not event.lines:
+                r.render(event.display, [t("lyrics_not_found")], current_idx=-1)
+            elif event.synced:
+                r.render(event.display, event.lines, current_idx=-1, context_lines=self.context_lines)
+            else:
+                # plain text lyrics: rendered once, with the unsynced indicator
+                title = f"{event.display} {r.theme.warning}{t('unsynced_label')}{r.theme.reset}"
+                r.render(title, event.lines, current_idx=-1, context_lines=self.context_lines)
+        elif isinstance(event, Notice):
+            self._track = None
+            r.render("terminal-lyrics", [event.text], current_idx=-1)
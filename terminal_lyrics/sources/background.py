@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundWorker:
+    """
+    Single daemon thread for best-effort jobs (prefetch etc.).
+
+    Jobs run one at a time in submission order, so they naturally respect
+    per-source rate limits. The thread is started lazily and dies with the
+    process: pending jobs are simply dropped on exit.
+    """
+
+    def __init__(self, name: str = "terminal-lyrics-bg"):
+        self.name = name
+        self._queue: queue.Queue[tuple[Callable[..., Any], tuple[Any, ...]]] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        self._queue.put((fn, args))
+
+    def join(self) -> None:
+        """Block until every submitted job has finished (tests, benchmarks)."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            fn, args = self._queue.get()
+            try:
+                fn(*args)
+            except Exception:
+                logger.exception("Background job %s failed", getattr(fn, "__name__", fn))
+            finally:
+                self._queue.task_done()
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import threading
+import time
 from dataclasses import dataclass
 
+from .health import SourceHealth
 from .types import TrackKey
 
 
@@ -10,10 +13,74 @@ class FetchResult:
     lrc_text: str | None
     definitive_not_found: bool
     source: str
+    remote_id: int | None = None
+    # request not sent at all (rate limit, open circuit): says nothing about the source
+    skipped: bool = False
+
+
+class SourceUnavailable(Exception):
+    """A request that got no answer: not sent (`skipped`) or failed."""
+
+    def __init__(self, source: str, *, skipped: bool = False):
+        super().__init__(f"{source} {'skipped' if skipped else 'failed'}")
+        self.source = source
+        self.skipped = skipped
 
 
 class LyricsSource:
     name: str
+    health: SourceHealth
+    min_interval_s: float
+    _last_call_time: float
+    # guards _last_call_time / _reserved_for: background jobs and the watch loop share a source
+    _turn_lock: threading.Lock
+    _reserved_for: int | None
+
+    def _init_turns(self) -> None:
+        self._last_call_time = 0.0
+        self._turn_lock = threading.Lock()
+        self._reserved_for = None
+
+    def wait_turn(self) -> None:
+        """
+        Sleep until `min_interval_s` has passed since the previous call, then
+        reserve the slot for this thread's next request. Background jobs use
+        it to wait for a slot instead of giving up; the lock is not held while
+        sleeping, so the watch loop is never blocked behind them.
+        """
+        while True:
+            with self._turn_lock:
+                delay = 0.0
+                if self._last_call_time:
+                    delay = self.min_interval_s - (time.time() - self._last_call_time)
+                if delay <= 0:
+                    self._last_call_time = time.time()
+                    self._reserved_for = threading.get_ident()
+                    return
+            time.sleep(delay)
+
+    def take_turn(self) -> bool:
+        """
+        Claim the slot for a request right now: True when `min_interval_s` has
+        passed (or this thread reserved it with wait_turn), False when the
+        caller should skip the request.
+        """
+        with self._turn_lock:
+            if self._reserved_for == threading.get_ident():
+                self._reserved_for = None
+                return True
+            now = time.time()
+            if self._last_call_time and now - self._last_call_time < self.min_interval_s:
+                return False
+            self._last_call_time = now
+            return True
+
+    def note_call(self) -> None:
+        """A request that is not rate-limited itself (search) still uses up the slot."""
+        with self._turn_lock:
+            if self._reserved_for == threading.get_ident():
+                self._reserved_for = None
+            self._last_call_time = time.time()
 
     def fetch(self, track: TrackKey) -> FetchResult:
         raise NotImplementedError
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def elapsed_ms(started: float) -> float:
+    """Milliseconds since a `time.monotonic()` reading."""
+    return (time.monotonic() - started) * 1000.0
+
+
+@dataclass(slots=True)
+class SourceHealth:
+    """
+    Per-source health: latency / error-rate EWMA plus a circuit breaker.
+
+    closed    -> requests go through; `failure_threshold` consecutive failures open it
+    open      -> requests are skipped until `cooldown_s` has passed
+    half_open -> a single probe request is let through; success closes the
+                 breaker, failure opens it for another cool-down. A probe
+                 that reports neither (it died on an unexpected error) is
+                 given up after `probe_timeout_s` and another one let through
+    """
+
+    name: str
+    failure_threshold: int = 3
+    cooldown_s: float = 60.0
+    ewma_alpha: float = 0.2
+    probe_timeout_s: float = 30.0
+
+    state: str = CLOSED
+    latency_ewma_ms: float | None = None
+    error_rate: float = 0.0
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    calls: int = 0
+    failures: int = 0
+    _probing: bool = False
+    _probe_started: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown_s:
+                    return False
+                self.state = HALF_OPEN
+                self._probing = False
+                logger.info("source %s: circuit half-open, probing", self.name)
+            # half-open: exactly one probe at a time
+            now = time.monotonic()
+            if self._probing and now - self._probe_started < self.probe_timeout_s:
+                return False
+            self._probing = True
+            self._probe_started = now
+            return True
+
+    def record_success(self, latency_ms: float) -> None:
+        with self._lock:
+            self._observe(latency_ms, failed=False)
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                logger.info("source %s: circuit closed", self.name)
+            self.state = CLOSED
+            self._probing = False
+
+    def record_failure(self, latency_ms: float) -> None:
+        with self._lock:
+            self._observe(latency_ms, failed=True)
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning(
+                        "source %s: circuit open for %.0fs after %s failures",
+                        self.name,
+                        self.cooldown_s,
+                        self.consecutive_failures,
+                    )
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self._probing = False
+
+    def _observe(self, latency_ms: float, *, failed: bool) -> None:
+        self.calls += 1
+        a = self.ewma_alpha
+        if self.latency_ewma_ms is None:
+            self.latency_ewma_ms = latency_ms
+        else:
+            self.latency_ewma_ms = a * latency_ms + (1 - a) * self.latency_ewma_ms
+        self.error_rate = a * (1.0 if failed else 0.0) + (1 - a) * self.error_rate
+
+    def describe(self) -> str:
+        latency = f"{self.latency_ewma_ms:.0f}ms" if self.latency_ewma_ms is not None else "-"
+        out = (
+            f"{self.name}: {self.state} latency~{latency} errors~{self.error_rate:.0%}"
+            f" ({self.failures}/{self.calls})"
+        )
+        if self.state == OPEN:
+            left = max(self.cooldown_s - (time.monotonic() - self.opened_at), 0.0)
+            out += f" retry in {left:.0f}s"
+        return out
@@ -6,7 +6,8 @@ from typing import List
 
 import requests
 
-from .base import FetchResult, LyricsSource
+from .base import FetchResult, LyricsSource, SourceUnavailable
+from .health import CLOSED, SourceHealth, elapsed_ms
 from .types import SearchResult, TrackKey
 
 logger = logging.getLogger(__name__)
@@ -14,17 +15,35 @@ logger = logging.getLogger(__name__)
 
 class LrcLibSource(LyricsSource):
     name = "lrclib"
+    DEFAULT_BASE_URL = "https://lrclib.net"
 
-    def __init__(self, *, min_interval_s: float, max_retries: int, backoff_base_s: float):
+    def __init__(
+        self,
+        *,
+        min_interval_s: float,
+        max_retries: int,
+        backoff_base_s: float,
+        health: SourceHealth | None = None,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout_s: float = 10.0,
+        session: requests.Session | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout_s = timeout_s
+        # a shared Session keeps connections alive across sources and tracks;
+        # without one every request opens its own
+        self._http = session if session is not None else requests
         self.min_interval_s = min_interval_s
         self.max_retries = max_retries
         self.backoff_base_s = backoff_base_s
-        self._last_call_time = 0.0
+        self.health = health or SourceHealth(self.name)
+        self._init_turns()
 
     def fetch(self, track: TrackKey) -> FetchResult:
-        now = time.time()
-        if self._last_call_time and now - self._last_call_time < self.min_interval_s:
-            return FetchResult(lrc_text=None, definitive_not_found=False, source=self.name)
+        if not self.take_turn():
+            return FetchResult(
+                lrc_text=None, definitive_not_found=False, source=self.name, skipped=True
+            )
 
         params = {
             "artist_name": track.artist,
@@ -33,20 +52,27 @@ class LrcLibSource(LyricsSource):
         }
 
         for attempt in range(1, self.max_retries + 1):
+            if not self.health.allow():
+                logger.debug("%s skipped: %s", self.name, self.health.describe())
+                return FetchResult(None, False, self.name, skipped=attempt == 1)
+            started = time.monotonic()
             try:
                 self._last_call_time = time.time()
-                r = requests.get("https://lrclib.net/api/get", params=params, timeout=10)
+                r = self._http.get(f"{self.base_url}/api/get", params=params, timeout=self.timeout_s)
                 if r.status_code == 404:
+                    self.health.record_success(elapsed_ms(started))
                     return FetchResult(None, True, self.name)
                 r.raise_for_status()
                 data = r.json()
+                self.health.record_success(elapsed_ms(started))
                 lrc = data.get("syncedLyrics")
                 if not lrc:
                     return FetchResult(None, True, self.name)
-                return FetchResult(str(lrc).rstrip() + "\n", False, self.name)
+                return FetchResult(str(lrc).rstrip() + "\n", False, self.name, remote_id=data.get("id"))
             except requests.RequestException as e:
+                self.health.record_failure(elapsed_ms(started))
                 logger.warning("lrclib error (attempt %s/%s): %s", attempt, self.max_retries, e)
-                if attempt == self.max_retries:
+                if attempt == self.max_retries or self.health.state != CLOSED:
                     return FetchResult(None, False, self.name)
                 time.sleep(self.backoff_base_s * attempt)
 
@@ -64,6 +90,26 @@ class LrcLibSource(LyricsSource):
         Поиск лирики через lrclib API /api/search.
         
         Требуется хотя бы один из параметров: q или track_name.
+        При ошибке или пропуске (circuit breaker) возвращает пустой список.
+        """
+        try:
+            return self.search_checked(
+                q=q, track_name=track_name, artist_name=artist_name, album_name=album_name
+            )
+        except SourceUnavailable:
+            return []
+
+    def search_checked(
+        self,
+        *,
+        q: str | None = None,
+        track_name: str | None = None,
+        artist_name: str | None = None,
+        album_name: str | None = None,
+    ) -> List[SearchResult]:
+        """
+        Как search, но без ответа (ошибка сети, открытый breaker) бросает
+        SourceUnavailable: пустой список значит «ничего не найдено».
         """
         if not q and not track_name:
             raise ValueError("At least one of 'q' or 'track_name' must be provided")
@@ -78,11 +124,16 @@ class LrcLibSource(LyricsSource):
         if album_name:
             params["album_name"] = album_name
 
+        if not self.health.allow():
+            logger.debug("%s search skipped: %s", self.name, self.health.describe())
+            raise SourceUnavailable(self.name, skipped=True)
+        started = time.monotonic()
         try:
-            self._last_call_time = time.time()
-            r = requests.get("https://lrclib.net/api/search", params=params, timeout=10)
+            self.note_call()
+            r = self._http.get(f"{self.base_url}/api/search", params=params, timeout=self.timeout_s)
             r.raise_for_status()
             data = r.json()
+            self.health.record_success(elapsed_ms(started))
 
             results = []
             for item in data:
@@ -110,6 +161,7 @@ class LrcLibSource(LyricsSource):
                 )
             return results
         except requests.RequestException as e:
+            self.health.record_failure(elapsed_ms(started))
             logger.error("lrclib search error: %s", e)
-            return []
+            raise SourceUnavailable(self.name) from e
 
@@ -6,6 +6,7 @@ import time
 import requests
 
 from .base import FetchResult, LyricsSource
+from .health import CLOSED, SourceHealth, elapsed_ms
 from .types import TrackKey
 
 logger = logging.getLogger(__name__)
@@ -13,36 +14,61 @@ logger = logging.getLogger(__name__)
 
 class LyricsOvhSource(LyricsSource):
     name = "lyrics_ovh"
+    DEFAULT_BASE_URL = "https://api.lyrics.ovh"
 
-    def __init__(self, *, min_interval_s: float, max_retries: int, backoff_base_s: float):
+    def __init__(
+        self,
+        *,
+        min_interval_s: float,
+        max_retries: int,
+        backoff_base_s: float,
+        health: SourceHealth | None = None,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout_s: float = 10.0,
+        session: requests.Session | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout_s = timeout_s
+        # a shared Session keeps connections alive across sources and tracks;
+        # without one every request opens its own
+        self._http = session if session is not None else requests
         self.min_interval_s = min_interval_s
         self.max_retries = max_retries
         self.backoff_base_s = backoff_base_s
-        self._last_call_time = 0.0
+        self.health = health or SourceHealth(self.name)
+        self._init_turns()
 
     def fetch(self, track: TrackKey) -> FetchResult:
-        now = time.time()
-        if self._last_call_time and now - self._last_call_time < self.min_interval_s:
-            return FetchResult(lrc_text=None, definitive_not_found=False, source=self.name)
+        if not self.take_turn():
+            return FetchResult(
+                lrc_text=None, definitive_not_found=False, source=self.name, skipped=True
+            )
 
-        url = f"https://api.lyrics.ovh/v1/{requests.utils.quote(track.artist)}/{requests.utils.quote(track.title)}"
+        url = f"{self.base_url}/v1/{requests.utils.quote(track.artist)}/{requests.utils.quote(track.title)}"
 
         for attempt in range(1, self.max_retries + 1):
+            if not self.health.allow():
+                logger.debug("%s skipped: %s", self.name, self.health.describe())
+                return FetchResult(None, False, self.name, skipped=attempt == 1)
+            started = time.monotonic()
             try:
                 self._last_call_time = time.time()
-                r = requests.get(url, timeout=10)
+                r = self._http.get(url, timeout=self.timeout_s)
                 if r.status_code == 404:
+                    self.health.record_success(elapsed_ms(started))
                     return FetchResult(None, True, self.name)
                 r.raise_for_status()
                 data = r.json()
+                self.health.record_success(elapsed_ms(started))
                 lyrics = data.get("lyrics")
                 if not lyrics:
                     return FetchResult(None, True, self.name)
                 # This source is plain lyrics (no timing). Keep text as-is.
                 return FetchResult(str(lyrics).rstrip() + "\n", False, self.name)
             except requests.RequestException as e:
+                self.health.record_failure(elapsed_ms(started))
                 logger.warning("lyrics.ovh error (attempt %s/%s): %s", attempt, self.max_retries, e)
-                if attempt == self.max_retries:
+                if attempt == self.max_retries or self.health.state != CLOSED:
                     return FetchResult(None, False, self.name)
                 time.sleep(self.backoff_base_s * attempt)
 
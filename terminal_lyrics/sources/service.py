@@ -1,18 +1,50 @@
 from __future__ import annotations
 
 import logging
+import sqlite3
+import threading
+import time
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from terminal_lyrics.cache.sqlite import CacheKey, LyricsCache
+import requests
+
+from terminal_lyrics.cache.sqlite import CacheEntry, CacheKey, LyricsCache, content_hash
+from terminal_lyrics.cache.stats import SourceStatsStore
 from terminal_lyrics.config import AppConfig
+from terminal_lyrics.lrc.parse import has_timestamps
 
-from .base import LyricsSource
+from .background import BackgroundWorker
+from .base import FetchResult, LyricsSource, SourceUnavailable
+from .health import SourceHealth, elapsed_ms
 from .lrclib import LrcLibSource
 from .lyrics_ovh import LyricsOvhSource
+from .singleflight import SingleFlight
 from .types import SearchResult, TrackKey
 
+if TYPE_CHECKING:
+    from terminal_lyrics.metrics import WatchMetrics
+
 logger = logging.getLogger(__name__)
 
+# Adaptive ordering trusts a source's stats only after this many calls per request class.
+ADAPTIVE_MIN_SAMPLES = 5
+
+# Re-run an album prefetch at most this often (new lyrics may be added upstream).
+ALBUM_PREFETCH_TTL_S = 7 * 24 * 3600
+
+
+def request_class(track: TrackKey) -> str:
+    """
+    Coarse lookup class for per-source stats: sources differ a lot in how
+    well they handle collaborations and tracks without album metadata.
+    """
+    if "," in (track.artist or ""):
+        return "multi_artist"
+    if track.album:
+        return "album"
+    return "no_album"
+
 
 @dataclass(frozen=True, slots=True)
 class LyricsResponse:
@@ -22,13 +54,27 @@ class LyricsResponse:
 
 
 class LyricsService:
-    def __init__(self, cfg: AppConfig):
+    def __init__(self, cfg: AppConfig, *, metrics: WatchMetrics | None = None):
         self.cfg = cfg
+        self.metrics = metrics
         self.cache = LyricsCache(cfg.cache_db_path)
-        self.sources = self._build_sources(cfg)
+        # one connection pool for every source, album prefetch and revalidation
+        self.session = requests.Session()
+        self.sources = self._build_sources(cfg, self.session)
+        self.stats = SourceStatsStore(cfg.cache_db_path)
+        self.background = BackgroundWorker()
+        self._prefetched_albums: set[tuple[str, str]] = set()
+        self._revalidating: set[CacheKey] = set()
+        self._prefetch_lock = threading.Lock()
+        self._flight: SingleFlight[LyricsResponse] = SingleFlight(
+            cfg.cache_db_path.with_name(cfg.cache_db_path.name + ".lock"),
+            wait_timeout_s=cfg.single_flight_timeout_s,
+        )
 
     @staticmethod
-    def _build_sources(cfg: AppConfig) -> list[LyricsSource]:
+    def _build_sources(
+        cfg: AppConfig, session: requests.Session | None = None
+    ) -> list[LyricsSource]:
         out: list[LyricsSource] = []
         for s in cfg.sources:
             name = s.strip().lower()
@@ -38,6 +84,14 @@ class LyricsService:
                         min_interval_s=cfg.api_min_interval_s,
                         max_retries=cfg.api_max_retries,
                         backoff_base_s=cfg.api_backoff_base_s,
+                        health=SourceHealth(
+                            LrcLibSource.name,
+                            failure_threshold=cfg.breaker_failure_threshold,
+                            cooldown_s=cfg.breaker_cooldown_s,
+                        ),
+                        base_url=cfg.lrclib_base_url,
+                        timeout_s=cfg.api_timeout_s,
+                        session=session,
                     )
                 )
             elif name in ("lyrics_ovh", "lyrics.ovh", "ovh"):
@@ -46,6 +100,14 @@ class LyricsService:
                         min_interval_s=cfg.api_min_interval_s,
                         max_retries=cfg.api_max_retries,
                         backoff_base_s=cfg.api_backoff_base_s,
+                        health=SourceHealth(
+                            LyricsOvhSource.name,
+                            failure_threshold=cfg.breaker_failure_threshold,
+                            cooldown_s=cfg.breaker_cooldown_s,
+                        ),
+                        base_url=cfg.lyrics_ovh_base_url,
+                        timeout_s=cfg.api_timeout_s,
+                        session=session,
                     )
                 )
             else:
@@ -54,27 +116,108 @@ class LyricsService:
 
     def get_lyrics(self, track: TrackKey) -> LyricsResponse:
         key = CacheKey(artist=track.artist, title=track.title, album=track.album)
-        cached_text, cached_has = self.cache.get(key)
-        if cached_has is True and cached_text is not None:
-            return LyricsResponse(lrc_text=cached_text, source="cache", has_lyrics=True)
+        entry = self.cache.get_entry(key)
+        if entry is not None and entry.has_lyrics and entry.lrc_text is not None:
+            if self.metrics is not None:
+                self.metrics.cache_requests.labels("hit").inc()
+            # serve immediately; refresh-ahead in the background if the entry is old
+            self._maybe_revalidate(track, key, entry)
+            return LyricsResponse(lrc_text=entry.lrc_text, source="cache", has_lyrics=True)
+        if self.metrics is not None:
+            self.metrics.cache_requests.labels("miss").inc()
         # При has_lyrics=False в кэше — всё равно проверяем источники (лирики могли появиться)
-        if cached_has is False:
+        if entry is not None:
             logger.debug("Кэш: has_lyrics=0 для %s, проверяем источники", track.display)
 
+        # Several watchers / get_lyrics() callers usually see the same track change:
+        # only one of them goes to the network, the rest pick the result from the cache.
+        started = time.time()
+        return self._flight.do(
+            "\x1f".join((key.artist, key.title, key.album)),
+            lambda: self._fetch_and_store(track, key),
+            ready=lambda: self._cached_since(key, started),
+        )
+
+    def _cached_since(self, key: CacheKey, since: float) -> LyricsResponse | None:
+        entry = self.cache.get_entry(key)
+        if entry is None or entry.updated_at < int(since):
+            return None
+        if entry.has_lyrics and entry.lrc_text is not None:
+            return LyricsResponse(lrc_text=entry.lrc_text, source="cache", has_lyrics=True)
+        return LyricsResponse(lrc_text=None, source=None, has_lyrics=False)
+
+    def health_report(self) -> list[str]:
+        """One line per source: breaker state, latency and error EWMA."""
+        return [src.health.describe() for src in self.sources]
+
+    def _fetch_and_store(self, track: TrackKey, key: CacheKey) -> LyricsResponse:
+        found = self._resolve_from_sources(track)
+        if logger.isEnabledFor(logging.DEBUG):
+            for line in self.health_report():
+                logger.debug("source health: %s", line)
+        if found.lrc_text:
+            self.cache.set(
+                key,
+                has_lyrics=True,
+                lrc_text=found.lrc_text,
+                source=found.source,
+                remote_id=found.remote_id,
+            )
+            return LyricsResponse(lrc_text=found.lrc_text, source=found.source, has_lyrics=True)
+
+        if found.skipped:
+            # nothing was asked (rate limit, open circuits): not evidence of a miss
+            logger.debug("Все источники пропущены для %s, не кэшируем", track.display)
+            return LyricsResponse(lrc_text=None, source=None, has_lyrics=False)
+
+        # negative cache to avoid hammering
+        self.cache.set(key, has_lyrics=False, lrc_text=None, source=None)
+        return LyricsResponse(lrc_text=None, source=None, has_lyrics=False)
+
+    def _resolve_from_sources(self, track: TrackKey, *, wait: bool = False) -> FetchResult:
+        """
+        Network part of get_lyrics: exact fetch from every source, then lrclib search.
+        With wait=True (background jobs) rate-limited sources are waited for
+        instead of being skipped.
+
+        Without lyrics the result sums up the attempts: definitive_not_found
+        when a source answered "no such lyrics", skipped when no request was
+        sent at all.
+        """
         # Fetch sources in order; if any says "definitive_not_found", we still try others
         # (because some sources may have synced lyrics while others don't).
-        for src in self.sources:
+        rclass = request_class(track)
+        not_found = False
+        all_skipped = True
+        for src in self.ordered_sources(rclass):
+            if wait:
+                src.wait_turn()
+            started = time.monotonic()
             res = src.fetch(track)
+            self._record_call(src.name, rclass, res, started)
             if res.lrc_text:
-                self.cache.set(key, has_lyrics=True, lrc_text=res.lrc_text, source=res.source)
-                return LyricsResponse(lrc_text=res.lrc_text, source=res.source, has_lyrics=True)
+                return res
+            not_found = not_found or res.definitive_not_found
+            all_skipped = all_skipped and res.skipped
+        if all_skipped and self.sources:
+            # rate-limited right now: a search would not be allowed either
+            return FetchResult(None, False, "", skipped=True)
 
         # Если точного совпадения нет, пробуем автоматический поиск через search API
         # (только если есть LrcLibSource)
         lrclib_source = next((src for src in self.sources if isinstance(src, LrcLibSource)), None)
         if lrclib_source:
             logger.info("Точное совпадение не найдено, пробуем поиск для %s", track.display)
-            search_results = self._auto_search_fallback(track)
+            if wait:
+                lrclib_source.wait_turn()
+            started = time.monotonic()
+            try:
+                search_results = self._auto_search_fallback(track, lrclib_source)
+            except SourceUnavailable as e:
+                # no answer from search: neither a miss nor a reason to negative-cache
+                res = FetchResult(None, False, "lrclib_search", skipped=e.skipped)
+                self._record_call("lrclib_search", rclass, res, started)
+                return FetchResult(None, not_found, "")
             if search_results:
                 best_match = self._find_best_match(track, search_results)
                 if best_match:
@@ -89,20 +232,176 @@ class LyricsService:
                         lrc_text = best_match.plain_lyrics_text
                     
                     if lrc_text:
-                        self.cache.set(key, has_lyrics=True, lrc_text=lrc_text, source="lrclib_search")
-                        return LyricsResponse(lrc_text=lrc_text, source="lrclib_search", has_lyrics=True)
+                        res = FetchResult(lrc_text, False, "lrclib_search", remote_id=best_match.id)
+                        self._record_call("lrclib_search", rclass, res, started)
+                        return res
+            self._record_call(
+                "lrclib_search", rclass, FetchResult(None, True, "lrclib_search"), started
+            )
+            not_found = True
+        return FetchResult(None, not_found, "")
 
-        # negative cache to avoid hammering
-        self.cache.set(key, has_lyrics=False, lrc_text=None, source=None)
-        return LyricsResponse(lrc_text=None, source=None, has_lyrics=False)
+    def ordered_sources(self, rclass: str) -> list[LyricsSource]:
+        """
+        Sources in the order they should be tried for this request class.
+        static: as configured. adaptive: cheapest expected cost per useful hit
+        first (p50 latency / weighted hit rate); sources with too few samples
+        keep their configured place ahead of measured ones so they get explored.
+        """
+        if self.cfg.source_order != "adaptive" or len(self.sources) < 2:
+            return self.sources
+        stats = {st.source: st for st in self.stats.summary(rclass)}
+
+        def cost(item: tuple[int, LyricsSource]) -> tuple[int, float]:
+            idx, src = item
+            st = stats.get(src.name)
+            if st is None or st.calls < ADAPTIVE_MIN_SAMPLES:
+                return (0, float(idx))
+            return (1, max(st.p50_ms, 1) / max(st.hit_value, 0.05))
+
+        return [src for _, src in sorted(enumerate(self.sources), key=cost)]
+
+    def _record_call(self, source: str, rclass: str, res: FetchResult, started: float) -> None:
+        if res.skipped:
+            return
+        if res.lrc_text:
+            outcome = "synced" if has_timestamps(res.lrc_text) else "plain"
+        elif res.definitive_not_found:
+            outcome = "miss"
+        else:
+            outcome = "error"
+        took_ms = elapsed_ms(started)
+        if self.metrics is not None:
+            self.metrics.source_fetch_seconds.labels(source, outcome).observe(took_ms / 1000.0)
+        try:
+            self.stats.record(source, rclass, outcome, took_ms)
+        except sqlite3.Error as e:
+            logger.debug("Не удалось записать статистику источника: %s", e)
+
+    def _maybe_revalidate(self, track: TrackKey, key: CacheKey, entry: CacheEntry) -> None:
+        max_age = self.cfg.revalidate_after_s
+        if max_age <= 0 or not self.sources or time.time() - entry.updated_at < max_age:
+            return
+        with self._prefetch_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+        self.background.submit(self._revalidate, track, key, entry)
+
+    def _revalidate(self, track: TrackKey, key: CacheKey, entry: CacheEntry) -> None:
+        """
+        Refresh-ahead for an old cache entry. The cached text is replaced only
+        if upstream content changed (id + content hash) and it is not a
+        downgrade from synced to plain lyrics.
+        """
+        try:
+            found = self._resolve_from_sources(track, wait=True)
+        finally:
+            with self._prefetch_lock:
+                self._revalidating.discard(key)
+
+        if found.lrc_text is None:
+            # keep serving what we have; only a real "not found" counts as checked,
+            # an error or a skip leaves the age alone so the next hit retries
+            if found.definitive_not_found:
+                self.cache.touch(key)
+            return
+        unchanged = content_hash(found.lrc_text) == entry.content_hash and (
+            found.remote_id is None or found.remote_id == entry.remote_id
+        )
+        downgrade = has_timestamps(entry.lrc_text or "") and not has_timestamps(found.lrc_text)
+        if unchanged or downgrade:
+            self.cache.touch(key)
+            return
+
+        logger.info("Обновлены слова в кэше для %s (источник %s)", track.display, found.source)
+        self.cache.set(
+            key,
+            has_lyrics=True,
+            lrc_text=found.lrc_text,
+            source=found.source,
+            remote_id=found.remote_id,
+        )
+
+    def prefetch_album(self, track: TrackKey) -> None:
+        """
+        Schedule a background lrclib search scoped to (artist, album) and cache
+        lyrics of every track it returns, so the rest of the album plays from
+        cache. Runs at most once per album per process (and per TTL across runs).
+        """
+        if not self.cfg.prefetch_album or not track.artist or not track.album:
+            return
+        lrclib_source = next((src for src in self.sources if isinstance(src, LrcLibSource)), None)
+        if lrclib_source is None:
+            return
+        album_key = (track.artist, track.album)
+        with self._prefetch_lock:
+            if album_key in self._prefetched_albums:
+                return
+            self._prefetched_albums.add(album_key)
+        self.background.submit(self._prefetch_album, track, lrclib_source)
+
+    def _prefetch_album(self, track: TrackKey, lrclib_source: LrcLibSource) -> None:
+        last = self.cache.album_prefetched_at(track.artist, track.album)
+        if last is not None and time.time() - last < ALBUM_PREFETCH_TTL_S:
+            logger.debug("Альбом %s / %s уже предзагружен", track.artist, track.album)
+            return
+
+        lrclib_source.wait_turn()
+        results = lrclib_source.search(
+            q=track.album, artist_name=track.artist, album_name=track.album
+        )
+        album_lower = track.album.lower().strip()
+        track_artists = {a.strip().lower() for a in track.artist.split(",") if a.strip()}
+        track_artists.add(track.artist.lower().strip())
+
+        # title -> lyrics text; synced wins over plain
+        best: dict[str, tuple[str, str, int | None]] = {}
+        for r in results:
+            if (r.album_name or "").lower().strip() != album_lower:
+                continue
+            if (r.artist_name or "").lower().strip() not in track_artists:
+                continue
+            lrc_text = r.synced_lyrics_text or r.plain_lyrics_text
+            if not r.track_name or not lrc_text:
+                continue
+            title_lower = r.track_name.lower().strip()
+            if title_lower in best and not r.synced_lyrics_text:
+                continue
+            best[title_lower] = (r.track_name, lrc_text, r.id)
+
+        stored = 0
+        for title, lrc_text, remote_id in best.values():
+            key = CacheKey(artist=track.artist, title=title, album=track.album)
+            cached_text, cached_has = self.cache.get(key)
+            if cached_has is True and cached_text is not None:
+                continue
+            self.cache.set(
+                key, has_lyrics=True, lrc_text=lrc_text, source="lrclib_album", remote_id=remote_id
+            )
+            stored += 1
+
+        if results:
+            # empty result may be a network error; allow retry in the next run
+            self.cache.mark_album_prefetched(track.artist, track.album)
+        logger.info(
+            "Предзагрузка альбома %s / %s: %s треков в кэше", track.artist, track.album, stored
+        )
 
-    def _auto_search_fallback(self, track: TrackKey) -> list[SearchResult]:
-        """Автоматический поиск при отсутствии точного совпадения."""
+    def _auto_search_fallback(
+        self, track: TrackKey, lrclib_source: LrcLibSource
+    ) -> list[SearchResult]:
+        """
+        Автоматический поиск при отсутствии точного совпадения.
+        Без ответа от lrclib бросает SourceUnavailable (не путать с «не найдено»).
+        """
         query = f"{track.artist} {track.title}".strip()
         if not query:
             return []
 
-        results = self.search(q=query, track_name=track.title, artist_name=track.artist)
+        results = lrclib_source.search_checked(
+            q=query, track_name=track.title, artist_name=track.artist
+        )
 
         # Если нет результатов и исполнителей несколько (через ",") — ищем по каждому
         if not results and "," in (track.artist or ""):
@@ -110,7 +409,9 @@ class LyricsService:
             seen_ids: set[int | None] = set()
             for artist in artists:
                 sub_query = f"{artist} {track.title}".strip()
-                sub_results = self.search(q=sub_query, track_name=track.title, artist_name=artist)
+                sub_results = lrclib_source.search_checked(
+                    q=sub_query, track_name=track.title, artist_name=artist
+                )
                 for r in sub_results:
                     if r.id not in seen_ids:
                         seen_ids.add(r.id)
@@ -183,7 +484,9 @@ class LyricsService:
             return None
 
         # Используем найденные artist/title для обычного fetch
-        track = TrackKey(artist=result.artist_name, title=result.track_name, album=result.album_name)
+        track = TrackKey(
+            artist=result.artist_name, title=result.track_name, album=result.album_name
+        )
         for src in self.sources:
             if isinstance(src, LrcLibSource):
                 fetch_res = src.fetch(track)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Callable, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_POLL_INTERVAL_S = 0.1
+
+
+class SingleFlight(Generic[T]):
+    """
+    Run at most one resolution per key, across threads and processes.
+
+    In-process callers share a Future. Across processes a POSIX byte-range
+    lock on `lock_path` acts as a lease: the offset is derived from the key,
+    so one small file serves every key. Whoever cannot take the lease polls
+    `ready()` (usually "was the cache written since I started waiting?") until
+    the owner finishes or `wait_timeout_s` runs out, then resolves itself.
+    """
+
+    def __init__(self, lock_path: Path, *, wait_timeout_s: float):
+        self.lock_path = lock_path
+        self.wait_timeout_s = wait_timeout_s
+        self._inflight: dict[str, Future[T]] = {}
+        self._lock = threading.Lock()
+        self._fd: int | None = None
+
+    def do(self, key: str, fn: Callable[[], T], *, ready: Callable[[], T | None]) -> T:
+        with self._lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if fut is None:
+                fut = Future()
+                self._inflight[key] = fut
+
+        if not leader:
+            try:
+                return fut.result(timeout=self.wait_timeout_s)
+            except FutureTimeout:
+                logger.debug("single-flight: in-process wait timed out for %s", key)
+                return fn()
+
+        try:
+            result = self._run_leased(key, fn, ready)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _run_leased(self, key: str, fn: Callable[[], T], ready: Callable[[], T | None]) -> T:
+        fd = self._lock_fd()
+        if fd is None:
+            return fn()
+        offset = int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:4], "big") >> 1
+
+        deadline = time.monotonic() + self.wait_timeout_s
+        while True:
+            try:
+                fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, offset)
+            except OSError:
+                # another process owns the lease: wait for its result in the cache
+                if time.monotonic() >= deadline:
+                    logger.debug("single-flight: lease wait timed out for %s", key)
+                    return fn()
+                time.sleep(_POLL_INTERVAL_S)
+                result = ready()
+                if result is not None:
+                    return result
+                continue
+
+            try:
+                # double-check: the previous owner may have just finished
+                result = ready()
+                return result if result is not None else fn()
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN, 1, offset)
+
+    def _lock_fd(self) -> int | None:
+        # One fd for the whole process: closing any fd of a file drops all of
+        # the process' POSIX locks on it, so it stays open until exit.
+        with self._lock:
+            if self._fd is None:
+                try:
+                    self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+                except OSError as e:
+                    logger.debug("single-flight: lock file unavailable (%s), running unlocked", e)
+                    return None
+            return self._fd
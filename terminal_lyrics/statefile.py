@@ -0,0 +1,217 @@
+"""
+Current-line state in a small memory-mapped file, for widgets that can only
+poll a file.
+
+The watcher (`watch --publish-state` or the daemon) rewrites the file in place
+on every change; a consumer polling it at 10 Hz costs one `read` per poll,
+no process, no D-Bus and no cache lookup. The file is exactly SIZE bytes,
+little-endian:
+
+    offset  size  field
+    0       8     generation (u64), written last
+    8       4     magic b"TLST"
+    12      2     layout version (1)
+    14      2     flags: 1 = synced lyrics, 2 = paused, 4 = notice (text is a status message)
+    16      8     updated_ms: wall clock of the last change (Unix ms)
+    24      8     next_deadline_ms: wall clock when the next line starts (0 = unknown / paused / last line)
+    32      4     line index (i32, -1 = before the first line)
+    36      2     track length in bytes (u16)
+    38      2     text length in bytes (u16)
+    40      ...   track ("Artist - Title", UTF-8), then the line text (UTF-8)
+    SIZE-8  8     generation again (u64), written first
+
+Consistency without locks: a writer stores the generation at the end of the
+file first, then everything in between, then the generation at offset 0. A
+reader that copies the file front to back (one `read`, or `read_state`) got
+a consistent snapshot exactly when both generations are equal, and simply
+retries otherwise.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from terminal_lyrics.events import Event, LineChanged, Notice, PlaybackChanged, Seeked, TrackChanged
+
+MAGIC = b"TLST"
+VERSION = 1
+SIZE = 4096
+
+FLAG_SYNCED = 1
+FLAG_PAUSED = 2
+FLAG_NOTICE = 4
+
+_GEN = struct.Struct("<Q")
+# after the leading generation
+_HEADER = struct.Struct("<4sHHqqiHH")
+_PAYLOAD = _GEN.size + _HEADER.size
+_GEN_END = SIZE - _GEN.size
+_MAX_PAYLOAD = _GEN_END - _PAYLOAD
+
+
+def default_state_path() -> Path:
+    runtime = os.getenv("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime) / "terminal-lyrics.state"
+    return Path(tempfile.gettempdir()) / f"terminal-lyrics-{os.getuid()}.state"
+
+
+def _cut(data: bytes, limit: int) -> bytes:
+    """At most `limit` bytes of UTF-8 `data`, not splitting a character."""
+    if len(data) <= limit:
+        return data
+    return data[:limit].decode("utf-8", "ignore").encode("utf-8")
+
+
+@dataclass(frozen=True, slots=True)
+class State:
+    generation: int
+    flags: int
+    updated_ms: int
+    next_deadline_ms: int
+    index: int
+    track: str
+    text: str
+
+    @property
+    def synced(self) -> bool:
+        return bool(self.flags & FLAG_SYNCED)
+
+    @property
+    def paused(self) -> bool:
+        return bool(self.flags & FLAG_PAUSED)
+
+    @property
+    def notice(self) -> bool:
+        return bool(self.flags & FLAG_NOTICE)
+
+
+def parse_state(buf: bytes) -> State | None:
+    """State from a full copy of the file, None if the copy is torn or not a state file."""
+    if len(buf) < SIZE:
+        return None
+    gen = _GEN.unpack_from(buf)[0]
+    if _GEN.unpack_from(buf, _GEN_END)[0] != gen:
+        return None
+    magic, version, flags, updated, deadline, index, track_len, text_len = _HEADER.unpack_from(buf, _GEN.size)
+    if magic != MAGIC or version != VERSION:
+        return None
+    start = _PAYLOAD
+    track = buf[start : start + track_len].decode("utf-8", "replace")
+    text = buf[start + track_len : start + track_len + text_len].decode("utf-8", "replace")
+    return State(gen, flags, updated, deadline, index, track, text)
+
+
+def read_state(path: Path, retries: int = 100) -> State | None:
+    """
+    Consistent snapshot of the state file, None when there is no watcher
+    publishing one. Retries while a write is in progress.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return None
+    try:
+        for _ in range(retries):
+            state = parse_state(os.pread(fd, SIZE, 0))
+            if state is not None:
+                return state
+            time.sleep(0.0005)
+    finally:
+        os.close(fd)
+    return None
+
+
+class StateFileSink:
+    """Publishes the current line to a memory-mapped state file (see module docstring)."""
+
+    def __init__(self, path: Path, clock=time.time):
+        self.path = path
+        self._clock = clock
+        self._mm: mmap.mmap | None = None
+        self._gen = 0
+        self._flags = 0
+        self._index = -1
+        self._track = b""
+        self._text = b""
+        self._next_t_ms: int | None = None
+
+    def enter(self) -> None:
+        if self._mm is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # full-size file renamed into place: readers never see a short one
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".tl-state-")
+        try:
+            os.ftruncate(fd, SIZE)
+            self._mm = mmap.mmap(fd, SIZE)
+        finally:
+            os.close(fd)
+        self._write(0)
+        os.replace(tmp, self.path)
+
+    def exit(self) -> None:
+        if self._mm is None:
+            return
+        self._mm.close()
+        self._mm = None
+        self.path.unlink(missing_ok=True)
+
+    def emit(self, event: Event) -> None:
+        now_ms = int(self._clock() * 1000)
+        deadline = 0
+        if isinstance(event, LineChanged):
+            self._index = event.index
+            self._text = event.text.encode("utf-8")
+            self._next_t_ms = event.next_t_ms
+            deadline = self._deadline(now_ms, event.pos_ms)
+        elif isinstance(event, TrackChanged):
+            self._flags = FLAG_SYNCED if event.synced else 0
+            self._track = event.display.encode("utf-8")
+            self._index = -1
+            self._text = b""
+            self._next_t_ms = event.times[0] if event.times else None
+        elif isinstance(event, PlaybackChanged):
+            if event.status == "Playing":
+                self._flags &= ~FLAG_PAUSED
+                deadline = self._deadline(now_ms, event.pos_ms)
+            else:
+                self._flags |= FLAG_PAUSED
+        elif isinstance(event, Seeked):
+            deadline = self._deadline(now_ms, event.pos_ms)
+        elif isinstance(event, Notice):
+            self._flags = FLAG_NOTICE
+            self._track = b""
+            self._index = -1
+            self._text = event.text.encode("utf-8")
+            self._next_t_ms = None
+        else:
+            return
+        self._write(now_ms, deadline)
+
+    def _deadline(self, now_ms: int, pos_ms: int) -> int:
+        if self._next_t_ms is None or self._flags & FLAG_PAUSED:
+            return 0
+        return now_ms + max(self._next_t_ms - pos_ms, 0)
+
+    def _write(self, now_ms: int, deadline_ms: int = 0) -> None:
+        mm = self._mm
+        if mm is None:
+            return
+        track = _cut(self._track, _MAX_PAYLOAD // 4)
+        text = _cut(self._text, _MAX_PAYLOAD - len(track))
+        self._gen += 1
+        gen = self._gen
+        # end generation first, leading generation last (see module docstring)
+        _GEN.pack_into(mm, _GEN_END, gen)
+        _HEADER.pack_into(
+            mm, _GEN.size, MAGIC, VERSION, self._flags, now_ms, deadline_ms, self._index, len(track), len(text)
+        )
+        mm[_PAYLOAD : _PAYLOAD + len(track) + len(text)] = track + text
+        _GEN.pack_into(mm, 0, gen)
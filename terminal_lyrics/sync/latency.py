@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class LatencyCompensator:
+    """
+    Estimates how far the screen lags behind the player and leads the
+    position by that much.
+
+    A position read over D-Bus describes the moment the player answered,
+    roughly the middle of the call, and the line it selects only becomes
+    visible once the frame is written. So the effective position is the
+    reported one plus half the round trip plus the render time, both
+    smoothed with an EWMA and capped at `max_lead_ms` so one slow call can't
+    make lines jump ahead. The third delay, waiting for the next tick, is
+    removed by `sleep_s`, which wakes up at the next line boundary.
+
+    Lateness of every line change (position on screen minus the LRC
+    timestamp, negative = early) is kept in a bounded window for percentiles.
+    """
+
+    max_lead_ms: float = 150.0
+    alpha: float = 0.2
+    window: int = 256
+    half_rtt_ms: float = 0.0
+    render_ms: float = 0.0
+    _samples: deque[float] = field(init=False, repr=False)
+    _last_effective_ms: int | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._samples = deque(maxlen=self.window)
+
+    @property
+    def lead_ms(self) -> float:
+        if self.max_lead_ms <= 0:
+            return 0.0
+        return min(self.half_rtt_ms + self.render_ms, self.max_lead_ms)
+
+    def observe_call(self, before_s: float, after_s: float) -> None:
+        """Timestamps (perf_counter) taken around a position_ms() call."""
+        self.half_rtt_ms += self.alpha * ((after_s - before_s) * 500.0 - self.half_rtt_ms)
+
+    def observe_render(self, duration_s: float) -> None:
+        self.render_ms += self.alpha * (duration_s * 1000.0 - self.render_ms)
+
+    def effective_ms(self, pos_ms: int) -> int:
+        return pos_ms + round(self.lead_ms)
+
+    def record_line(self, line_t_ms: int, pos_ms: int, sampled_s: float, drawn_s: float) -> float:
+        """
+        Lateness of a line drawn at `drawn_s` from a position sampled at
+        `sampled_s` (the middle of the D-Bus call), in ms.
+        """
+        lateness = pos_ms + (drawn_s - sampled_s) * 1000.0 - line_t_ms
+        self._samples.append(lateness)
+        return lateness
+
+    def sleep_s(self, tick_s: float, effective_ms: int, next_boundary_ms: int | None, min_s: float = 0.001) -> float:
+        """
+        Regular tick, cut short to wake up when the next line is due. A
+        position that did not move since the last call (paused player) gets
+        the regular tick, otherwise a pause just before a boundary would spin.
+        """
+        last, self._last_effective_ms = self._last_effective_ms, effective_ms
+        if next_boundary_ms is None or effective_ms == last:
+            return tick_s
+        return min(tick_s, max((next_boundary_ms - effective_ms) / 1000.0, min_s))
+
+    def percentiles(self) -> tuple[float, float, float] | None:
+        """(p50, p90, p99) lateness in ms over the window, None with < 2 samples."""
+        if len(self._samples) < 2:
+            return None
+        # deferred: statistics costs several ms of import time on the watch startup path
+        from statistics import quantiles
+
+        q = quantiles(self._samples, n=100, method="inclusive")
+        return q[49], q[89], q[98]
+
+    @property
+    def samples(self) -> int:
+        return len(self._samples)
@@ -0,0 +1,130 @@
+"""
+Batch timeline sampling: active line for many positions at once (e.g. every
+frame of a lyric video). Uses NumPy `searchsorted` over the document's
+timestamp column when available (`pip install terminal-lyrics[numpy]`),
+otherwise a linear merge for sorted positions / bisect per position.
+"""
+
+from __future__ import annotations
+
+import csv
+from array import array
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Any, Sequence, TextIO
+
+np: Any
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    # batch results: an ndarray with NumPy, an int array without
+    IntArray = array[int] | NDArray[Any]
+
+
+def frame_positions(duration_ms: int, fps: float, start_ms: int = 0) -> IntArray:
+    """Position (ms) of every frame in `[start_ms, start_ms + duration_ms)`."""
+    if fps <= 0:
+        raise ValueError(f"fps must be positive: {fps}")
+    n = max(int(duration_ms * fps / 1000.0), 0)
+    step = 1000.0 / fps
+    if np is not None:
+        return (np.arange(n, dtype=np.float64) * step).astype(np.int64) + start_ms
+    return array("q", [start_ms + int(i * step) for i in range(n)])
+
+
+def sample_indices(times: Sequence[int], positions_ms: Sequence[int] | IntArray) -> IntArray:
+    """
+    Line index for each position, same semantics as LineTracker.current_index
+    (-1 before the first line). `times` must be sorted; an `array('i')`
+    column is used by NumPy without copying.
+    """
+    if np is not None:
+        if isinstance(times, array):
+            t = np.frombuffer(times, dtype=np.dtype(times.typecode)) if len(times) else np.empty(0)
+        else:
+            t = np.asarray(times, dtype=np.int64)
+        return np.searchsorted(t, np.asarray(positions_ms), side="right") - 1
+    return _sample_indices_py(times, positions_ms)
+
+
+def _sample_indices_py(times: Sequence[int], positions_ms: Sequence[int] | IntArray) -> array[int]:
+    out = array("i", bytes(4 * len(positions_ms)))
+    n = len(times)
+    i = -1
+    prev = None
+    for k, pos in enumerate(positions_ms):
+        if prev is not None and pos < prev:
+            # unsorted input: no cursor to reuse
+            i = bisect_right(times, pos) - 1
+        else:
+            while i + 1 < n and times[i + 1] <= pos:
+                i += 1
+        out[k] = i
+        prev = pos
+    return out
+
+
+def runs(indices: Sequence[int] | IntArray) -> list[tuple[int, int, int]]:
+    """Run-length encode: (first sample, end sample exclusive, line index)."""
+    n = len(indices)
+    if not n:
+        return []
+    if np is not None:
+        idx = np.asarray(indices)
+        starts = np.concatenate(([0], np.flatnonzero(idx[1:] != idx[:-1]) + 1))
+        ends = np.concatenate((starts[1:], [n]))
+        return list(zip(starts.tolist(), ends.tolist(), idx[starts].tolist()))
+    out: list[tuple[int, int, int]] = []
+    start = 0
+    for k in range(1, n):
+        if indices[k] != indices[k - 1]:
+            out.append((start, k, indices[start]))
+            start = k
+    out.append((start, n, indices[start]))
+    return out
+
+
+def write_frames_csv(
+    out: TextIO, positions_ms: Sequence[int] | IntArray, indices: Sequence[int] | IntArray
+) -> None:
+    out.write("frame,t_ms,line\n")
+    if np is not None:
+        positions_ms = np.asarray(positions_ms).tolist()
+        indices = np.asarray(indices).tolist()
+    chunk = 65536
+    for base in range(0, len(indices), chunk):
+        out.write(
+            "".join(
+                f"{base + k},{t},{i}\n"
+                for k, (t, i) in enumerate(
+                    zip(positions_ms[base : base + chunk], indices[base : base + chunk])
+                )
+            )
+        )
+
+
+def write_runs_csv(
+    out: TextIO,
+    positions_ms: Sequence[int] | IntArray,
+    indices: Sequence[int] | IntArray,
+    texts: Sequence[str],
+    end_ms: int,
+) -> None:
+    w = csv.writer(out, lineterminator="\n")
+    w.writerow(("start_frame", "end_frame", "start_ms", "end_ms", "line", "text"))
+    n = len(positions_ms)
+    for start, end, idx in runs(indices):
+        w.writerow(
+            (
+                start,
+                end,
+                int(positions_ms[start]),
+                int(positions_ms[end]) if end < n else end_ms,
+                idx,
+                texts[idx] if idx >= 0 else "",
+            )
+        )
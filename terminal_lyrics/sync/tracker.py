@@ -1,20 +1,47 @@
 from __future__ import annotations
 
 from bisect import bisect_right
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Sequence
 
-from terminal_lyrics.lrc.model import LyricEvent
+from terminal_lyrics.lrc.model import LrcDocument, LyricEvent, WordTimings
+
+if TYPE_CHECKING:
+    from terminal_lyrics.sync.timeline import IntArray
+
+# line boundaries the cursor walks over in one lookup before it bisects
+CURSOR_SCAN = 8
 
 
 @dataclass(slots=True)
 class LineTracker:
     """
-    Efficient lookup: O(log n) via bisect + update only on change.
+    Efficient lookup: amortized O(1) cursor + update only on change.
+
+    Playback position almost always moves forward by a line or less per
+    tick, so with `use_cursor` the tracker walks forward from the current
+    line over the boundaries already passed, at most `CURSOR_SCAN` of them
+    (equal timestamps of bilingual LRC, dense lines at a low refresh rate).
+    A backward jump or a forward one further than that falls back to
+    O(log n) bisect and is counted in `seeks`.
+
+    `t_ms` / `texts` may be the columns of an LrcDocument (see from_document),
+    in which case tracker, renderer and document share the same memory.
+    With `words` (enhanced LRC) `highlight_pos` adds an O(log w) lookup of
+    the sung part of the current line.
     """
 
-    t_ms: list[int]
-    texts: list[str]
+    t_ms: Sequence[int]
+    texts: Sequence[str]
     last_idx: int = -1
+    use_cursor: bool = True
+    seeks: int = 0
+    words: WordTimings | None = None
+    _cursor: int = field(default=-1, init=False, repr=False)
+
+    @classmethod
+    def from_document(cls, doc: LrcDocument) -> "LineTracker":
+        return cls(t_ms=doc.times, texts=doc.texts, words=doc.words)
 
     @classmethod
     def from_events(cls, events: tuple[LyricEvent, ...]) -> "LineTracker":
@@ -23,8 +50,48 @@ class LineTracker:
         return cls(t_ms=t_ms, texts=texts)
 
     def current_index(self, now_ms: int) -> int:
-        i = bisect_right(self.t_ms, now_ms) - 1
-        return i if i >= 0 else -1
+        t = self.t_ms
+        i = self._cursor
+        if self.use_cursor and (i < 0 or t[i] <= now_ms):
+            n = len(t)
+            j = i + 1
+            if j >= n or now_ms < t[j]:
+                return i
+            end = min(j + CURSOR_SCAN, n)
+            j += 1
+            while j < end and t[j] <= now_ms:
+                j += 1
+            if j < end or j == n:
+                self._cursor = j - 1
+                return j - 1
+            self.seeks += 1
+        elif self.use_cursor:
+            self.seeks += 1
+
+        i = bisect_right(t, now_ms) - 1
+        if i < 0:
+            i = -1
+        self._cursor = i
+        return i
+
+    def next_boundary_ms(self) -> int | None:
+        """Start of the line after the last looked-up one (None after the last line)."""
+        j = self._cursor + 1
+        return self.t_ms[j] if j < len(self.t_ms) else None
+
+    def highlight_pos(self, now_ms: int) -> int:
+        """Characters of the current line sung at `now_ms` (0 without word timings)."""
+        i = self.current_index(now_ms)
+        if self.words is None or i < 0:
+            return 0
+        return self.words.highlight_pos(i, now_ms - self.t_ms[i], len(self.texts[i]))
+
+    def indices_at(self, positions_ms: Sequence[int] | IntArray) -> IntArray:
+        """Batch lookup for many positions (see sync.timeline.sample_indices)."""
+        # deferred: keeps the optional numpy import out of the watch path
+        from terminal_lyrics.sync.timeline import sample_indices
+
+        return sample_indices(self.t_ms, positions_ms)
 
     def changed_index(self, now_ms: int) -> int | None:
         i = self.current_index(now_ms)
@@ -32,4 +99,3 @@ class LineTracker:
             self.last_idx = i
             return i
         return None
-
@@ -0,0 +1,269 @@
+"""
+Local stand-in for lrclib.net and api.lyrics.ovh with fault injection.
+
+    python -m tests.mocks.lyrics_server [--port 8765] [--tracks 500]
+        [--latency lognormal:120:0.5] [--error-rate 0.05] [--rate-limit-rate 0.02]
+        [--timeout-rate 0.01] [--hang-s 30]
+
+then point the app at it:
+
+    TERMINAL_LYRICS_LRCLIB_URL=http://127.0.0.1:8765 TERMINAL_LYRICS_LYRICS_OVH_URL=http://127.0.0.1:8765 ...
+
+Endpoints: `/api/get`, `/api/search` (lrclib) and `/v1/<artist>/<title>`
+(lyrics.ovh), served from a seed dataset. Every request first waits for a
+latency drawn from `--latency`, then may fail: hang for `--hang-s` (client
+timeout), answer 429 with Retry-After, or answer 500.
+
+Latency specs: "0", "<ms>", "uniform:<lo>:<hi>", "lognormal:<median_ms>:<sigma>".
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Latency spec -> sampler returning milliseconds."""
+    kind, _, rest = spec.partition(":")
+    if not rest:
+        fixed = float(kind)
+        return lambda rnd: fixed
+    args = [float(x) for x in rest.split(":")]
+    if kind == "uniform":
+        lo, hi = args
+        return lambda rnd: rnd.uniform(lo, hi)
+    if kind == "lognormal":
+        median, sigma = args
+        mu = math.log(median)
+        return lambda rnd: rnd.lognormvariate(mu, sigma)
+    raise ValueError(f"Unknown latency spec: {spec}")
+
+
+def seed_dataset(n_tracks: int = 200, seed: int = 0) -> list[dict[str, Any]]:
+    """
+    Deterministic lrclib-style records "Artist <a>" / "Song <i>" / "Album <b>";
+    every 5th track has plain lyrics only, every 7th is instrumental.
+    """
+    rnd = random.Random(seed)
+    words = ("light", "road", "dream", "fall", "fire", "again", "home", "you", "ночь", "город")
+    out = []
+    for i in range(n_tracks):
+        lines = [" ".join(rnd.choice(words) for _ in range(rnd.randint(3, 8))) for _ in range(40)]
+        synced = "\n".join(
+            f"[{(5_000 + j * 3_500) // 60_000:02d}:{(5_000 + j * 3_500) // 1000 % 60:02d}.00]{text}"
+            for j, text in enumerate(lines)
+        )
+        instrumental = i % 7 == 6
+        out.append(
+            {
+                "id": 1000 + i,
+                "trackName": f"Song {i}",
+                "artistName": f"Artist {i % 40}",
+                "albumName": f"Album {i // 10}",
+                "duration": 150.0 + i % 90,
+                "instrumental": instrumental,
+                "plainLyrics": None if instrumental else "\n".join(lines),
+                "syncedLyrics": None if instrumental or i % 5 == 4 else synced,
+            }
+        )
+    return out
+
+
+@dataclass
+class Faults:
+    latency: str = "0"
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    timeout_rate: float = 0.0
+    hang_s: float = 30.0
+
+
+class LyricsServer:
+    """Threaded fixture server; `stats` counts requests per endpoint and injected faults."""
+
+    def __init__(
+        self,
+        dataset: list[dict[str, Any]] | None = None,
+        *,
+        faults: Faults | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+    ):
+        self.dataset = dataset if dataset is not None else seed_dataset()
+        self.faults = faults or Faults()
+        self.stats: Counter = Counter()
+        self._rnd = random.Random(seed)
+        self._rnd_lock = threading.Lock()
+        self._latency = parse_latency(self.faults.latency)
+        self._by_key = {(r["artistName"].lower(), r["trackName"].lower()): r for r in self.dataset}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="lyrics-server", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "LyricsServer":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def set_faults(self, faults: Faults) -> None:
+        self.faults = faults
+        self._latency = parse_latency(faults.latency)
+
+    # --- request handling ----------------------------------------------------
+
+    def _draw(self) -> tuple[float, float]:
+        with self._rnd_lock:
+            return self._latency(self._rnd), self._rnd.random()
+
+    def _fault(self) -> tuple[int, dict[str, str]] | str | None:
+        """Sleep the drawn latency; return an injected fault, if any."""
+        latency_ms, roll = self._draw()
+        if latency_ms > 0:
+            time.sleep(latency_ms / 1000.0)
+        f = self.faults
+        if roll < f.timeout_rate:
+            return "hang"
+        roll -= f.timeout_rate
+        if roll < f.rate_limit_rate:
+            return 429, {"Retry-After": "1"}
+        roll -= f.rate_limit_rate
+        if roll < f.error_rate:
+            return 500, {}
+        return None
+
+    def _get(self, q: dict[str, str]) -> tuple[int, Any]:
+        rec = self._by_key.get((q.get("artist_name", "").lower(), q.get("track_name", "").lower()))
+        album = q.get("album_name", "")
+        if rec is None or (album and rec["albumName"].lower() != album.lower()):
+            return 404, {"code": 404, "name": "TrackNotFound", "message": "Failed to find specified track"}
+        return 200, rec
+
+    def _search(self, q: dict[str, str]) -> tuple[int, Any]:
+        if not q.get("q") and not q.get("track_name"):
+            return 400, {"code": 400, "name": "BadRequest", "message": "q or track_name is required"}
+
+        def matches(rec: dict[str, Any]) -> bool:
+            hay = f"{rec['trackName']} {rec['artistName']} {rec['albumName']}".lower()
+            checks = (
+                (q.get("q"), hay),
+                (q.get("track_name"), rec["trackName"].lower()),
+                (q.get("artist_name"), rec["artistName"].lower()),
+                (q.get("album_name"), rec["albumName"].lower()),
+            )
+            return all(needle.lower() in field for needle, field in checks if needle)
+
+        return 200, [rec for rec in self.dataset if matches(rec)][:20]
+
+    def _ovh(self, artist: str, title: str) -> tuple[int, Any]:
+        rec = self._by_key.get((artist.lower(), title.lower()))
+        if rec is None or not rec["plainLyrics"]:
+            return 404, {"error": "No lyrics found"}
+        return 200, {"lyrics": rec["plainLyrics"]}
+
+    def _route(self, path: str, q: dict[str, str]) -> tuple[str, tuple[int, Any]]:
+        if path == "/api/get":
+            return "get", self._get(q)
+        if path == "/api/search":
+            return "search", self._search(q)
+        parts = path.split("/")
+        if len(parts) == 4 and parts[1] == "v1":
+            return "ovh", self._ovh(unquote(parts[2]), unquote(parts[3]))
+        return "unknown", (404, {"error": "Not found"})
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                url = urlsplit(self.path)
+                q = {k: v[0] for k, v in parse_qs(url.query).items()}
+                endpoint, (status, body) = server._route(url.path, q)
+                server.stats[endpoint] += 1
+
+                fault = server._fault()
+                headers: dict[str, str] = {}
+                if fault == "hang":
+                    server.stats["fault_timeout"] += 1
+                    time.sleep(server.faults.hang_s)
+                    return
+                if fault is not None:
+                    status, headers = fault  # type: ignore[misc]
+                    server.stats[f"fault_{status}"] += 1
+                    body = {"code": status, "name": "Injected", "message": "injected fault"}
+
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    for k, v in headers.items():
+                        self.send_header(k, v)
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--tracks", type=int, default=200)
+    ap.add_argument("--dataset", help="JSON list of lrclib records instead of the seed dataset")
+    ap.add_argument("--latency", default="0")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--rate-limit-rate", type=float, default=0.0)
+    ap.add_argument("--timeout-rate", type=float, default=0.0)
+    ap.add_argument("--hang-s", type=float, default=30.0)
+    args = ap.parse_args()
+
+    if args.dataset:
+        with open(args.dataset, encoding="utf-8") as f:
+            dataset = json.load(f)
+    else:
+        dataset = seed_dataset(args.tracks)
+    faults = Faults(args.latency, args.error_rate, args.rate_limit_rate, args.timeout_rate, args.hang_s)
+    server = LyricsServer(dataset, faults=faults, host=args.host, port=args.port)
+    print(f"serving {len(dataset)} tracks on {server.url}", flush=True)
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
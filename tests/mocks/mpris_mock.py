@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Callable
 import time
 
-from terminal_lyrics.mpris.client import TrackInfo
+from terminal_lyrics.mpris.types import TrackInfo
 from terminal_lyrics.mpris.errors import NoPlayersFound
 
 
@@ -15,6 +15,9 @@ class MockMprisClient:
     - playback_status: "Playing", "Paused", "Stopped"
     - metadata: track info dict
     - position_ms: current position (can be auto-incremented)
+
+    `clock` drives auto-advance (default: wall time); pass a virtual clock to
+    simulate hours of playback instantly.
     """
     
     def __init__(
@@ -25,8 +28,10 @@ class MockMprisClient:
         position_ms: int = 0,
         auto_advance: bool = False,
         auto_advance_rate_ms_per_sec: float = 1000.0,
+        clock: Callable[[], float] = time.time,
     ):
         self.service_name = service_name
+        self._clock = clock
         self.auto_advance = auto_advance
         self.auto_advance_rate_ms_per_sec = float(auto_advance_rate_ms_per_sec)
 
@@ -44,8 +49,8 @@ class MockMprisClient:
     def _update_position(self) -> None:
         if self.auto_advance and self._playback_status.lower() == "playing":
             if self._start_time is None:
-                self._start_time = time.time()
-            elapsed = time.time() - self._start_time
+                self._start_time = self._clock()
+            elapsed = self._clock() - self._start_time
             self._position_ms = int(elapsed * self.auto_advance_rate_ms_per_sec)
     
     @staticmethod
@@ -98,7 +103,7 @@ class MockMprisClient:
     def seek(self, position_ms: int) -> None:
         """Seek to position."""
         self._position_ms = max(0, int(position_ms))
-        self._start_time = time.time() - (position_ms / self.auto_advance_rate_ms_per_sec)
+        self._start_time = self._clock() - (position_ms / self.auto_advance_rate_ms_per_sec)
     
     def pause(self) -> None:
         """Pause playback."""
@@ -109,5 +114,5 @@ class MockMprisClient:
         """Resume playback."""
         self._update_position()
         self._playback_status = "Playing"
-        if self._start_time is None:
-            self._start_time = time.time() - (self._position_ms / self.auto_advance_rate_ms_per_sec)
+        # continue from where it was paused, not from the original start
+        self._start_time = self._clock() - (self._position_ms / self.auto_advance_rate_ms_per_sec)
@@ -0,0 +1,186 @@
+"""
+Stand-in MPRIS players on a real (private) D-Bus session bus.
+
+    DBUS_SESSION_BUS_ADDRESS=... python -m tests.mocks.mpris_service --players 24 --playing 3
+
+Each player gets its own bus connection, owns `org.mpris.MediaPlayer2.fake<N>`
+and serves `/org/mpris/MediaPlayer2` with the Properties and Player
+interfaces (Get/GetAll, PropertiesChanged, Seeked, Play/Pause/Seek/...).
+Tests script players over the extra `org.terminal_lyrics.FakePlayer`
+interface (SetTrack, SetStatus, SetPositionUs), which emits the same
+signals a real player would. Prints "ready" once all names are owned.
+
+Needs dbus-python and PyGObject (GLib main loop).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+import dbus
+import dbus.bus
+import dbus.exceptions
+import dbus.service
+from dbus.mainloop.glib import DBusGMainLoop
+from gi.repository import GLib
+
+MPRIS_PATH = "/org/mpris/MediaPlayer2"
+ROOT_IFACE = "org.mpris.MediaPlayer2"
+PLAYER_IFACE = "org.mpris.MediaPlayer2.Player"
+CONTROL_IFACE = "org.terminal_lyrics.FakePlayer"
+NAME_PREFIX = "org.mpris.MediaPlayer2.fake"
+
+
+class FakePlayer(dbus.service.Object):
+    def __init__(self, conn: dbus.bus.BusConnection, index: int, status: str):
+        self.index = index
+        self.bus_name = dbus.service.BusName(f"{NAME_PREFIX}{index}", conn)
+        super().__init__(conn, MPRIS_PATH)
+        self._status = status
+        self._pos_us = 0
+        self._anchor = time.monotonic()
+        self._track_no = 0
+        self._metadata = self._track_metadata(f"Song {index}", f"Artist {index}", "Fake Album")
+
+    def _track_metadata(self, title: str, artist: str, album: str) -> dbus.Dictionary:
+        self._track_no += 1
+        return dbus.Dictionary(
+            {
+                "mpris:trackid": dbus.ObjectPath(f"/org/terminal_lyrics/track/{self.index}/{self._track_no}"),
+                "mpris:length": dbus.Int64(240_000_000),
+                "xesam:title": dbus.String(title),
+                "xesam:artist": dbus.Array([dbus.String(artist)], signature="s"),
+                "xesam:album": dbus.String(album),
+            },
+            signature="sv",
+        )
+
+    def _position_us(self) -> int:
+        if self._status == "Playing":
+            return self._pos_us + int((time.monotonic() - self._anchor) * 1_000_000)
+        return self._pos_us
+
+    def _set_position(self, pos_us: int) -> None:
+        self._pos_us = max(int(pos_us), 0)
+        self._anchor = time.monotonic()
+        self.Seeked(dbus.Int64(self._pos_us))
+
+    def _props(self, iface: str) -> dict[str, object]:
+        if iface == ROOT_IFACE:
+            return {
+                "Identity": dbus.String(f"Fake Player {self.index}"),
+                "CanQuit": False,
+                "CanRaise": False,
+                "HasTrackList": False,
+                "SupportedUriSchemes": dbus.Array([], signature="s"),
+                "SupportedMimeTypes": dbus.Array([], signature="s"),
+            }
+        if iface == PLAYER_IFACE:
+            return {
+                "PlaybackStatus": dbus.String(self._status),
+                "Metadata": self._metadata,
+                "Position": dbus.Int64(self._position_us()),
+                "Rate": dbus.Double(1.0),
+                "CanSeek": True,
+                "CanPlay": True,
+                "CanPause": True,
+                "CanControl": True,
+            }
+        raise dbus.exceptions.DBusException(
+            f"No such interface: {iface}", name="org.freedesktop.DBus.Error.UnknownInterface"
+        )
+
+    def _changed(self, **props: object) -> None:
+        self.PropertiesChanged(PLAYER_IFACE, dbus.Dictionary(props, signature="sv"), dbus.Array([], signature="s"))
+
+    # --- org.freedesktop.DBus.Properties ---------------------------------
+
+    @dbus.service.method(dbus.PROPERTIES_IFACE, in_signature="ss", out_signature="v")
+    def Get(self, iface: str, prop: str):
+        props = self._props(iface)
+        if prop not in props:
+            raise dbus.exceptions.DBusException(
+                f"No such property: {prop}", name="org.freedesktop.DBus.Error.UnknownProperty"
+            )
+        return props[prop]
+
+    @dbus.service.method(dbus.PROPERTIES_IFACE, in_signature="s", out_signature="a{sv}")
+    def GetAll(self, iface: str):
+        return self._props(iface)
+
+    @dbus.service.signal(dbus.PROPERTIES_IFACE, signature="sa{sv}as")
+    def PropertiesChanged(self, iface, changed, invalidated):
+        pass
+
+    # --- org.mpris.MediaPlayer2.Player -------------------------------------
+
+    @dbus.service.signal(PLAYER_IFACE, signature="x")
+    def Seeked(self, position):
+        pass
+
+    @dbus.service.method(PLAYER_IFACE)
+    def Play(self):
+        self.SetStatus("Playing")
+
+    @dbus.service.method(PLAYER_IFACE)
+    def Pause(self):
+        self.SetStatus("Paused")
+
+    @dbus.service.method(PLAYER_IFACE)
+    def PlayPause(self):
+        self.SetStatus("Paused" if self._status == "Playing" else "Playing")
+
+    @dbus.service.method(PLAYER_IFACE)
+    def Stop(self):
+        self.SetStatus("Stopped")
+        self._set_position(0)
+
+    @dbus.service.method(PLAYER_IFACE, in_signature="x")
+    def Seek(self, offset_us):
+        self._set_position(self._position_us() + int(offset_us))
+
+    @dbus.service.method(PLAYER_IFACE, in_signature="ox")
+    def SetPosition(self, track_id, position_us):
+        self._set_position(int(position_us))
+
+    # --- test scripting ------------------------------------------------------
+
+    @dbus.service.method(CONTROL_IFACE, in_signature="sss")
+    def SetTrack(self, title, artist, album):
+        self._metadata = self._track_metadata(str(title), str(artist), str(album))
+        self._pos_us = 0
+        self._anchor = time.monotonic()
+        self._changed(Metadata=self._metadata)
+
+    @dbus.service.method(CONTROL_IFACE, in_signature="s")
+    def SetStatus(self, status):
+        self._pos_us = self._position_us()
+        self._anchor = time.monotonic()
+        self._status = str(status)
+        self._changed(PlaybackStatus=dbus.String(self._status))
+
+    @dbus.service.method(CONTROL_IFACE, in_signature="x")
+    def SetPositionUs(self, position_us):
+        self._set_position(int(position_us))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--players", type=int, default=1)
+    ap.add_argument("--playing", type=int, default=0, help="Index of the player that is Playing (-1: none)")
+    args = ap.parse_args()
+
+    DBusGMainLoop(set_as_default=True)
+    players = []
+    for i in range(args.players):
+        # one connection per player: every player serves the same object path
+        conn = dbus.bus.BusConnection(dbus.bus.BusConnection.TYPE_SESSION)
+        players.append(FakePlayer(conn, i, "Playing" if i == args.playing else "Paused"))
+    print("ready", flush=True)
+    GLib.MainLoop().run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
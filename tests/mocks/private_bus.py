@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+class PrivateSessionBus:
+    """
+    A throwaway `dbus-daemon --session` plus stand-in MPRIS player processes
+    (tests/mocks/mpris_service.py), independent of any desktop session.
+    """
+
+    def __init__(self) -> None:
+        self.address: str | None = None
+        self._daemon: subprocess.Popen | None = None
+        self._players: list[subprocess.Popen] = []
+
+    @staticmethod
+    def available() -> bool:
+        return shutil.which("dbus-daemon") is not None
+
+    def __enter__(self) -> "PrivateSessionBus":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def start(self) -> str:
+        self._daemon = subprocess.Popen(
+            ["dbus-daemon", "--session", "--nofork", "--nopidfile", "--print-address=1"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        assert self._daemon.stdout is not None
+        self.address = self._daemon.stdout.readline().strip()
+        if not self.address:
+            self.stop()
+            raise RuntimeError("dbus-daemon did not report an address")
+        return self.address
+
+    def env(self) -> dict[str, str]:
+        assert self.address is not None
+        return {**os.environ, "DBUS_SESSION_BUS_ADDRESS": self.address}
+
+    def spawn_players(self, count: int, playing: int = 0) -> subprocess.Popen:
+        """Start `count` fake players in one process; returns once they are on the bus."""
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "tests.mocks.mpris_service", "--players", str(count), "--playing", str(playing)],
+            cwd=REPO_ROOT,
+            env=self.env(),
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self._players.append(proc)
+        assert proc.stdout is not None
+        if proc.stdout.readline().strip() != "ready":
+            raise RuntimeError("fake MPRIS players failed to start")
+        return proc
+
+    def stop(self) -> None:
+        for proc in [*self._players, self._daemon]:
+            if proc is None or proc.poll() is not None:
+                continue
+            proc.terminate()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        self._players.clear()
+        self._daemon = None
+        self.address = None
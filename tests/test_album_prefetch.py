@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from terminal_lyrics.cache.sqlite import CacheKey
+from terminal_lyrics.config import AppConfig
+from terminal_lyrics.sources.lrclib import LrcLibSource
+from terminal_lyrics.sources.service import LyricsService
+from terminal_lyrics.sources.types import SearchResult, TrackKey
+
+
+def _cfg(tmp_path) -> AppConfig:
+    return AppConfig(
+        data_dir=tmp_path / "data",
+        cache_db_path=tmp_path / "cache.sqlite3",
+        config_dir=tmp_path / "config",
+        lang="EN",
+        sources=("lrclib",),
+        api_min_interval_s=0.0,
+        api_max_retries=1,
+        api_backoff_base_s=0.0,
+        preferred_player=None,
+        refresh_hz=10.0,
+        context_lines=1,
+        use_alt_screen=False,
+    )
+
+
+def _result(title: str, album: str, synced: str | None, plain: str | None = None) -> SearchResult:
+    return SearchResult(
+        id=None,
+        track_name=title,
+        artist_name="Band",
+        album_name=album,
+        duration=None,
+        instrumental=False,
+        has_synced_lyrics=synced is not None,
+        has_plain_lyrics=plain is not None,
+        synced_lyrics_text=synced,
+        plain_lyrics_text=plain,
+    )
+
+
+def test_prefetch_album_caches_every_track_once(tmp_path, monkeypatch):
+    calls: list[dict] = []
+
+    def fake_search(self, **kwargs):
+        calls.append(kwargs)
+        return [
+            _result("One", "Record", "[00:01.00]one\n"),
+            _result("Two", "Record", None, "two\n"),
+            _result("Two", "Record", "[00:02.00]two\n"),
+            _result("Other", "Another Record", "[00:03.00]x\n"),
+        ]
+
+    monkeypatch.setattr(LrcLibSource, "search", fake_search)
+    svc = LyricsService(_cfg(tmp_path))
+    track = TrackKey(artist="Band", title="One", album="Record")
+
+    svc.prefetch_album(track)
+    svc.prefetch_album(track)
+    svc.background.join()
+
+    assert len(calls) == 1
+    assert calls[0]["album_name"] == "Record"
+    assert svc.cache.get(CacheKey("Band", "One", "Record")) == ("[00:01.00]one\n", True)
+    assert svc.cache.get(CacheKey("Band", "Two", "Record")) == ("[00:02.00]two\n", True)
+    assert svc.cache.get(CacheKey("Band", "Other", "Record")) == (None, None)
+
+    # a fresh service (new process) skips the album thanks to album_prefetch table
+    svc2 = LyricsService(_cfg(tmp_path))
+    svc2.prefetch_album(track)
+    svc2.background.join()
+    assert len(calls) == 1
+
+
+def test_prefetch_album_disabled_without_album(tmp_path, monkeypatch):
+    monkeypatch.setattr(LrcLibSource, "search", lambda self, **kw: [])
+    svc = LyricsService(_cfg(tmp_path))
+    svc.prefetch_album(TrackKey(artist="Band", title="Single"))
+    assert svc.background._thread is None
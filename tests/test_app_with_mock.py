@@ -47,7 +47,7 @@ class TestAppWithMockPlayer:
         mock_player.auto_advance_rate_ms_per_sec = 1000.0
         
         # Patch MprisClient.pick_player to return our mock
-        with patch("terminal_lyrics.app.MprisClient.pick_player", return_value=mock_player):
+        with patch("terminal_lyrics.mpris.client.MprisClient.pick_player", return_value=mock_player):
             with patch.object(LyricsService, "get_lyrics", side_effect=mock_get_lyrics):
                 # This would run forever, so we'll just test that it doesn't crash immediately
                 # In a real test, you'd use threading.Timer or similar to stop it
@@ -75,3 +75,136 @@ class TestAppWithMockPlayer:
         # But we can verify the error handling path exists
         from terminal_lyrics.mpris.errors import NoPlayersFound
         assert NoPlayersFound is not None
+
+    def test_watch_with_injected_player_and_virtual_clock(self, tmp_path):
+        """Run the real loop for a few simulated seconds without D-Bus or a terminal."""
+        import io
+
+        from terminal_lyrics.render.ansi import AnsiRenderer
+        from terminal_lyrics.sources.service import LyricsResponse
+
+        cfg = AppConfig(
+            data_dir=tmp_path / "data",
+            cache_db_path=tmp_path / "cache.sqlite3",
+            config_dir=tmp_path / "config",
+            lang="EN",
+            sources=(),
+            api_min_interval_s=0.1,
+            api_max_retries=1,
+            api_backoff_base_s=0.1,
+            preferred_player=None,
+            refresh_hz=10.0,
+            context_lines=1,
+            use_alt_screen=False,
+        )
+        now = [0.0]
+
+        class _Stop(Exception):
+            pass
+
+        def sleep(seconds):
+            now[0] += seconds
+            if now[0] > 3.0:
+                raise _Stop
+
+        player = MockMprisClient(auto_advance=True, clock=lambda: now[0])
+        player.set_track("Test Song", "Test Artist")
+
+        class _Service:
+            def get_lyrics(self, track):
+                return LyricsResponse(
+                    lrc_text="[00:00.00]Line 1\n[00:01.00]Line 2\n[00:02.00]Line 3\n",
+                    source="test",
+                    has_lyrics=True,
+                )
+
+            def prefetch_album(self, track):
+                pass
+
+        out = io.StringIO()
+        renderer = AnsiRenderer(use_alt_screen=False, stream=out)
+        with pytest.raises(_Stop):
+            watch(
+                cfg,
+                preferred_player=None,
+                debug=False,
+                renderer=renderer,
+                pick_player=lambda preferred=None: player,
+                service=_Service(),
+                sleep=sleep,
+            )
+        frames = out.getvalue()
+        assert "Line 3" in frames
+        # enter + startup frame + initial lyrics frame + one per line change
+        assert frames.count("\x1b[2J") == 6
+
+    def test_watch_reports_metrics(self, tmp_path):
+        """Injected WatchMetrics see every D-Bus call, frame and line change."""
+        import io
+
+        from terminal_lyrics.metrics import WatchMetrics
+        from terminal_lyrics.render.ansi import AnsiRenderer
+        from terminal_lyrics.sources.service import LyricsResponse
+
+        cfg = AppConfig(
+            data_dir=tmp_path / "data",
+            cache_db_path=tmp_path / "cache.sqlite3",
+            config_dir=tmp_path / "config",
+            lang="EN",
+            sources=(),
+            api_min_interval_s=0.1,
+            api_max_retries=1,
+            api_backoff_base_s=0.1,
+            preferred_player=None,
+            refresh_hz=10.0,
+            context_lines=1,
+            use_alt_screen=False,
+        )
+        now = [0.0]
+
+        class _Stop(Exception):
+            pass
+
+        def sleep(seconds):
+            now[0] += seconds
+            if now[0] > 3.0:
+                raise _Stop
+
+        player = MockMprisClient(auto_advance=True, clock=lambda: now[0])
+        player.set_track("Test Song", "Test Artist")
+
+        class _Service:
+            def get_lyrics(self, track):
+                return LyricsResponse(
+                    # bilingual line: both halves passed in one tick, not a seek
+                    lrc_text="[00:00.00]Line 1\n[00:01.00]Line 2\n[00:01.00]Строка 2\n[00:02.00]Line 3\n",
+                    source="test",
+                    has_lyrics=True,
+                )
+
+            def prefetch_album(self, track):
+                pass
+
+        metrics = WatchMetrics()
+        with pytest.raises(_Stop):
+            watch(
+                cfg,
+                preferred_player=None,
+                debug=False,
+                renderer=AnsiRenderer(use_alt_screen=False, stream=io.StringIO()),
+                pick_player=lambda preferred=None: player,
+                service=_Service(),
+                sleep=sleep,
+                metrics=metrics,
+            )
+        samples = dict(
+            line.rsplit(" ", 1) for line in metrics.registry.expose().splitlines() if not line.startswith("#")
+        )
+        metadata_calls = int(samples['terminal_lyrics_dbus_call_seconds_count{call="metadata"}'])
+        assert metadata_calls >= 30  # one per 100 ms tick, plus wakeups at line boundaries
+        assert samples['terminal_lyrics_dbus_call_seconds_count{call="position_ms"}'] == str(metadata_calls)
+        assert samples['terminal_lyrics_render_seconds_count{kind="frame"}'] == "3"
+        assert samples['terminal_lyrics_resolve_seconds_count{source="test"}'] == "1"
+        # the loop wakes up at each line boundary, so lines are drawn on the beat
+        assert samples['terminal_lyrics_line_lateness_seconds_bucket{le="0.005"}'] == "3"
+        assert samples.get("terminal_lyrics_seeks_total", "0") == "0"
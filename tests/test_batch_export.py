@@ -0,0 +1,59 @@
+import os
+
+from typer.testing import CliRunner
+
+from terminal_lyrics.cli import app
+from terminal_lyrics.lrc.batch import collect_inputs, export_batch, plan_jobs
+from terminal_lyrics.lrc.export import export_vtt
+from terminal_lyrics.lrc.parse import parse_lrc
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_batch_export_dirs_skip_and_failures(tmp_path):
+    src = tmp_path / "lyrics"
+    _write(src / "a.lrc", "[00:01.00]a\n[00:02.00]b\n")
+    _write(src / "album" / "b.lrc", "[00:03.00]c\n")
+    _write(src / "bad.lrc", "[00:99.00]broken\n")
+    out = tmp_path / "out"
+
+    jobs = plan_jobs(collect_inputs([str(src)]), "vtt", out)
+    res = export_batch(jobs, workers=2)
+    assert (res.written, res.skipped) == (2, 0)
+    assert [p.name for p, _err in res.failed] == ["bad.lrc"]
+    assert (out / "album" / "b.vtt").read_text(encoding="utf-8") == export_vtt(
+        parse_lrc("[00:03.00]c\n")
+    )
+
+    # outputs newer than inputs are skipped unless forced
+    res = export_batch(jobs, workers=1)
+    assert (res.written, res.skipped) == (0, 2)
+    st = (src / "a.lrc").stat()
+    os.utime(src / "a.lrc", ns=(st.st_atime_ns, st.st_mtime_ns + 10**10))
+    res = export_batch(jobs, workers=1)
+    assert (res.written, res.skipped) == (1, 1)
+    res = export_batch(plan_jobs(collect_inputs([str(src)]), "vtt", out, force=True), workers=1)
+    assert res.written == 2
+
+
+def test_collect_inputs_glob_and_dedup(tmp_path):
+    _write(tmp_path / "x.lrc", "[00:01.00]x\n")
+    _write(tmp_path / "y.txt", "nope\n")
+    files = collect_inputs([str(tmp_path / "*.lrc"), str(tmp_path / "x.lrc")])
+    assert [p.name for p, _root in files] == ["x.lrc"]
+    jobs = plan_jobs(files, "ass", None)
+    assert jobs[0].dst == tmp_path / "x.ass"
+
+
+def test_batch_cli_rejects_out_and_lrc_next_to_inputs(tmp_path):
+    (tmp_path / "a.lrc").write_text("[00:01.00]a\n", encoding="utf-8")
+    runner = CliRunner()
+    res = runner.invoke(app, ["export", str(tmp_path), "--out", str(tmp_path / "x.srt")])
+    assert res.exit_code == 2 and "--out" in res.output
+    res = runner.invoke(app, ["export", str(tmp_path), "--format", "lrc"])
+    assert res.exit_code == 2 and "--out-dir" in res.output
+    res = runner.invoke(app, ["export", str(tmp_path), "--format", "lrc", "--out-dir", str(tmp_path / "o")])
+    assert res.exit_code == 0 and (tmp_path / "o" / "a.lrc").exists()
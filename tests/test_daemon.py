@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import time
+
+import pytest
+from typer.testing import CliRunner
+
+from terminal_lyrics.app import watch
+from terminal_lyrics.cli import app
+from terminal_lyrics.config import AppConfig
+from terminal_lyrics.daemon import DaemonRunning, Hub, follow, query
+from terminal_lyrics.events import LineChanged, Notice, TrackChanged, decode, encode
+from terminal_lyrics.sources.service import LyricsResponse
+from tests.mocks.mpris_mock import MockMprisClient
+
+TRACK = TrackChanged("mock", "Artist", "Song", "", "test", True, ("one", "two"), (0, 1000))
+
+
+class _Stop(Exception):
+    pass
+
+
+class RecordingSink:
+    def __init__(self, stop_after: int | None = None):
+        self.events = []
+        self.stop_after = stop_after
+        self.entered = self.exited = 0
+
+    def enter(self):
+        self.entered += 1
+
+    def exit(self):
+        self.exited += 1
+
+    def emit(self, event):
+        self.events.append(event)
+        if self.stop_after is not None and len(self.events) >= self.stop_after:
+            raise _Stop
+
+
+def _wait(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def _subscribe(path, **req):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(2.0)
+    sock.connect(str(path))
+    sock.sendall((json.dumps({"op": "subscribe", **req}) + "\n").encode())
+    return sock, sock.makefile("rb")
+
+
+@pytest.fixture
+def hub(tmp_path):
+    h = Hub(tmp_path / "tl.sock")
+    h.enter()
+    yield h
+    h.exit()
+
+
+def test_events_round_trip_as_compact_json():
+    line = LineChanged("mock", 1, "two", 1000, None, 1003)
+    assert encode(line) == (
+        '{"player":"mock","index":1,"text":"two","t_ms":1000,"next_t_ms":null,"pos_ms":1003,"type":"line"}'
+    )
+    assert decode(encode(line)) == line
+    assert decode(encode(TRACK)) == TRACK
+    with pytest.raises(ValueError):
+        decode('{"type":"nope"}')
+
+
+def test_watch_loop_emits_events_to_sink(tmp_path):
+    cfg = AppConfig(
+        data_dir=tmp_path, cache_db_path=tmp_path / "c.sqlite3", config_dir=tmp_path, lang="EN",
+        sources=(), api_min_interval_s=0.1, api_max_retries=1, api_backoff_base_s=0.1,
+        preferred_player=None, refresh_hz=10.0, context_lines=1, use_alt_screen=False,
+    )
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+        if now[0] > 3.0:
+            raise _Stop
+
+    player = MockMprisClient(auto_advance=True, clock=lambda: now[0])
+    player.set_track("Song", "Artist")
+
+    class _Service:
+        def get_lyrics(self, track):
+            return LyricsResponse(lrc_text="[00:00.00]one\n[00:01.00]two\n", source="test", has_lyrics=True)
+
+        def prefetch_album(self, track):
+            pass
+
+    sink = RecordingSink()
+    with pytest.raises(_Stop):
+        watch(cfg, preferred_player=None, debug=False, pick_player=lambda preferred=None: player,
+              service=_Service(), sleep=sleep, sink=sink)
+    assert (sink.entered, sink.exited) == (1, 1)
+    notice, track, *lines = sink.events
+    assert notice.key == "connecting_player"
+    assert (track.display, track.synced, track.lines, track.times) == ("Artist - Song", True, ("one", "two"), (0, 1000))
+    assert [(ev.index, ev.text, ev.t_ms, ev.next_t_ms) for ev in lines] == [(0, "one", 0, 1000), (1, "two", 1000, None)]
+
+
+def test_hub_sends_snapshot_then_live_events(hub):
+    hub.emit(TRACK)
+    hub.emit(LineChanged("mock", 0, "one", 0, 1000, 5))
+
+    sock, f = _subscribe(hub.path)
+    with sock, f:
+        assert decode(f.readline()) == TRACK
+        assert decode(f.readline()).index == 0
+        _wait(lambda: hub.clients == 1)
+        hub.emit(LineChanged("mock", 1, "two", 1000, None, 1002))
+        assert decode(f.readline()).index == 1
+
+        # a notice replaces the state new clients see
+        hub.emit(Notice("no_mpris_players", "No active MPRIS players"))
+        assert query(hub.path) == [Notice("no_mpris_players", "No active MPRIS players")]
+
+
+def test_hub_filters_event_types_per_client(hub):
+    all_sock, all_f = _subscribe(hub.path)
+    line_sock, line_f = _subscribe(hub.path, events=["line"])
+    with all_sock, all_f, line_sock, line_f:
+        _wait(lambda: hub.clients == 2)
+        hub.emit(TRACK)
+        hub.emit(LineChanged("mock", 0, "one", 0, 1000, 5))
+        assert [decode(all_f.readline()).type for _ in range(2)] == ["track", "line"]
+        assert decode(line_f.readline()).type == "line"
+
+
+def test_hub_drops_clients_that_stop_reading(hub, monkeypatch):
+    monkeypatch.setattr("terminal_lyrics.daemon.MAX_PENDING_BYTES", 4096)
+    sock, f = _subscribe(hub.path)
+    with sock, f:
+        _wait(lambda: hub.clients == 1)
+        big = LineChanged("mock", 0, "x" * 8192, 0, None, 0)
+        for _ in range(200):
+            hub.emit(big)
+            if hub.dropped:
+                break
+        assert hub.dropped == 1 and hub.clients == 0
+
+
+def test_second_daemon_is_refused_and_stale_socket_replaced(hub, tmp_path):
+    with pytest.raises(DaemonRunning):
+        Hub(hub.path).enter()
+
+    stale = tmp_path / "stale.sock"
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    s.bind(str(stale))
+    s.close()  # file left behind, nobody listening
+    other = Hub(stale)
+    other.enter()
+    other.exit()
+    assert not stale.exists()
+
+
+def test_follow_feeds_daemon_events_to_sink(hub):
+    hub.emit(TRACK)
+    sink = RecordingSink(stop_after=2)
+    errors = []
+
+    def run():
+        try:
+            follow(hub.path, sink)
+        except _Stop:
+            pass
+        except Exception as e:  # pragma: no cover - surfaced below
+            errors.append(e)
+
+    th = threading.Thread(target=run)
+    th.start()
+    _wait(lambda: hub.clients == 1)
+    hub.emit(LineChanged("mock", 0, "one", 0, 1000, 5))
+    th.join(timeout=2.0)
+    assert not errors and not th.is_alive()
+    assert sink.events == [TRACK, LineChanged("mock", 0, "one", 0, 1000, 5)]
+    assert (sink.entered, sink.exited) == (1, 1)
+
+
+def test_follow_waits_for_the_daemon(tmp_path):
+    sink = RecordingSink()
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 3:
+            raise _Stop
+
+    with pytest.raises(_Stop):
+        follow(tmp_path / "missing.sock", sink, sleep=sleep)
+    # one notice, not one per retry
+    assert [ev.key for ev in sink.events] == ["daemon_unavailable"]
+
+
+def test_connect_rejects_options_only_the_daemon_can_honour(tmp_path):
+    runner = CliRunner()
+    for extra in (["--record", str(tmp_path / "rec.ndjson")], ["--publish-state"]):
+        res = runner.invoke(app, ["watch", "--connect", "--socket", str(tmp_path / "d.sock"), *extra])
+        assert res.exit_code == 2
+        assert extra[0] in res.output
+    assert not (tmp_path / "rec.ndjson").exists()
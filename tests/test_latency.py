@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import pytest
+
+from terminal_lyrics.sync.latency import LatencyCompensator
+
+
+def test_lead_tracks_half_rtt_plus_render_and_is_capped():
+    comp = LatencyCompensator(max_lead_ms=50.0, alpha=1.0)
+    comp.observe_call(10.000, 10.020)  # 20 ms round trip
+    comp.observe_render(0.005)
+    assert comp.lead_ms == pytest.approx(15.0)
+    assert comp.effective_ms(1000) == 1015
+
+    comp.observe_call(10.0, 10.5)  # one very slow call
+    assert comp.lead_ms == 50.0
+
+    assert LatencyCompensator(max_lead_ms=0.0, alpha=1.0).effective_ms(1000) == 1000
+
+
+def test_ewma_smooths_outliers():
+    comp = LatencyCompensator(alpha=0.2)
+    for _ in range(50):
+        comp.observe_call(0.0, 0.010)
+    comp.observe_call(0.0, 0.200)
+    assert 5.0 < comp.half_rtt_ms < 25.0
+
+
+def test_sleep_wakes_at_boundary_but_not_while_paused():
+    comp = LatencyCompensator()
+    tick = 1 / 30
+    assert comp.sleep_s(tick, 1_000, None) == tick
+    assert comp.sleep_s(tick, 1_990, 2_000) == pytest.approx(0.010)
+    assert comp.sleep_s(tick, 2_500, 4_000) == tick
+    # position stands still (paused) -> regular tick instead of spinning
+    assert comp.sleep_s(tick, 2_500, 2_501) == tick
+    assert comp.sleep_s(tick, 2_501, 2_501) == 0.001
+
+
+def test_lateness_percentiles_use_a_bounded_window():
+    comp = LatencyCompensator(window=100)
+    assert comp.percentiles() is None
+    # position 5 ms past the line, drawn 10 ms after the sample -> 15 ms late
+    assert comp.record_line(1_000, 1_005, 0.0, 0.010) == pytest.approx(15.0)
+    for i in range(200):
+        comp.record_line(0, i, 0.0, 0.0)
+    assert comp.samples == 100
+    p50, p90, p99 = comp.percentiles()
+    assert 100 <= p50 < p90 < p99 <= 199
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+import re
+from unittest.mock import patch
+
+from terminal_lyrics.render.ansi import AnsiRenderer
+from terminal_lyrics.render.layout import Layout, cell_width, truncate, wrap_spans
+
+
+def _rows(text, width):
+    return [text[a:b] for a, b in wrap_spans(text, width)]
+
+
+def test_widths_count_terminal_columns():
+    assert cell_width("hello") == 5
+    assert cell_width("日本語") == 6
+    assert cell_width("🎵") == 2
+    assert cell_width("e\u0301") == 1  # combining accent
+    assert cell_width("\U0001f469\u200d\U0001f3a4") == 4  # ZWJ takes no column
+
+
+def test_truncate_skips_style_escapes():
+    styled = "Song \x1b[33m(unsynced)\x1b[0m"
+    assert truncate(styled, 15) == styled
+    assert truncate(styled, 8) == "Song \x1b[33m(u…"
+    assert truncate(styled, 5) == "Song…"
+    assert truncate("日本語の歌", 5) == "日本…"
+
+
+def test_wrap_breaks_at_spaces_and_by_columns():
+    assert _rows("hello world foo", 11) == ["hello world", "foo"]
+    assert _rows("supercalifragilistic", 6) == ["superc", "alifra", "gilist", "ic"]
+    assert _rows("日本語の歌詞です", 5) == ["日本", "語の", "歌詞", "です"]
+    assert _rows("", 10) == [""]
+    for text, width in (("a bc 日本 de", 3), ("🎵🎵 x y", 2)):
+        assert all(cell_width(row) <= width for row in _rows(text, width))
+
+
+def test_window_keeps_wrapped_current_line_on_screen():
+    lines = ["a" * 10, "b", "c" * 25, "d", "e"]
+    layout = Layout.build(lines, 10)
+    assert layout.offsets == (0, 1, 2, 5, 6, 7)
+    # context would start at "b", but the current line needs all 3 rows
+    assert layout.top_row(2, context_lines=1, body_rows=3) == 2
+    assert layout.top_row(2, context_lines=1, body_rows=4) == 1
+    # near the end the window fills up from above
+    assert layout.top_row(4, context_lines=1, body_rows=3) == 4
+    assert layout.top_row(-1, context_lines=1, body_rows=3) == 0
+    assert [layout.line_at(r) for r in range(7)] == [0, 1, 2, 2, 2, 3, 4]
+
+
+def test_renderer_wraps_and_highlights_across_rows(capsys):
+    renderer = AnsiRenderer(use_alt_screen=False)
+    lines = ["first", "one two three four"]
+    with patch("shutil.get_terminal_size", return_value=os.terminal_size((9, 10))) as size:
+        renderer.render("T", lines, current_idx=1, context_lines=1)
+        out = capsys.readouterr().out
+        theme = renderer.theme
+        assert f"{theme.current}one two{theme.reset}\n{theme.current}three{theme.reset}\n" in out
+
+        layout = renderer._layout
+        renderer.render("T", lines, current_idx=1, context_lines=1)
+        assert renderer._layout is layout
+        capsys.readouterr()
+
+        # "one two thr": the rest of row 3, then the start of row 4
+        renderer.highlight_to(11)
+        assert capsys.readouterr().out == (
+            f"\x1b[3;1H{theme.sung}one two\x1b[4;1H{theme.sung}thr{theme.reset}"
+        )
+
+        # resize: wrapped again for the new width
+        size.return_value = os.terminal_size((40, 10))
+        renderer.render("T", lines, current_idx=1, context_lines=1)
+        assert renderer._layout is not layout and renderer._layout.width == 40
+
+
+def test_renderer_title_with_styled_label_fits(capsys):
+    renderer = AnsiRenderer(use_alt_screen=False)
+    theme = renderer.theme
+    title = f"Artist - Song {theme.warning}(unsynced){theme.reset}"
+    with patch("shutil.get_terminal_size", return_value=os.terminal_size((24, 10))):
+        renderer.render(title, ["a"], current_idx=-1)
+    row = renderer._title[2]
+    assert cell_width(re.sub(r"\x1b\[[0-9;]*m", "", row)) == 24
+    assert f"{theme.warning}(un" in row
+    capsys.readouterr()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import io
+
+from terminal_lyrics.app import snapshot
+from terminal_lyrics.cache.sqlite import CacheKey, LyricsCache
+from terminal_lyrics.config import AppConfig
+from terminal_lyrics.daemon import Hub
+from terminal_lyrics.events import LineChanged, Notice, TrackChanged
+from terminal_lyrics.render.line import LineSink, truncate
+from tests.mocks.mpris_mock import MockMprisClient
+
+
+def _cfg(tmp_path, **kw) -> AppConfig:
+    return AppConfig(
+        data_dir=tmp_path, cache_db_path=tmp_path / "c.sqlite3", config_dir=tmp_path, lang="EN",
+        sources=(), api_min_interval_s=0.1, api_max_retries=1, api_backoff_base_s=0.1,
+        preferred_player=None, refresh_hz=10.0, context_lines=1, use_alt_screen=False, **kw,
+    )
+
+
+def test_truncate_counts_terminal_columns():
+    assert truncate("hello", 0) == "hello"
+    assert truncate("hello", 5) == "hello"
+    assert truncate("hello world", 6) == "hello…"
+    # wide characters take two columns each
+    assert truncate("日本語の歌詞", 7) == "日本語…"
+    assert truncate("ééé", 3) == "ééé"
+
+
+def test_line_sink_writes_only_when_the_visible_text_changes():
+    out = io.StringIO()
+    sink = LineSink(width=8, stream=out)
+    sink.emit(TrackChanged("mock", "Artist", "Song", "", "test", True, ("la la la la", "la la la la!", "end"), (0, 1, 2)))
+    sink.emit(LineChanged("mock", 0, "la la la la", 0, 1, 0))
+    sink.emit(LineChanged("mock", 1, "la la la la!", 1, 2, 1))  # same 8 visible columns
+    sink.emit(LineChanged("mock", 2, "end", 2, None, 2))
+    sink.emit(Notice("no_mpris_players", "No active MPRIS players"))
+    assert out.getvalue().splitlines() == ["Artist …", "la la l…", "end", "No acti…"]
+
+
+def test_snapshot_reads_player_and_cache_without_network(tmp_path):
+    cfg = _cfg(tmp_path)
+    LyricsCache(cfg.cache_db_path).set(
+        CacheKey("Artist", "Song", "Album"), has_lyrics=True, lrc_text="[00:00.00]one\n[00:02.00]two\n", source="lrclib"
+    )
+    player = MockMprisClient(position_ms=2500)
+    player.set_track("Song", "Artist", "Album")
+    track, line = snapshot(cfg, preferred_player=None, pick_player=lambda preferred=None: player, use_daemon=False)
+    assert track.lines == ("one", "two")
+    assert (line.index, line.text, line.t_ms, line.next_t_ms) == (1, "two", 2000, None)
+
+    player.set_track("Other", "Artist", "Album")
+    (track,) = snapshot(cfg, preferred_player=None, pick_player=lambda preferred=None: player, use_daemon=False)
+    assert (track.display, track.lines) == ("Artist - Other", ())
+
+
+def test_snapshot_prefers_a_running_daemon(tmp_path):
+    cfg = _cfg(tmp_path, socket_path=tmp_path / "d.sock")
+    hub = Hub(cfg.socket_path)
+    hub.enter()
+    try:
+        hub.emit(TrackChanged("mock", "Artist", "Song", "", "test", True, ("one", "two"), (0, 1000)))
+        hub.emit(LineChanged("mock", 1, "two", 1000, None, 1001))
+
+        def no_player(preferred=None):
+            raise AssertionError("the daemon should answer")
+
+        events = snapshot(cfg, preferred_player=None, pick_player=no_player)
+    finally:
+        hub.exit()
+    assert [ev.type for ev in events] == ["track", "line"]
+    assert events[1].text == "two"
@@ -1,4 +1,9 @@
-from terminal_lyrics.lrc.parse import parse_lrc
+import io
+
+import pytest
+
+from terminal_lyrics.lrc.model import LrcDocument, LyricEvent
+from terminal_lyrics.lrc.parse import LrcParseError, iter_lrc_events, parse_lrc, parse_lrc_with_stats
 
 
 def test_parse_multiple_timestamps():
@@ -13,3 +18,55 @@ def test_parse_offset_clamped():
     assert doc.events[0].t_ms == 0
 
 
+def test_parse_stats_and_dedup():
+    text = "[ar:A]\n\nstray\n[00:02.00]b\n[00:01.00][00:02.00]b\n[00:01.00]a\n"
+    doc, stats = parse_lrc_with_stats(text)
+    assert [(e.t_ms, e.text) for e in doc.events] == [(1000, "a"), (1000, "b"), (2000, "b")]
+    assert doc.tags == {"ar": "A"}
+    assert (stats.lines_total, stats.lines_with_timestamps, stats.lines_ignored) == (6, 3, 2)
+    assert stats.events_total == 3
+
+
+def test_parse_timestamp_after_text_uses_trailing_payload():
+    doc = parse_lrc("[00:01.00]x [00:02.00] y\n  [00:03]z\n")
+    assert [(e.t_ms, e.text) for e in doc.events] == [(1000, "y"), (2000, "y"), (3000, "z")]
+
+
+def test_parse_accepts_file_objects():
+    text = "[offset:+500]\r\n[00:01.00]a\r\n"
+    assert parse_lrc(io.StringIO(text)).events == parse_lrc(text).events
+
+
+def test_iter_lrc_events_streams_in_source_order():
+    f = io.StringIO("[00:05.00]late\n[offset:100]\n[00:01.00][00:01.00]early\n")
+    events = list(iter_lrc_events(f))
+    assert [(e.t_ms, e.text) for e in events] == [(5000, "late"), (1100, "early"), (1100, "early")]
+
+
+def test_parse_invalid_seconds():
+    with pytest.raises(LrcParseError):
+        parse_lrc("[00:61.00]x\n")
+
+
+def test_document_is_columnar_and_interned():
+    doc = parse_lrc("[00:01.00]chorus\n[00:02.00]verse\n[00:03.00]chorus\n")
+    assert list(doc.times) == [1000, 2000, 3000]
+    assert doc.lines == ("chorus", "verse")
+    assert list(doc.line_ids) == [0, 1, 0]
+    assert doc.texts == ["chorus", "verse", "chorus"]
+    assert doc.texts[1:] == ["verse", "chorus"]
+    assert doc.events[2] == LyricEvent(3000, "chorus")
+    assert LrcDocument(events=doc.events, tags={}) == doc
+
+
+def test_parse_enhanced_lrc_word_timings():
+    doc = parse_lrc(
+        "[00:12.00]<00:12.00>Hello <00:12.50>big <00:13.10>world<00:14.00>\n"
+        "[00:20.00]plain\n"
+    )
+    assert doc.texts == ["Hello big world", "plain"]
+    assert doc.words is not None
+    assert doc.words.span(0) == [(0, 0), (500, 6), (1100, 10), (2000, 15)]
+    assert doc.words.span(1) == []
+    assert [e.text for e in iter_lrc_events(io.StringIO("[00:01.00]<00:01.00>a <00:01.50>b\n"))] == ["a b"]
+    assert parse_lrc("[00:01.00]a <3 b\n").words is None
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import dataclasses
+import time
+from pathlib import Path
+
+import pytest
+
+from terminal_lyrics.config import AppConfig
+from terminal_lyrics.sources.lrclib import LrcLibSource
+from terminal_lyrics.sources.lyrics_ovh import LyricsOvhSource
+from terminal_lyrics.sources.service import LyricsService
+from terminal_lyrics.sources.types import TrackKey
+from tests.mocks.lyrics_server import Faults, LyricsServer, parse_latency, seed_dataset
+
+
+@pytest.fixture
+def server():
+    with LyricsServer(seed_dataset(50)) as srv:
+        yield srv
+
+
+def _lrclib(url: str, **kw) -> LrcLibSource:
+    kw.setdefault("max_retries", 3)
+    return LrcLibSource(min_interval_s=0.0, backoff_base_s=0.0, base_url=url, **kw)
+
+
+def test_parse_latency():
+    import random
+
+    rnd = random.Random(0)
+    assert parse_latency("25")(rnd) == 25.0
+    assert all(20 <= parse_latency("uniform:20:40")(rnd) <= 40 for _ in range(50))
+    assert parse_latency("lognormal:100:0.5")(rnd) > 0
+    with pytest.raises(ValueError):
+        parse_latency("pareto:1:2")
+
+
+def test_lrclib_get_search_and_not_found(server):
+    src = _lrclib(server.url)
+    res = src.fetch(TrackKey(artist="Artist 1", title="Song 1", album="Album 0"))
+    assert res.lrc_text and res.lrc_text.startswith("[00:05.00]")
+    assert res.remote_id == 1001
+
+    res = src.fetch(TrackKey(artist="Nobody", title="Nothing"))
+    assert res.lrc_text is None and res.definitive_not_found
+
+    # plain-only record: found, but nothing synced
+    res = src.fetch(TrackKey(artist="Artist 4", title="Song 4", album="Album 0"))
+    assert res.lrc_text is None and res.definitive_not_found
+
+    results = src.search(track_name="Song 4", artist_name="Artist 4")
+    assert {r.track_name for r in results} == {"Song 4", "Song 44"}
+    assert server.stats["get"] == 3 and server.stats["search"] == 1
+
+
+def test_lyrics_ovh(server):
+    src = LyricsOvhSource(min_interval_s=0.0, max_retries=1, backoff_base_s=0.0, base_url=server.url)
+    res = src.fetch(TrackKey(artist="Artist 4", title="Song 4"))
+    assert res.lrc_text and "[" not in res.lrc_text.splitlines()[0][:1]
+    assert src.fetch(TrackKey(artist="Artist 6", title="Song 6")).definitive_not_found
+    assert server.stats["ovh"] == 2
+
+
+def test_injected_errors_are_retried(server):
+    server.set_faults(Faults(error_rate=1.0))
+    src = _lrclib(server.url)
+    res = src.fetch(TrackKey(artist="Artist 1", title="Song 1"))
+    assert res.lrc_text is None and not res.definitive_not_found
+    assert server.stats["fault_500"] == 3
+
+    server.set_faults(Faults(rate_limit_rate=1.0))
+    src = _lrclib(server.url, max_retries=1)
+    assert src.fetch(TrackKey(artist="Artist 1", title="Song 1")).lrc_text is None
+    assert server.stats["fault_429"] == 1
+
+
+def test_hang_hits_client_timeout():
+    with LyricsServer(seed_dataset(5), faults=Faults(timeout_rate=1.0, hang_s=2.0)) as srv:
+        src = _lrclib(srv.url, max_retries=1, timeout_s=0.2)
+        started = time.monotonic()
+        res = src.fetch(TrackKey(artist="Artist 1", title="Song 1"))
+        assert time.monotonic() - started < 1.5
+        assert res.lrc_text is None and not res.definitive_not_found
+        assert srv.stats["fault_timeout"] == 1
+
+
+def test_service_end_to_end(server, tmp_path: Path):
+    server.set_faults(Faults(latency="5"))
+    cfg = AppConfig(
+        data_dir=tmp_path,
+        cache_db_path=tmp_path / "cache.sqlite3",
+        config_dir=tmp_path,
+        lang="EN",
+        sources=("lrclib",),
+        api_min_interval_s=0.0,
+        api_max_retries=2,
+        api_backoff_base_s=0.0,
+        preferred_player=None,
+        refresh_hz=30.0,
+        context_lines=1,
+        use_alt_screen=False,
+    )
+    cfg = dataclasses.replace(cfg, lrclib_base_url=server.url, api_timeout_s=2.0)
+    svc = LyricsService(cfg)
+    track = TrackKey(artist="Artist 2", title="Song 2", album="Album 0")
+
+    res = svc.get_lyrics(track)
+    assert res.has_lyrics and res.source == "lrclib"
+    assert svc.get_lyrics(track).source == "cache"
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import io
+import socket
+import urllib.request
+
+import pytest
+
+from terminal_lyrics.config import AppConfig
+from terminal_lyrics.metrics import (
+    CONTENT_TYPE,
+    HttpExporter,
+    MetricsUnavailable,
+    Registry,
+    WatchMetrics,
+    exporting,
+    parse_addr,
+    timed,
+    write_textfile,
+)
+
+
+def test_exposition_format():
+    r = Registry()
+    c = r.counter("tl_requests", "Requests.", ("result",))
+    h = r.histogram("tl_latency_seconds", "Latency.", ("call",), buckets=(0.01, 0.1))
+    c.labels("hit").inc()
+    c.labels("hit").inc(2)
+    c.labels('m"iss').inc()
+    child = h.labels("position_ms")
+    for v in (0.005, 0.01, 0.05, 3.0):
+        child.observe(v)
+
+    text = r.expose()
+    assert text.endswith("# EOF\n")
+    lines = text.splitlines()
+    assert "# TYPE tl_requests counter" in lines
+    assert 'tl_requests_total{result="hit"} 3' in lines
+    assert 'tl_requests_total{result="m\\"iss"} 1' in lines
+    assert "# TYPE tl_latency_seconds histogram" in lines
+    # buckets are cumulative; le is inclusive
+    assert 'tl_latency_seconds_bucket{call="position_ms",le="0.01"} 2' in lines
+    assert 'tl_latency_seconds_bucket{call="position_ms",le="0.1"} 3' in lines
+    assert 'tl_latency_seconds_bucket{call="position_ms",le="+Inf"} 4' in lines
+    assert 'tl_latency_seconds_count{call="position_ms"} 4' in lines
+    assert 'tl_latency_seconds_sum{call="position_ms"} 3.065' in lines
+
+
+def test_label_arity_and_duplicates():
+    r = Registry()
+    h = r.histogram("x_seconds", "X.", ("a",))
+    with pytest.raises(ValueError):
+        h.labels("1", "2")
+    with pytest.raises(ValueError):
+        r.counter("x_seconds", "again")
+
+
+def test_timed_and_metered_stream():
+    m = WatchMetrics()
+    assert timed(None, lambda x: x + 1, 1) == 2
+    hist = m.dbus_seconds.labels("metadata")
+    assert timed(hist, dict, a=1) == {"a": 1}
+    assert hist.counts[-1] + sum(hist.counts[:-1]) == 1
+
+    out = io.StringIO()
+    stream = m.metered_stream(out)
+    stream.write("ab")
+    stream.write("ё")
+    stream.flush()
+    assert out.getvalue() == "abё"
+    assert "terminal_lyrics_render_bytes_total 4" in m.registry.expose()
+
+
+def test_textfile_and_http_exporters(tmp_path):
+    m = WatchMetrics()
+    m.cache_requests.labels("hit").inc()
+
+    path = tmp_path / "prom" / "terminal_lyrics.prom"
+    write_textfile(m.registry, path)
+    assert 'terminal_lyrics_cache_requests_total{result="hit"} 1' in path.read_text(encoding="utf-8")
+    assert [p.name for p in path.parent.iterdir()] == ["terminal_lyrics.prom"]
+
+    assert parse_addr("9464") == ("127.0.0.1", 9464)
+    assert parse_addr("0.0.0.0:9100") == ("0.0.0.0", 9100)
+    exporter = HttpExporter(m.registry, "127.0.0.1", 0)
+    exporter.start()
+    try:
+        host, port = exporter.address
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as resp:
+            assert resp.headers["Content-Type"] == CONTENT_TYPE
+            body = resp.read().decode("utf-8")
+        assert body.endswith("# EOF\n")
+        assert 'terminal_lyrics_cache_requests_total{result="hit"} 1' in body
+    finally:
+        exporter.stop()
+
+
+def test_unusable_metrics_addr_is_reported(tmp_path):
+    for addr in ("abc", "host:", "1:99999"):
+        with pytest.raises(ValueError):
+            parse_addr(addr)
+
+    def cfg(addr):
+        return AppConfig(
+            data_dir=tmp_path, cache_db_path=tmp_path / "c.sqlite3", config_dir=tmp_path, lang="EN",
+            sources=(), api_min_interval_s=0.1, api_max_retries=1, api_backoff_base_s=0.1,
+            preferred_player=None, refresh_hz=30.0, context_lines=1, use_alt_screen=False,
+            metrics_file=tmp_path / "m.prom", metrics_addr=addr,
+        )
+
+    with socket.socket() as busy:
+        busy.bind(("127.0.0.1", 0))
+        busy.listen()
+        port = busy.getsockname()[1]
+        # the textfile exporter was never started: nothing to stop
+        with pytest.raises(MetricsUnavailable) as exc:
+            with exporting(cfg(f"127.0.0.1:{port}")):
+                pass
+        assert exc.value.addr == f"127.0.0.1:{port}"
+    with pytest.raises(MetricsUnavailable):
+        with exporting(cfg("abc")):
+            pass
@@ -0,0 +1,57 @@
+"""MprisClient against stand-in players on a private session bus (no desktop needed)."""
+
+from __future__ import annotations
+
+import pytest
+
+dbus = pytest.importorskip("dbus")
+pytest.importorskip("gi")
+
+from terminal_lyrics.mpris.client import MprisClient  # noqa: E402
+from tests.mocks.mpris_service import CONTROL_IFACE, MPRIS_PATH, NAME_PREFIX  # noqa: E402
+from tests.mocks.private_bus import PrivateSessionBus  # noqa: E402
+
+pytestmark = pytest.mark.skipif(not PrivateSessionBus.available(), reason="dbus-daemon not installed")
+
+
+@pytest.fixture
+def private_bus(monkeypatch):
+    bus = PrivateSessionBus()
+    try:
+        bus.start()
+    except (OSError, RuntimeError) as e:
+        pytest.skip(f"cannot start dbus-daemon: {e}")
+    monkeypatch.setenv("DBUS_SESSION_BUS_ADDRESS", bus.address)
+    # dbus-python caches the shared session connection per process
+    monkeypatch.setattr(dbus.Bus, "_shared_instances", {})
+    yield bus
+    bus.stop()
+
+
+def _control(name: str):
+    return dbus.Interface(dbus.SessionBus().get_object(name, MPRIS_PATH), CONTROL_IFACE)
+
+
+def test_list_and_pick_playing_player(private_bus):
+    private_bus.spawn_players(6, playing=4)
+    players = MprisClient.list_players()
+    assert sorted(players) == sorted(f"{NAME_PREFIX}{i}" for i in range(6))
+    assert MprisClient.pick_player().service_name == f"{NAME_PREFIX}4"
+    assert MprisClient.pick_player(preferred="fake2").service_name == f"{NAME_PREFIX}2"
+
+
+def test_scripted_metadata_status_and_position(private_bus):
+    private_bus.spawn_players(1, playing=0)
+    name = f"{NAME_PREFIX}0"
+    client = MprisClient(name)
+    assert client.track_info().title == "Song 0"
+
+    ctl = _control(name)
+    ctl.SetTrack("New Song", "Someone", "LP")
+    ti = client.track_info()
+    assert (ti.title, ti.artist, ti.album) == ("New Song", "Someone", "LP")
+
+    ctl.SetStatus("Paused")
+    ctl.SetPositionUs(dbus.Int64(90_000_000))
+    assert client.playback_status() == "Paused"
+    assert client.position_ms() == 90_000
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+from typer.testing import CliRunner
+
+from terminal_lyrics.app import watch
+from terminal_lyrics.cli import app
+from terminal_lyrics.config import AppConfig
+from terminal_lyrics.events import Focus, LineChanged, Notice, PlaybackChanged, TrackChanged
+from terminal_lyrics.sources.service import LyricsResponse
+from tests.mocks.mpris_mock import MockMprisClient
+
+LRC = "[00:00.00]one\n[00:01.00]two\n[00:02.00]three\n"
+
+
+class _Stop(Exception):
+    pass
+
+
+class RecordingSink:
+    def __init__(self):
+        self.events = []
+
+    def enter(self):
+        pass
+
+    def exit(self):
+        pass
+
+    def emit(self, event):
+        self.events.append(event)
+
+
+class _Service:
+    def get_lyrics(self, track):
+        return LyricsResponse(lrc_text=LRC, source="test", has_lyrics=True)
+
+    def prefetch_album(self, track):
+        pass
+
+
+class _Counting(MockMprisClient):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.polls = 0
+
+    def track_info(self):
+        self.polls += 1
+        return super().track_info()
+
+
+def _cfg(tmp_path):
+    return AppConfig(
+        data_dir=tmp_path, cache_db_path=tmp_path / "c.sqlite3", config_dir=tmp_path, lang="EN",
+        sources=(), api_min_interval_s=0.1, api_max_retries=1, api_backoff_base_s=0.1,
+        preferred_player=None, refresh_hz=30.0, context_lines=1, use_alt_screen=False,
+    )
+
+
+def _run(tmp_path, players, until_s, on_tick=None):
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+        # lyrics are resolved on a real thread: give it a chance to finish
+        time.sleep(0.0005)
+        if on_tick is not None:
+            on_tick(now[0])
+        if now[0] > until_s:
+            raise _Stop
+
+    sink = RecordingSink()
+    with pytest.raises(_Stop):
+        watch(_cfg(tmp_path), preferred_player=None, debug=False, service=_Service(), sleep=sleep,
+              sink=sink, all_players=True, list_players=lambda: list(players), clock=lambda: now[0])
+    return sink.events, now
+
+
+def test_every_player_gets_its_own_track_and_lines(tmp_path):
+    now = [0.0]
+    a = MockMprisClient("org.mpris.MediaPlayer2.a", auto_advance=True, clock=lambda: now[0])
+    a.set_track("Song A", "Artist")
+    b = MockMprisClient("org.mpris.MediaPlayer2.b", auto_advance=True, clock=lambda: now[0])
+    b.set_track("Song B", "Artist")
+    players = [a, b]
+
+    def on_tick(t):
+        now[0] = t
+        if t > 2.6 and b in players:
+            players.remove(b)
+
+    events, _ = _run(tmp_path, players, 4.0, on_tick)
+
+    for name, title in (("org.mpris.MediaPlayer2.a", "Song A"), ("org.mpris.MediaPlayer2.b", "Song B")):
+        tracks = [ev for ev in events if isinstance(ev, TrackChanged) and ev.player == name]
+        assert [(ev.title, ev.lines) for ev in tracks] == [(title, ("one", "two", "three"))]
+    lines_a = [ev.index for ev in events if isinstance(ev, LineChanged) and ev.player.endswith(".a")]
+    lines_b = [ev.index for ev in events if isinstance(ev, LineChanged) and ev.player.endswith(".b")]
+    assert lines_a == [0, 1, 2]
+    assert lines_b[:2] == [0, 1]
+    gone = [ev for ev in events if isinstance(ev, Notice) and ev.key == "player_gone"]
+    assert [ev.player for ev in gone] == ["org.mpris.MediaPlayer2.b"]
+
+
+def test_paused_player_is_polled_at_idle_rate(tmp_path):
+    now = [0.0]
+    playing = _Counting("org.mpris.MediaPlayer2.playing", auto_advance=True, clock=lambda: now[0])
+    playing.set_track("Song", "Artist")
+    paused = _Counting("org.mpris.MediaPlayer2.paused", playback_status="Paused", position_ms=1500)
+    paused.set_track("Other", "Artist")
+
+    def on_tick(t):
+        now[0] = t
+
+    events, _ = _run(tmp_path, [playing, paused], 10.0, on_tick)
+
+    assert PlaybackChanged("org.mpris.MediaPlayer2.paused", "Paused", 1500) in events
+    assert paused.polls <= 15
+    assert playing.polls > 100
+
+
+def _track(player, title):
+    return TrackChanged(player, "Artist", title, "", "test", True, ("one", "two"), (0, 1000))
+
+
+def test_focus_follows_last_started_and_replays_on_switch():
+    inner = RecordingSink()
+    focus = Focus(inner)
+    a, b = _track("a", "Song A"), _track("b", "Song B")
+
+    focus.emit(b)
+    focus.emit(LineChanged("b", 1, "two", 1000, None, 1000))
+    focus.emit(PlaybackChanged("b", "Paused", 1000))
+    focus.emit(a)
+    focus.emit(LineChanged("a", 0, "one", 0, 1000, 10))
+    assert focus.player == "a"
+    assert inner.events[-2:] == [a, LineChanged("a", 0, "one", 0, 1000, 10)]
+
+    # b starts playing: its state is replayed, a goes quiet
+    inner.events.clear()
+    focus.emit(PlaybackChanged("b", "Playing", 1000))
+    focus.emit(LineChanged("a", 1, "two", 1000, None, 1010))
+    assert focus.player == "b"
+    assert inner.events == [b, LineChanged("b", 1, "two", 1000, None, 1000), PlaybackChanged("b", "Playing", 1000)]
+
+    # focused player closed: back to a, not a stale b
+    inner.events.clear()
+    focus.emit(Notice("player_gone", "Player closed: b", "b"))
+    assert focus.player == "a"
+    assert inner.events == [a, LineChanged("a", 1, "two", 1000, None, 1010)]
+
+
+def test_focus_sticks_to_preferred_player():
+    inner = RecordingSink()
+    focus = Focus(inner, preferred="vlc")
+    other, vlc = _track("org.mpris.MediaPlayer2.spotify", "X"), _track("org.mpris.MediaPlayer2.vlc", "Y")
+
+    focus.emit(other)
+    focus.emit(vlc)
+    focus.emit(_track("org.mpris.MediaPlayer2.spotify", "Z"))
+    focus.emit(Notice("no_mpris_players", "No active MPRIS players"))
+    assert focus.player == "org.mpris.MediaPlayer2.vlc"
+    assert inner.events == [other, vlc, Notice("no_mpris_players", "No active MPRIS players")]
+
+
+def test_once_shows_preferred_player_of_an_all_players_daemon(monkeypatch):
+    events = [
+        _track("org.mpris.MediaPlayer2.vlc", "Y"),
+        LineChanged("org.mpris.MediaPlayer2.vlc", 0, "one", 0, 1000, 10),
+        _track("org.mpris.MediaPlayer2.spotify", "X"),
+        LineChanged("org.mpris.MediaPlayer2.spotify", 1, "two", 1000, None, 20),
+    ]
+    monkeypatch.setattr("terminal_lyrics.app.snapshot", lambda cfg, preferred_player: events)
+    runner = CliRunner()
+    assert runner.invoke(app, ["watch", "--once", "--output", "line", "--player", "vlc"]).output == "one\n"
+    assert runner.invoke(app, ["watch", "--once", "--output", "line"]).output == "two\n"
+
+
+def test_record_rejects_all_players(tmp_path):
+    res = CliRunner().invoke(app, ["watch", "--all-players", "--record", str(tmp_path / "rec.ndjson")])
+    assert res.exit_code == 2
+    assert not (tmp_path / "rec.ndjson").exists()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from terminal_lyrics.app import watch
+from terminal_lyrics.config import AppConfig
+from terminal_lyrics.events import LineChanged, TrackChanged
+from terminal_lyrics.render.ndjson import NdjsonSink
+from terminal_lyrics.sources.service import LyricsResponse
+from tests.mocks.mpris_mock import MockMprisClient
+
+
+class _Stop(Exception):
+    pass
+
+
+class _FlushCounter(io.BytesIO):
+    flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+def test_one_compact_object_per_event_flushed_each_time():
+    out = _FlushCounter()
+    sink = NdjsonSink(out)
+    sink.emit(TrackChanged("mock", "Artist", "Song", "", "test", True, ("one", "двa"), (0, 1000)))
+    sink.emit(LineChanged("mock", 1, "двa", 1000, None, 1004))
+    lines = out.getvalue().decode("utf-8").splitlines()
+    assert out.flushes == 2
+    assert [json.loads(ln)["type"] for ln in lines] == ["track", "line"]
+    assert lines[1] == '{"player":"mock","index":1,"text":"двa","t_ms":1000,"next_t_ms":null,"pos_ms":1004,"type":"line"}'
+
+
+def test_watch_reports_pause_resume_and_seek(tmp_path):
+    cfg = AppConfig(
+        data_dir=tmp_path, cache_db_path=tmp_path / "c.sqlite3", config_dir=tmp_path, lang="EN",
+        sources=(), api_min_interval_s=0.1, api_max_retries=1, api_backoff_base_s=0.1,
+        preferred_player=None, refresh_hz=10.0, context_lines=1, use_alt_screen=False, max_lead_ms=0.0,
+    )
+    now = [0.0]
+    player = MockMprisClient(auto_advance=True, clock=lambda: now[0])
+    player.set_track("Song", "Artist")
+    script = [(1.5, player.pause), (2.5, player.play), (3.2, lambda: player.seek(500))]
+
+    def sleep(seconds):
+        now[0] += seconds
+        while script and now[0] >= script[0][0]:
+            script.pop(0)[1]()
+        if now[0] > 4.0:
+            raise _Stop
+
+    class _Service:
+        def get_lyrics(self, track):
+            lrc = "[00:00.00]one\n[00:01.00]two\n[00:02.00]three\n[00:03.00]four\n"
+            return LyricsResponse(lrc_text=lrc, source="test", has_lyrics=True)
+
+        def prefetch_album(self, track):
+            pass
+
+    out = io.BytesIO()
+    with pytest.raises(_Stop):
+        watch(cfg, preferred_player=None, debug=False, pick_player=lambda preferred=None: player,
+              service=_Service(), sleep=sleep, sink=NdjsonSink(out))
+    events = [json.loads(ln) for ln in out.getvalue().splitlines()]
+    summary = [
+        (ev["type"], ev.get("index", ev.get("status")))
+        for ev in events
+        if ev["type"] in ("line", "playback", "seek")
+    ]
+    assert summary == [
+        ("line", 0),
+        ("line", 1),
+        ("playback", "Paused"),
+        ("playback", "Playing"),
+        ("line", 2),
+        ("seek", None),
+        ("line", 0),
+        ("line", 1),
+    ]
+    paused = next(ev for ev in events if ev["type"] == "playback")
+    assert 1400 <= paused["pos_ms"] <= 1600
+
+
+def test_seek_only_for_position_jumps_not_dense_lines(tmp_path):
+    cfg = AppConfig(
+        data_dir=tmp_path, cache_db_path=tmp_path / "c.sqlite3", config_dir=tmp_path, lang="EN",
+        sources=(), api_min_interval_s=0.1, api_max_retries=1, api_backoff_base_s=0.1,
+        preferred_player=None, refresh_hz=10.0, context_lines=1, use_alt_screen=False, max_lead_ms=0.0,
+    )
+    now = [0.0]
+    player = MockMprisClient(auto_advance=True, clock=lambda: now[0])
+    player.set_track("Song", "Artist")
+    script = [(4.5, lambda: player.seek(9000))]
+
+    def sleep(seconds):
+        now[0] += seconds
+        while script and now[0] >= script[0][0]:
+            script.pop(0)[1]()
+        if now[0] > 5.0:
+            raise _Stop
+
+    class _Service:
+        def get_lyrics(self, track):
+            # bilingual: every line twice at the same timestamp
+            lrc = "".join(f"[00:0{s}.00]line {s}\n[00:0{s}.00]строка {s}\n" for s in range(1, 10, 2))
+            return LyricsResponse(lrc_text=lrc, source="test", has_lyrics=True)
+
+        def prefetch_album(self, track):
+            pass
+
+    out = io.BytesIO()
+    with pytest.raises(_Stop):
+        watch(cfg, preferred_player=None, debug=False, pick_player=lambda preferred=None: player,
+              service=_Service(), sleep=sleep, sink=NdjsonSink(out), clock=lambda: now[0])
+    events = [json.loads(ln) for ln in out.getvalue().splitlines()]
+    summary = [(ev["type"], ev.get("index")) for ev in events if ev["type"] in ("line", "seek")]
+    # both halves of a bilingual pair are passed in one tick: not a seek
+    assert summary == [("line", 1), ("line", 3), ("seek", None), ("line", 9)]
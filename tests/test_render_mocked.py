@@ -26,3 +26,24 @@ def test_mocked_render_still_stores_last_args_for_sigwinch():
         assert mock_render.call_count >= 2
         renderer.exit()
 
+
+
+def test_highlight_to_redraws_only_changed_span(capsys):
+    renderer = AnsiRenderer(use_alt_screen=False)
+    renderer.render("T", ["first", "one two"], current_idx=1, context_lines=1)
+    capsys.readouterr()
+
+    renderer.highlight_to(4)
+    out = capsys.readouterr().out
+    assert out == f"\x1b[3;1H{renderer.theme.sung}one {renderer.theme.reset}"
+
+    renderer.highlight_to(7)
+    assert capsys.readouterr().out == f"\x1b[3;5H{renderer.theme.sung}two{renderer.theme.reset}"
+
+    # seek back inside the line: un-highlight the span
+    renderer.highlight_to(4)
+    assert capsys.readouterr().out == f"\x1b[3;5H{renderer.theme.current}two{renderer.theme.reset}"
+
+    # a new current line starts unsung
+    renderer.render("T", ["first", "one two"], current_idx=0, context_lines=1)
+    assert renderer._hl_pos == 0
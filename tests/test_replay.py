@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from terminal_lyrics.mpris.errors import NoPlayersFound, PlayerUnavailable
+from terminal_lyrics.mpris.replay import ReplayFinished, ReplaySession, SessionRecorder
+from tests.mocks.mpris_mock import MockMprisClient
+
+
+def _record(path, now):
+    player = MockMprisClient(auto_advance=True, clock=lambda: now[0])
+    player.set_track("Song", "Artist", "Album")
+    available = [True]
+
+    def pick_player(preferred=None):
+        if not available[0]:
+            raise NoPlayersFound("gone")
+        return player
+
+    with SessionRecorder(path, clock=lambda: now[0]) as rec:
+        pick = rec.wrap_pick(pick_player)
+        for tick in range(30):
+            now[0] = tick * 0.1
+            if tick == 10:
+                player.seek(60_000)
+            available[0] = tick not in (20, 21)
+            try:
+                client = pick()
+            except NoPlayersFound:
+                continue
+            client.track_info()
+            client.position_ms()
+    return player
+
+
+def test_record_logs_changes_only_except_positions(tmp_path):
+    path = tmp_path / "session.ndjson"
+    _record(path, [0.0])
+    lines = [json.loads(x) for x in path.read_text(encoding="utf-8").splitlines()]
+    assert lines[0]["v"] == 1
+    ops = [x["op"] for x in lines[1:]]
+    assert ops.count("position_ms") == 28
+    assert ops.count("track_info") == 1
+    # player, gone, back
+    assert ops.count("pick_player") == 3
+    assert lines[1]["value"] == "org.mpris.MediaPlayer2.mock"
+
+
+def test_replay_reproduces_observations(tmp_path):
+    path = tmp_path / "session.ndjson"
+    _record(path, [0.0])
+    now = [0.0]
+    session = ReplaySession(path, speed=2.0, clock=lambda: now[0])
+
+    client = session.pick_player()
+    assert client.service_name == "org.mpris.MediaPlayer2.mock"
+    assert client.track_info().title == "Song"
+    assert client.position_ms() == 0
+    now[0] = 0.55  # session time 1.1s: after the seek
+    assert client.position_ms() == 60_000 + 100
+    now[0] = 1.0  # session time 2.0s: player gone
+    with pytest.raises(NoPlayersFound):
+        session.pick_player()
+    now[0] = 1.2
+    assert session.pick_player() is client
+    now[0] = 10.0
+    with pytest.raises(ReplayFinished):
+        client.position_ms()
+
+
+def test_replay_raises_recorded_errors(tmp_path):
+    path = tmp_path / "session.ndjson"
+    with SessionRecorder(path, clock=lambda: 0.0) as rec:
+        rec.log("position_ms", "p", error=PlayerUnavailable("boom"))
+    session = ReplaySession(path, clock=lambda: 0.0)
+    with pytest.raises(PlayerUnavailable, match="boom"):
+        session._client.position_ms()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import dataclasses
+import sqlite3
+import threading
+
+from terminal_lyrics.cache.sqlite import CacheKey, LyricsCache
+from terminal_lyrics.config import AppConfig
+from terminal_lyrics.sources.base import FetchResult
+from terminal_lyrics.sources.lrclib import LrcLibSource
+from terminal_lyrics.sources.lyrics_ovh import LyricsOvhSource
+from terminal_lyrics.sources.service import LyricsService
+from terminal_lyrics.sources.types import TrackKey
+
+TRACK = TrackKey(artist="Band", title="Song", album="Record")
+KEY = CacheKey("Band", "Song", "Record")
+
+
+def _cfg(tmp_path, **overrides) -> AppConfig:
+    cfg = AppConfig(
+        data_dir=tmp_path / "data",
+        cache_db_path=tmp_path / "cache.sqlite3",
+        config_dir=tmp_path / "config",
+        lang="EN",
+        sources=("lrclib",),
+        api_min_interval_s=0.0,
+        api_max_retries=1,
+        api_backoff_base_s=0.0,
+        preferred_player=None,
+        refresh_hz=10.0,
+        context_lines=1,
+        use_alt_screen=False,
+        prefetch_album=False,
+    )
+    return dataclasses.replace(cfg, **overrides)
+
+
+def _age_entry(db_path, seconds: int) -> None:
+    con = sqlite3.connect(db_path)
+    with con:
+        con.execute("UPDATE lyrics_cache SET updated_at = updated_at - ?", (seconds,))
+    con.close()
+
+
+def test_stale_plain_entry_served_then_upgraded_to_synced(tmp_path, monkeypatch):
+    synced = "[00:01.00]la\n"
+    monkeypatch.setattr(
+        LrcLibSource, "fetch", lambda self, track: FetchResult(synced, False, "lrclib", remote_id=7)
+    )
+    svc = LyricsService(_cfg(tmp_path, revalidate_after_s=60))
+    svc.cache.set(KEY, has_lyrics=True, lrc_text="la\n", source="lyrics_ovh")
+    _age_entry(svc.cache.db_path, 3600)
+
+    res = svc.get_lyrics(TRACK)
+    assert res.lrc_text == "la\n"
+    assert res.source == "cache"
+
+    svc.background.join()
+    entry = svc.cache.get_entry(KEY)
+    assert entry is not None
+    assert entry.lrc_text == synced
+    assert entry.remote_id == 7
+
+
+def test_revalidation_never_downgrades_synced_to_plain(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        LrcLibSource, "fetch", lambda self, track: FetchResult("plain\n", False, "lrclib")
+    )
+    monkeypatch.setattr(LrcLibSource, "search", lambda self, **kw: [])
+    svc = LyricsService(_cfg(tmp_path, revalidate_after_s=60))
+    svc.cache.set(KEY, has_lyrics=True, lrc_text="[00:01.00]la\n", source="lrclib")
+    _age_entry(svc.cache.db_path, 3600)
+    before = svc.cache.get_entry(KEY)
+
+    svc.get_lyrics(TRACK)
+    svc.background.join()
+
+    after = svc.cache.get_entry(KEY)
+    assert after is not None and before is not None
+    assert after.lrc_text == "[00:01.00]la\n"
+    assert after.updated_at > before.updated_at
+
+
+def test_fresh_entry_is_not_revalidated(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(LrcLibSource, "fetch", lambda self, track: calls.append(track))
+    svc = LyricsService(_cfg(tmp_path, revalidate_after_s=60))
+    svc.cache.set(KEY, has_lyrics=True, lrc_text="[00:01.00]la\n", source="lrclib")
+
+    svc.get_lyrics(TRACK)
+    svc.background.join()
+    assert calls == []
+
+
+def test_old_cache_schema_is_migrated(tmp_path):
+    db = tmp_path / "cache.sqlite3"
+    con = sqlite3.connect(db)
+    with con:
+        con.execute(
+            "CREATE TABLE lyrics_cache (artist TEXT NOT NULL, title TEXT NOT NULL, "
+            "album TEXT NOT NULL DEFAULT '', has_lyrics INTEGER NOT NULL, source TEXT, "
+            "lrc_text TEXT, updated_at INTEGER NOT NULL, PRIMARY KEY (artist, title, album))"
+        )
+        con.execute("INSERT INTO lyrics_cache VALUES ('Band', 'Song', 'Record', 1, 'lrclib', 'x', 1)")
+    con.close()
+
+    cache = LyricsCache(db)
+    entry = cache.get_entry(KEY)
+    assert entry is not None
+    assert entry.lrc_text == "x"
+    assert entry.content_hash is None
+
+
+def test_background_slot_reservation_is_kept_for_its_thread():
+    src = LrcLibSource(min_interval_s=60.0, max_retries=1, backoff_base_s=0.0)
+    src.wait_turn()
+    other: list[bool] = []
+    th = threading.Thread(target=lambda: other.append(src.take_turn()))
+    th.start()
+    th.join()
+    # the foreground thread is rate-limited, the reserving thread gets its request once
+    assert other == [False]
+    assert src.take_turn() is True
+    assert src.take_turn() is False
+
+
+def test_all_sources_skipped_is_not_negative_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        LrcLibSource, "fetch", lambda self, track: FetchResult(None, False, "lrclib", skipped=True)
+    )
+    svc = LyricsService(_cfg(tmp_path))
+
+    res = svc.get_lyrics(TRACK)
+    assert not res.has_lyrics
+    assert svc.cache.get_entry(KEY) is None
+
+
+def test_failed_revalidation_keeps_entry_age(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        LyricsOvhSource, "fetch", lambda self, track: FetchResult(None, False, "lyrics_ovh")
+    )
+    svc = LyricsService(_cfg(tmp_path, sources=("lyrics_ovh",), revalidate_after_s=60))
+    svc.cache.set(KEY, has_lyrics=True, lrc_text="la\n", source="lyrics_ovh")
+    _age_entry(svc.cache.db_path, 3600)
+    before = svc.cache.get_entry(KEY)
+
+    svc.get_lyrics(TRACK)
+    svc.background.join()
+
+    # upstream unreachable: the next hit tries again
+    after = svc.cache.get_entry(KEY)
+    assert after is not None and before is not None
+    assert after.updated_at == before.updated_at
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import time
+
+from terminal_lyrics.sources.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_resolution(tmp_path):
+    sf: SingleFlight[str] = SingleFlight(tmp_path / "cache.sqlite3.lock", wait_timeout_s=5.0)
+    calls = 0
+    gate = threading.Event()
+
+    def resolve() -> str:
+        nonlocal calls
+        calls += 1
+        gate.wait(1.0)
+        return "lyrics"
+
+    results: list[str] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(sf.do("k", resolve, ready=lambda: None)))
+        for _ in range(5)
+    ]
+    for th in threads:
+        th.start()
+    time.sleep(0.1)
+    gate.set()
+    for th in threads:
+        th.join()
+
+    assert calls == 1
+    assert results == ["lyrics"] * 5
+
+
+def _hold_lease(lock_path, key, held, release):
+    sf: SingleFlight[str] = SingleFlight(lock_path, wait_timeout_s=5.0)
+
+    def resolve() -> str:
+        held.set()
+        release.wait(5.0)
+        return "owner"
+
+    sf.do(key, resolve, ready=lambda: None)
+
+
+def test_other_process_waits_for_result_in_cache(tmp_path):
+    lock_path = tmp_path / "cache.sqlite3.lock"
+    ctx = multiprocessing.get_context("fork")
+    held, release = ctx.Event(), ctx.Event()
+    owner = ctx.Process(target=_hold_lease, args=(lock_path, "k", held, release))
+    owner.start()
+    try:
+        assert held.wait(5.0)
+        sf: SingleFlight[str] = SingleFlight(lock_path, wait_timeout_s=5.0)
+        polls = 0
+
+        def ready() -> str | None:
+            nonlocal polls
+            polls += 1
+            if polls == 3:
+                release.set()
+                return "from-cache"
+            return None
+
+        assert sf.do("k", lambda: "fetched", ready=ready) == "from-cache"
+    finally:
+        release.set()
+        owner.join(5.0)
+
+
+def test_waiter_resolves_itself_after_timeout(tmp_path):
+    lock_path = tmp_path / "cache.sqlite3.lock"
+    ctx = multiprocessing.get_context("fork")
+    held, release = ctx.Event(), ctx.Event()
+    owner = ctx.Process(target=_hold_lease, args=(lock_path, "k", held, release))
+    owner.start()
+    try:
+        assert held.wait(5.0)
+        sf: SingleFlight[str] = SingleFlight(lock_path, wait_timeout_s=0.3)
+        assert sf.do("k", lambda: "fetched", ready=lambda: None) == "fetched"
+        # unrelated keys are never blocked
+        assert sf.do("other", lambda: "free", ready=lambda: None) == "free"
+    finally:
+        release.set()
+        owner.join(5.0)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import requests
+
+import terminal_lyrics.sources.health as health_mod
+from terminal_lyrics.sources.health import CLOSED, HALF_OPEN, OPEN, SourceHealth
+from terminal_lyrics.sources.lrclib import LrcLibSource
+from terminal_lyrics.sources.types import TrackKey
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_probes_and_closes(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(health_mod.time, "monotonic", clock)
+    h = SourceHealth("src", failure_threshold=2, cooldown_s=30.0)
+
+    assert h.allow()
+    h.record_failure(10.0)
+    assert h.state == CLOSED
+    h.record_failure(10.0)
+    assert h.state == OPEN
+    assert not h.allow()
+
+    clock.now += 31.0
+    assert h.allow()  # the probe
+    assert h.state == HALF_OPEN
+    assert not h.allow()  # only one probe at a time
+    h.record_success(5.0)
+    assert h.state == CLOSED
+    assert h.allow()
+
+
+def test_failed_probe_reopens(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(health_mod.time, "monotonic", clock)
+    h = SourceHealth("src", failure_threshold=1, cooldown_s=30.0)
+    h.record_failure(1.0)
+    clock.now += 31.0
+    assert h.allow()
+    h.record_failure(1.0)
+    assert h.state == OPEN
+    assert not h.allow()
+    assert "retry in 30s" in h.describe()
+
+
+def test_ewma_tracks_latency_and_errors():
+    h = SourceHealth("src", ewma_alpha=0.5)
+    h.record_success(100.0)
+    h.record_success(200.0)
+    assert h.latency_ewma_ms == 150.0
+    h.record_failure(0.0)
+    assert h.error_rate == 0.5
+    assert h.calls == 3 and h.failures == 1
+
+
+def test_open_breaker_skips_retries_and_backoff(monkeypatch):
+    calls = []
+    sleeps = []
+
+    def fake_get(*args, **kwargs):
+        calls.append(args)
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    monkeypatch.setattr("terminal_lyrics.sources.lrclib.time.sleep", sleeps.append)
+    src = LrcLibSource(
+        min_interval_s=0.0,
+        max_retries=5,
+        backoff_base_s=1.0,
+        health=SourceHealth("lrclib", failure_threshold=2, cooldown_s=60.0),
+    )
+    track = TrackKey(artist="A", title="B")
+
+    res = src.fetch(track)
+    assert res.lrc_text is None and not res.definitive_not_found
+    assert len(calls) == 2
+    assert sleeps == [1.0]
+
+    src.fetch(track)
+    assert src.search(q="x") == []
+    assert len(calls) == 2
+
+
+def test_lost_probe_is_given_up_after_timeout(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(health_mod.time, "monotonic", clock)
+    h = SourceHealth("src", failure_threshold=1, cooldown_s=30.0, probe_timeout_s=20.0)
+    h.record_failure(1.0)
+    clock.now += 31.0
+    assert h.allow()  # probe that never reports back
+    clock.now += 5.0
+    assert not h.allow()
+    clock.now += 20.0
+    assert h.allow()
+    assert h.state == HALF_OPEN
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import dataclasses
+
+import requests
+
+from terminal_lyrics.cache.stats import SourceStatsStore
+from terminal_lyrics.config import AppConfig
+from terminal_lyrics.sources.base import FetchResult
+from terminal_lyrics.sources.lrclib import LrcLibSource
+from terminal_lyrics.sources.lyrics_ovh import LyricsOvhSource
+from terminal_lyrics.sources.service import LyricsService, request_class
+from terminal_lyrics.sources.types import TrackKey
+
+
+def _cfg(tmp_path, **overrides) -> AppConfig:
+    cfg = AppConfig(
+        data_dir=tmp_path / "data",
+        cache_db_path=tmp_path / "cache.sqlite3",
+        config_dir=tmp_path / "config",
+        lang="EN",
+        sources=("lyrics_ovh", "lrclib"),
+        api_min_interval_s=0.0,
+        api_max_retries=1,
+        api_backoff_base_s=0.0,
+        preferred_player=None,
+        refresh_hz=10.0,
+        context_lines=1,
+        use_alt_screen=False,
+        prefetch_album=False,
+    )
+    return dataclasses.replace(cfg, **overrides)
+
+
+def test_summary_counts_and_percentiles(tmp_path):
+    store = SourceStatsStore(tmp_path / "cache.sqlite3")
+    for ms in range(1, 101):
+        store.record("lrclib", "album", "synced" if ms % 2 else "miss", ms)
+    store.record("lrclib", "album", "error", 5000)
+
+    (st,) = store.summary("album")
+    assert st.calls == 101
+    assert st.synced == 50 and st.misses == 50 and st.errors == 1
+    assert st.p50_ms == 51
+    assert st.p99_ms == 100
+    assert store.summary("no_album") == []
+
+
+def test_request_class():
+    assert request_class(TrackKey("A, B", "T")) == "multi_artist"
+    assert request_class(TrackKey("A", "T", "Album")) == "album"
+    assert request_class(TrackKey("A", "T")) == "no_album"
+
+
+def test_adaptive_order_prefers_cheap_synced_source(tmp_path):
+    svc = LyricsService(_cfg(tmp_path, source_order="adaptive"))
+    assert [s.name for s in svc.ordered_sources("album")] == ["lyrics_ovh", "lrclib"]
+
+    for _ in range(10):
+        svc.stats.record("lyrics_ovh", "album", "plain", 900)
+        svc.stats.record("lrclib", "album", "synced", 200)
+    assert [s.name for s in svc.ordered_sources("album")] == ["lrclib", "lyrics_ovh"]
+    # other request classes have no data yet: configured order
+    assert [s.name for s in svc.ordered_sources("no_album")] == ["lyrics_ovh", "lrclib"]
+
+    static = LyricsService(_cfg(tmp_path))
+    assert [s.name for s in static.ordered_sources("album")] == ["lyrics_ovh", "lrclib"]
+
+
+def test_get_lyrics_records_outcomes_but_not_skips(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        LyricsOvhSource, "fetch", lambda self, tr: FetchResult(None, False, self.name, skipped=True)
+    )
+    monkeypatch.setattr(LrcLibSource, "fetch", lambda self, tr: FetchResult("[00:01.00]x\n", False, self.name))
+    svc = LyricsService(_cfg(tmp_path))
+    svc.get_lyrics(TrackKey("A", "T", "Album"))
+
+    (st,) = svc.stats.summary()
+    assert (st.source, st.request_class, st.synced) == ("lrclib", "album", 1)
+
+
+def test_failed_search_fallback_is_an_error_not_a_miss(tmp_path, monkeypatch):
+    monkeypatch.setattr(LrcLibSource, "fetch", lambda self, tr: FetchResult(None, True, self.name))
+
+    def down(*args, **kwargs):
+        raise requests.ConnectionError("down")
+
+    svc = LyricsService(_cfg(tmp_path, sources=("lrclib",)))
+    monkeypatch.setattr(svc.session, "get", down)
+    svc.get_lyrics(TrackKey("A", "T", "Album"))
+
+    outcomes = {st.source: (st.misses, st.errors) for st in svc.stats.summary()}
+    assert outcomes == {"lrclib": (1, 0), "lrclib_search": (0, 1)}
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO = Path(__file__).resolve().parent.parent
+
+# never needed before the first frame / for offline subcommands
+HEAVY = ("dbus", "requests", "urllib3", "sqlite3", "numpy", "http.server", "terminal_lyrics.sources.service")
+
+
+def _imported(args: list[str], tmp_path: Path) -> set[str]:
+    """Module names a fresh interpreter imports for `args`, from `-X importtime`."""
+    env = dict(os.environ)
+    env.update(XDG_CACHE_HOME=str(tmp_path / "cache"), XDG_CONFIG_HOME=str(tmp_path / "config"))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (str(REPO), env.get("PYTHONPATH"))))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], env=env, capture_output=True, text=True, timeout=60
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:") and line.count("|") == 2
+    }
+
+
+@pytest.fixture
+def lrc(tmp_path: Path) -> Path:
+    path = tmp_path / "song.lrc"
+    path.write_text("[00:01.00]one\n[00:02.50]two\n", encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize(
+    ("argv", "allowed"),
+    [
+        (["config"], ()),
+        (["parse", "{lrc}"], ()),
+        (["export", "{lrc}", "--format", "srt"], ()),
+        (["timeline", "{lrc}"], ("numpy",)),
+        (["cache"], ("sqlite3",)),
+    ],
+)
+def test_subcommands_import_only_what_they_need(argv, allowed, lrc, tmp_path):
+    names = _imported(["-m", "terminal_lyrics", *(a.format(lrc=lrc) for a in argv)], tmp_path)
+    assert "terminal_lyrics.cli" in names
+    assert "terminal_lyrics.app" not in names
+    assert {m for m in HEAVY if m in names} <= set(allowed)
+
+
+def test_watch_module_defers_dbus_and_service(tmp_path):
+    names = _imported(["-c", "import terminal_lyrics.app"], tmp_path)
+    assert not {m for m in HEAVY if m in names}
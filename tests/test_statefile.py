@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+
+from terminal_lyrics.events import LineChanged, Notice, PlaybackChanged, TrackChanged
+from terminal_lyrics.statefile import SIZE, StateFileSink, parse_state, read_state
+
+TRACK = TrackChanged("mock", "Artist", "Song", "", "test", True, ("one", "два"), (1000, 4000))
+
+
+def test_state_file_follows_track_line_and_pause(tmp_path):
+    path = tmp_path / "state"
+    now = [100.0]
+    sink = StateFileSink(path, clock=lambda: now[0])
+    sink.enter()
+    try:
+        assert path.stat().st_size == SIZE
+        sink.emit(TRACK)
+        st = read_state(path)
+        assert (st.track, st.index, st.text, st.synced) == ("Artist - Song", -1, "", True)
+
+        sink.emit(LineChanged("mock", 1, "два", 4000, None, 4000))
+        sink.emit(LineChanged("mock", 0, "one", 1000, 4000, 1500))  # seek back
+        st = read_state(path)
+        assert (st.index, st.text, st.updated_ms) == (0, "one", 100_000)
+        # next line due 2.5 s of playback later
+        assert st.next_deadline_ms == 102_500
+
+        sink.emit(PlaybackChanged("mock", "Paused", 1500))
+        st = read_state(path)
+        assert st.paused and st.next_deadline_ms == 0
+        now[0] = 200.0
+        sink.emit(PlaybackChanged("mock", "Playing", 1500))
+        assert read_state(path).next_deadline_ms == 202_500
+
+        sink.emit(Notice("no_mpris_players", "No active MPRIS players"))
+        st = read_state(path)
+        assert st.notice and st.text == "No active MPRIS players" and st.generation == 7
+    finally:
+        sink.exit()
+    assert not path.exists() and read_state(path) is None
+
+
+def test_torn_copies_are_rejected(tmp_path):
+    path = tmp_path / "state"
+    sink = StateFileSink(path)
+    sink.enter()
+    try:
+        sink.emit(TRACK)
+        buf = bytearray(path.read_bytes())
+    finally:
+        sink.exit()
+    assert parse_state(bytes(buf)).generation == 2
+    # a copy taken while a writer was between the two generation stores
+    buf[-8] += 1
+    assert parse_state(bytes(buf)) is None
+    assert parse_state(bytes(SIZE)) is None  # not a state file
+
+
+def test_concurrent_reader_never_sees_a_torn_state(tmp_path):
+    path = tmp_path / "state"
+    sink = StateFileSink(path)
+    sink.enter()
+    lines = [f"{i:04d} " + "x" * (i % 300) for i in range(2000)]
+    stop = threading.Event()
+    seen = []
+
+    def reader():
+        while not stop.is_set():
+            st = read_state(path)
+            if st is not None and st.index >= 0:
+                seen.append((st.index, st.text))
+
+    th = threading.Thread(target=reader)
+    th.start()
+    try:
+        sink.emit(TrackChanged("mock", "A", "B", "", None, True, tuple(lines), tuple(range(2000))))
+        for i, text in enumerate(lines):
+            sink.emit(LineChanged("mock", i, text, i, i + 1, i))
+    finally:
+        stop.set()
+        th.join()
+        sink.exit()
+    assert seen
+    assert all(lines[i] == text for i, text in seen)
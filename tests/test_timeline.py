@@ -0,0 +1,57 @@
+import io
+from array import array
+
+import pytest
+from typer.testing import CliRunner
+
+from terminal_lyrics.cli import app
+from terminal_lyrics.lrc.parse import parse_lrc
+from terminal_lyrics.sync import timeline
+from terminal_lyrics.sync.tracker import LineTracker
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(timeline, "np", None)
+    return request.param
+
+
+def test_sample_indices_matches_tracker(backend):
+    doc = parse_lrc("[00:01.00]a\n[00:02.00]b\n[00:02.00]c\n[00:04.50]d\n")
+    positions = timeline.frame_positions(6000, 24)
+    assert len(positions) == 144
+    got = list(timeline.sample_indices(doc.times, positions))
+    tr = LineTracker.from_document(doc)
+    assert got == [tr.current_index(int(p)) for p in positions]
+    # unsorted positions fall back to per-position lookup
+    assert list(tr.indices_at(array("q", [4600, 0, 1500]))) == [3, -1, 0]
+
+
+def test_runs_csv(backend):
+    doc = parse_lrc("[00:00.50]a\n[00:01.00]b, c\n")
+    positions = timeline.frame_positions(2000, 4)
+    indices = timeline.sample_indices(doc.times, positions)
+    assert timeline.runs(indices) == [(0, 2, -1), (2, 4, 0), (4, 8, 1)]
+    out = io.StringIO()
+    timeline.write_runs_csv(out, positions, indices, doc.texts, 2000)
+    assert out.getvalue().splitlines() == [
+        "start_frame,end_frame,start_ms,end_ms,line,text",
+        "0,2,0,500,-1,",
+        "2,4,500,1000,0,a",
+        '4,8,1000,2000,1,"b, c"',
+    ]
+    frames = io.StringIO()
+    timeline.write_frames_csv(frames, positions, indices)
+    assert frames.getvalue().splitlines()[1:4] == ["0,0,-1", "1,250,-1", "2,500,0"]
+
+
+def test_cli_rejects_non_positive_fps(tmp_path):
+    lrc = tmp_path / "a.lrc"
+    lrc.write_text("[00:00.50]a\n", encoding="utf-8")
+    for fps in ("0", "-1"):
+        res = CliRunner().invoke(app, ["timeline", str(lrc), "--fps", fps])
+        assert res.exit_code == 2
+        assert "--fps" in res.output
@@ -1,4 +1,5 @@
 from terminal_lyrics.lrc.model import LyricEvent
+from terminal_lyrics.lrc.parse import parse_lrc
 from terminal_lyrics.sync.tracker import LineTracker
 
 
@@ -16,3 +17,50 @@ def test_tracker_changed_only_on_change():
     assert tr.changed_index(1500) is None
     assert tr.changed_index(2500) == 2
 
+
+def test_tracker_shares_document_columns():
+    doc = parse_lrc("[00:00.00]a\n[00:01.00]b\n")
+    tr = LineTracker.from_document(doc)
+    assert tr.t_ms is doc.times
+    assert tr.changed_index(1200) == 1
+    assert tr.texts[tr.last_idx] == "b"
+
+
+def test_tracker_cursor_matches_bisect_and_counts_seeks():
+    t_ms = [0, 100, 100, 250, 400, 1000] + [1100 + 10 * k for k in range(20)]
+    texts = [str(i) for i in range(len(t_ms))]
+    cursor = LineTracker(t_ms=t_ms, texts=texts)
+    plain = LineTracker(t_ms=t_ms, texts=texts, use_cursor=False)
+
+    # linear playback: duplicate and dense boundaries are walked, not sought
+    forward = list(range(-50, 1200, 30))
+    for now in forward:
+        assert cursor.current_index(now) == plain.current_index(now)
+    assert cursor.seeks == 0
+
+    # backward jumps and a forward jump past more than CURSOR_SCAN lines
+    for now in (900, 50, 1100, 260, 1290):
+        assert cursor.current_index(now) == plain.current_index(now)
+    assert cursor.seeks == 4
+    assert plain.seeks == 0
+
+
+def test_tracker_next_boundary():
+    tr = LineTracker(t_ms=[1000, 2000], texts=["a", "b"])
+    assert tr.next_boundary_ms() == 1000
+    tr.current_index(500)
+    assert tr.next_boundary_ms() == 1000
+    tr.current_index(1500)
+    assert tr.next_boundary_ms() == 2000
+    tr.current_index(2500)
+    assert tr.next_boundary_ms() is None
+
+
+def test_tracker_word_highlight():
+    doc = parse_lrc("[00:01.00]<00:01.00>one <00:01.50>two <00:02.00>three\n[00:03.00]plain\n")
+    tr = LineTracker.from_document(doc)
+    assert tr.highlight_pos(500) == 0
+    assert tr.highlight_pos(1000) == len("one ")
+    assert tr.highlight_pos(1600) == len("one two ")
+    assert tr.highlight_pos(2100) == len("one two three")
+    assert tr.highlight_pos(3100) == 0